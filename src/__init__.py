@@ -1,10 +1,21 @@
-from typing import List
-from .agents.receptionist import ReceptionistAgent
-from .agents.portfolio_manager import PortfolioManagerAgent
-from .agency import CryptoAgency
-
-__all__: List[str] = [
-    'ReceptionistAgent',
-    'PortfolioManagerAgent',
-    'CryptoAgency'
-] 
\ No newline at end of file
+import importlib
+from typing import Any, Dict, List
+
+# Resolved on first access (PEP 562), so importing src stays cheap
+_EXPORTS: Dict[str, str] = {
+    'ReceptionistAgent': '.agents.receptionist',
+    'PortfolioManagerAgent': '.agents.portfolio_manager',
+    'CryptoAgency': '.agency'
+}
+
+__all__: List[str] = list(_EXPORTS)
+
+def __getattr__(name: str) -> Any:
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__() -> List[str]:
+    return sorted(list(globals()) + __all__)
@@ -1,17 +1,20 @@
 import os
+from threading import Thread
+from typing import TYPE_CHECKING
 from dotenv import load_dotenv
-from crewai import LLM
-from src.agents.receptionist import ReceptionistAgent
-from src.agents.portfolio_manager import PortfolioManagerAgent
-from src.agents.data_analyst import DataAnalystAgent
-from flows.receptionist_flow import ReceptionistFlow
 from src.config.models.portfolio import Action
-from src.agents.data_analyst import BTC,ETH,TimeFrame
-import src.agents.data_analyst  as dt
-from src.utils.display import print_friendly_table
-from src.tasks.portfolio_manager_tasks import AnalyzePortfolioTask
-from crewai import Crew
-import agentops
+from src.utils.display import print_friendly_table, print_model_ready
+from src.llm.streaming import StreamingDecisionClient
+from src.llm.router import LLMRouter, DEFAULT_TIMEOUT
+from src.llm.warmup import ModelWarmer
+from src.utils.price_refresher import DEFAULT_REFRESH_INTERVAL
+from src.utils.portfolio_digest import (
+    portfolio_state_hash, get_portfolio_digest, get_cached_analysis, cache_analysis
+)
+# crewai, agentops and the agents are imported where first used: they take
+# seconds to load and most entry points never need all of them.
+if TYPE_CHECKING:
+    from crewai import LLM
 
 class CryptoAgency:
     """AI Crypto Trading Agency using crewai"""
@@ -24,31 +27,72 @@ class CryptoAgency:
         llm = self._init_llm()
         self.config.llm = llm
     
-    def _init_llm(self) -> LLM:
+    def _init_llm(self) -> "LLM":
         """Initialize LLM after loading environment variables"""
         load_dotenv()
-        agentops.init(api_key=os.getenv('AGENTOPS_API_KEY'))
-        AI_API_PROVIDER = os.getenv('AI_API_PROVIDER', 'ollama')
-        AI_API_URL= os.getenv('AI_API_URL', 'http://localhost:11434')
-        AI_API_MODEL= os.getenv('AI_API_MODEL', 'mistral')
-        AI_API_KEY= os.getenv('AI_API_KEY', '')
+        self.telemetry = init_telemetry()
+        llm, provider, AI_API_URL, AI_API_MODEL, AI_API_KEY = self._llm_from_env()
+        self._warm_up(provider, AI_API_URL, AI_API_MODEL)
+
+        # Extra backends (AI_API_PROVIDER_2, AI_API_URL_2, ...) back up trading decisions
+        backends = [(f"{provider}:{AI_API_MODEL}", llm)]
+        n = 2
+        while os.getenv(f'AI_API_URL_{n}') or os.getenv(f'AI_API_MODEL_{n}'):
+            backup, backup_provider, backup_url, backup_model, _ = self._llm_from_env(f'_{n}')
+            self._warm_up(backup_provider, backup_url, backup_model)
+            backends.append((f"{backup_provider}:{backup_model}", backup))
+            n += 1
+        if len(backends) > 1:
+            self.config.llm_router = LLMRouter(
+                backends,
+                hedge_percentile=float(os.getenv('AI_HEDGE_PERCENTILE', 95)),
+                timeout=float(os.getenv('AI_API_TIMEOUT', DEFAULT_TIMEOUT))
+            )
+        elif provider in ("ollama", "openai") and os.getenv('AI_STREAM_DECISIONS', 'true').lower() == 'true':
+            # Trading decisions stream from the same endpoint and are acted on before the reasoning ends
+            self.config.decision_stream = StreamingDecisionClient(AI_API_URL, AI_API_MODEL, provider, AI_API_KEY)
+        return llm
+
+    def _warm_up(self, provider: str, url: str, model: str) -> None:
+        """Preload an Ollama model and keep it loaded between trading decisions, in the background"""
+        if provider != "ollama" or os.getenv('AI_WARMUP', 'true').lower() != 'true':
+            return
+        interval = getattr(self.config, 'trading_interval', None) or float(os.getenv('AI_TRADING_INTERVAL', 60))
+        warmer = ModelWarmer(url, model, trading_interval=interval,
+                             timeout=float(os.getenv('AI_API_TIMEOUT', DEFAULT_TIMEOUT)),
+                             on_ready=print_model_ready if self.config.debug else None)
+        self.model_warmers = getattr(self, 'model_warmers', []) + [warmer.start()]
+        self.config.model_warmers = self.model_warmers
+
+    def _llm_from_env(self, suffix: str = '') -> tuple:
+        """LLM configured by AI_API_PROVIDER/URL/MODEL/KEY<suffix>, with its provider, URL, model and key"""
+        from crewai import LLM
+        AI_API_PROVIDER = os.getenv(f'AI_API_PROVIDER{suffix}', 'ollama')
+        AI_API_URL= os.getenv(f'AI_API_URL{suffix}', 'http://localhost:11434')
+        AI_API_MODEL= os.getenv(f'AI_API_MODEL{suffix}', 'mistral')
+        AI_API_KEY= os.getenv(f'AI_API_KEY{suffix}', '')
         provider = AI_API_PROVIDER.lower()
         llm_params = {
             "model": AI_API_MODEL,
-            "base_url": AI_API_URL
+            "base_url": AI_API_URL,
+            "timeout": float(os.getenv('AI_API_TIMEOUT', DEFAULT_TIMEOUT))
         }
         if provider in ("openai", "anthropic"):
-            llm_params["api_key"] = 'AI_API_KEY'
-        return LLM(**llm_params) 
+            llm_params["api_key"] = AI_API_KEY
+        return LLM(**llm_params), provider, AI_API_URL, AI_API_MODEL, AI_API_KEY
     
     def start(self) -> None:
         """Start the crypto agency"""      
+        from src.agents.receptionist import ReceptionistAgent
+        from src.agents.portfolio_manager import PortfolioManagerAgent
+        from src.agents.data_analyst import DataAnalystAgent
         # Initialize agents
         receptionist = ReceptionistAgent(config=self.config)
         portfolio_manager = PortfolioManagerAgent(config=self.config)
         data_analyst = DataAnalystAgent(config=self.config)
         # kickoff workflow
-        receptionnist_flow(receptionist,portfolio_manager)
+        receptionnist_flow(receptionist,portfolio_manager,
+                           getattr(self.config, 'price_refresh', DEFAULT_REFRESH_INTERVAL))
         #portfolio_manager.add_transaction("virtual","virtual-1","BTC/USDT",1,99000,Action.BUY)
         #portfolio_manager.add_transaction("virtual","virtual-1","ETH/USDT",1,3276.46,Action.BUY) 
         #portfolio_manager.add_transaction("virtual","virtual-1","BTC/USDT",0.1,80000,Action.SELL) 
@@ -63,19 +107,37 @@ class CryptoAgency:
         #dt.print_coingecko_historical_chart(BTC,"USD",TimeFrame.DAY,data)
         #dt.plot_plotext_chart(BTC,"USD",data)
 
-def receptionnist_flow(receptionist,portfolio_manager) -> None:
-        """Kickoff receptionnist Flow"""
+def init_telemetry() -> Thread:
+    """Initialize agentops in a background thread; startup does not wait for it"""
+    def init():
+        import agentops
+        agentops.init(api_key=os.getenv('AGENTOPS_API_KEY'))
+    thread = Thread(target=init, name="agentops-init", daemon=True)
+    thread.start()
+    return thread
+
+def receptionnist_flow(receptionist,portfolio_manager,price_refresh=DEFAULT_REFRESH_INTERVAL) -> None:
+        """Kickoff receptionnist Flow, refreshing prices every price_refresh seconds in the background"""
+        from flows.receptionist_flow import ReceptionistFlow
         flow = ReceptionistFlow(
             receptionist=receptionist,
-            portfolio_manager =portfolio_manager
+            portfolio_manager =portfolio_manager,
+            price_refresh=price_refresh
         )
         flow.kickoff()   
 
 def analyze_portfolio_task(portfolio_manager) -> None:
-        """Kickoff analyze portfolio task"""
-        crew = Crew(
-            agents=[portfolio_manager],
-            tasks=[AnalyzePortfolioTask(portfolio_manager)]
-        )
-        result = crew.kickoff()
+        """Kickoff analyze portfolio task, reusing the analysis of an unchanged portfolio"""
+        from crewai import Crew
+        from src.tasks.portfolio_manager_tasks import AnalyzePortfolioTask
+        portfolio_data = portfolio_manager.update_portfolio()
+        state_hash = portfolio_state_hash(portfolio_data)
+        result = get_cached_analysis(state_hash)
+        if result is None:
+            crew = Crew(
+                agents=[portfolio_manager],
+                tasks=[AnalyzePortfolioTask(portfolio_manager, get_portfolio_digest(portfolio_data, state_hash))]
+            )
+            result = crew.kickoff()
+            cache_analysis(state_hash, result)
         print(result)
\ No newline at end of file
@@ -1,18 +1,26 @@
-from typing import List
-from .agent import Agent
-from .data_analyst import DataAnalystAgent
-from .portfolio_manager import PortfolioManagerAgent
-from .live_trader import LiveTraderAgent
-from .virtual_trader import VirtualTraderAgent
-from .backtest_trader import BacktestTraderAgent
-from .receptionist import ReceptionistAgent
+import importlib
+from typing import Any, Dict, List
 
-__all__: List[str] = [
-    'Agent',
-    'DataAnalystAgent',
-    'PortfolioManagerAgent',
-    'LiveTraderAgent',
-    'VirtualTraderAgent',
-    'BacktestTraderAgent',
-    'ReceptionistAgent'
-] 
\ No newline at end of file
+# Agent classes are imported on first access (PEP 562): importing one agent
+# must not load crewai-heavy siblings such as the live or backtest traders.
+_AGENTS: Dict[str, str] = {
+    'Agent': '.agent',
+    'DataAnalystAgent': '.data_analyst',
+    'PortfolioManagerAgent': '.portfolio_manager',
+    'LiveTraderAgent': '.live_trader',
+    'VirtualTraderAgent': '.virtual_trader',
+    'BacktestTraderAgent': '.backtest_trader',
+    'ReceptionistAgent': '.receptionist'
+}
+
+__all__: List[str] = list(_AGENTS)
+
+def __getattr__(name: str) -> Any:
+    if name not in _AGENTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_AGENTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__() -> List[str]:
+    return sorted(list(globals()) + __all__)
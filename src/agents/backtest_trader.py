@@ -1,118 +1,287 @@
-from typing import Dict, Any, Optional
-from queue import Queue
-from threading import Thread, Event
+from typing import Callable, Dict, Any, List, Optional, Union
+from concurrent.futures import Future
+from threading import Event
 from .trader import TraderAgent
 from pydantic import Field, ConfigDict
+from src.backtest.engine import BacktestEngine, HistoricalSeries, PriceMode
+from src.backtest.executor import BacktestExecutor, run_backtest_job
+from src.trading.fills import FillModel
+from src.backtest.sweep import SweepRunner, SearchSpace
+from src.backtest.walk_forward import WalkForwardRunner
+from src.backtest.strategy import compute_features, DEFAULT_LOOKBACK
+from src.backtest.stream import StreamingBacktest, ProfileStreamingStrategy, DEFAULT_CHUNK_SIZE
+from src.config.profiles import load_profile, PROFILE_NAMES
+from src.utils.display import print_backtest_progress, print_backtest_error, print_sweep_results, \
+    print_walk_forward_results
 
 class BacktestTraderAgent(TraderAgent):
     """Simulates trades using historical data"""
     
     model_config = ConfigDict(arbitrary_types_allowed=True)
     
-    result_queue: Queue = Field(default_factory=Queue)
+    executor: Optional[BacktestExecutor] = Field(default=None)
     stop_event: Event = Field(default_factory=Event)
     running: bool = Field(default=False)
+    series: Optional[HistoricalSeries] = Field(default=None)
+    price_mode: PriceMode = Field(default=PriceMode.NEAREST)
+    initial_balance: float = Field(default=10000.0)
+    fee_rate: float = Field(default=0.001)
     
     def __init__(self, config):
         super().__init__(config)
-        self.result_queue = Queue()
         self.stop_event = Event()
         self.running = False
+        if getattr(config, 'fill_model', None) is None:
+            self.fill_model = FillModel(self.fee_rate)
+        if getattr(config, 'decision_cache', None) is None:
+            # Replayed decisions must come from the model, not from live runs' cache
+            self.decision_cache = None
+        # Worker processes are only started on the first submitted backtest
+        self.executor = BacktestExecutor(
+            max_workers=getattr(config, 'backtest_workers', None),
+            progress_callback=self._report_progress
+        )
 
     def execute_trade(self, trade_params: Dict[str, Any]) -> Dict[str, Any]:
-        """Execute backtest trade simulation in separate thread"""
+        """Execute a single backtest trade simulation"""
         try:
-            if self.running:
-                return {'error': 'Backtest already running'}
-
             if not self.validate_trade(trade_params):
                 return self._get_default_decision("Invalid trade parameters")
                 
             order = self.format_order(trade_params)
             
-            # Create and start backtest thread
+            # A single fill is a cheap indexed lookup, so it runs inline
             self.stop_event.clear()
-            self._current_thread = Thread(
-                target=self._run_backtest,
-                args=(order,),
-                name="BacktestThread"
-            )
-            self._current_thread.daemon = True  # Thread will be terminated when main program exits
-            self._current_thread.start()
-            
-            # Wait for result from thread
-            result = self.result_queue.get()
-            return result
-            
-        except Exception as e:
-            if self.debug:
-                print_backtest_error(f"Error starting backtest: {str(e)}")
-            return self._get_default_decision(str(e))
-
-    def _run_backtest(self, order: Dict[str, Any]):
-        """Run backtest simulation in separate thread"""
-        try:
-            self.running = True
-            
-            if self.debug:
-                print_backtest_progress("Starting backtest simulation...")
-            
-            # Check if we should stop
-            if self.stop_event.is_set():
-                raise InterruptedError("Backtest stopped by user")
-            
-            # Simulate trade with historical data
             result = self.simulate_historical_trade(order)
-            
-            if self.debug:
-                print_backtest_progress("Backtest completed successfully")
-            
-            self.result_queue.put(result)
+            self.update_position(result)
+            return result
             
         except Exception as e:
             if self.debug:
                 print_backtest_error(f"Backtest error: {str(e)}")
-            self.result_queue.put(self._get_default_decision(str(e)))
-        finally:
-            self.running = False
+            return self._get_default_decision(str(e))
 
     def simulate_historical_trade(self, order: Dict[str, Any]) -> Dict[str, Any]:
         """Simulate trade using historical data"""
-        if not self.historical_data:
-            raise ValueError("No historical data available")
-            
         # Periodically check if we should stop
         if self.stop_event.is_set():
             raise InterruptedError("Backtest stopped by user")
             
-        # Find relevant historical prices
-        entry_price = self._find_historical_price(order['params']['timestamp'])
+        # Find relevant historical bar (delayed by the fill model's latency)
+        series = self._get_series()
+        timestamp = order['params']['timestamp']
+        if self.fill_model.latency_ms:
+            idx = int(series.index_at([timestamp + self.fill_model.latency_ms], PriceMode.NEXT)[0])
+        else:
+            idx = int(series.index_at([timestamp], self.price_mode)[0])
+        if idx < 0:
+            raise ValueError(f"No historical price to fill the order at {timestamp}")
         
-        return {
-            'id': f"backtest-{order['symbol']}-{order['params']['timestamp']}",
-            'status': 'FILLED',
-            'filled': order['amount'],
-            'price': entry_price,
-            'cost': order['amount'] * entry_price,
-            'fees': order['amount'] * entry_price * 0.001,
-            'timestamp': order['params']['timestamp']
-        }
+        result = self.fill_model.fill_order(order, float(series.prices[idx]), float(series.volumes[idx]))
+        result['id'] = f"backtest-{order['symbol']}-{timestamp}"
+        result['timestamp'] = timestamp
+        return result
+
+    def load_historical_data(self, data: Union[Dict[str, Any], List[Dict[str, Any]]]) -> HistoricalSeries:
+        """Load historical data (CoinGecko history dict or list of price records) into sorted arrays"""
+        if isinstance(data, dict):
+            self.series = HistoricalSeries.from_coingecko(data)
+            self.historical_data = data.get('prices', [])
+        else:
+            self.series = HistoricalSeries.from_records(data)
+            self.historical_data = data
+        return self.series
+
+    def _get_series(self) -> HistoricalSeries:
+        """Return the indexed series, building it from historical_data on first use"""
+        if self.series is None:
+            if not self.historical_data:
+                raise ValueError("No historical data available")
+            self.load_historical_data(self.historical_data)
+        return self.series
         
     def _find_historical_price(self, timestamp: int) -> float:
-        """Find closest historical price to timestamp"""
-        # Implementation depends on historical data format
-        pass
+        """Find historical price for timestamp according to price_mode (nearest/previous/next), NaN if none"""
+        return float(self._get_series().price_at([timestamp], self.price_mode)[0])
+
+    def run_backtest(self, orders: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Run a whole batch of formatted orders through the vectorized backtest engine"""
+        engine = BacktestEngine(
+            self._get_series(),
+            initial_balance=self.initial_balance,
+            fee_rate=self.fee_rate,
+            price_mode=self.price_mode,
+            fill_model=self.fill_model
+        )
+        return engine.run(orders)
+
+    def run_streaming_backtest(self, source: Union[str, HistoricalSeries, None] = None,
+                               strategy: Optional[Callable] = None, profile_name: str = 'default',
+                               chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict[str, Any]:
+        """
+        Run an event-driven backtest with bounded memory.
+
+        Args:
+            source: Path to a .npy candle file (memory-mapped) or a series; defaults to the loaded history.
+            strategy: Callback (candle, window, state) -> orders; defaults to the profile rule strategy.
+            profile_name: Profile used by the default strategy.
+            chunk_size: Candles read per chunk.
+        """
+        self.stop_event.clear()
+        backtest = StreamingBacktest(
+            strategy or ProfileStreamingStrategy(load_profile(profile_name)),
+            initial_balance=self.initial_balance,
+            fee_rate=self.fee_rate,
+            should_stop=self.stop_event.is_set
+        )
+        return backtest.run(source if source is not None else self._get_series(), chunk_size)
+
+    def run_llm_backtest(self, symbol: str, lookback: int = DEFAULT_LOOKBACK, batch_size: Optional[int] = None,
+                         start: int = 0, end: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Backtest the trader's own decisions (gate, cache, LLM) over the loaded history.
+
+        Candles are decided batch_size at a time (default config.llm_batch_size) with one
+        batched LLM call per batch; every candle of a batch sees the position as of the batch
+        start, so batch_size=1 reproduces candle-by-candle trading. Buys are capped at the
+        cash available, and the resulting orders are run through the backtest engine.
+
+        Args:
+            symbol: Traded pair, e.g. 'BTC/USD'.
+            lookback: Bars used for the change and high-low range shown to the model.
+            batch_size: Candles per LLM call.
+            start: First bar to trade (at least lookback).
+            end: Bar after the last one to trade.
+        """
+        series = self._get_series()
+        features = compute_features(series.prices, lookback)
+        batch_size = max(1, batch_size or getattr(self.config, 'llm_batch_size', 1))
+        bars = range(max(start, lookback), len(series) if end is None else end)
+        self._current_position, self._entry_price = 0.0, 0.0
+        cash = self.initial_balance
+        orders = []
+        self.stop_event.clear()
+
+        for first in range(0, len(bars), batch_size):
+            if self.stop_event.is_set():
+                break
+            snapshots = [
+                {
+                    'symbol': symbol,
+                    'timestamp': int(series.timestamps[bar]),
+                    'price': float(series.prices[bar]),
+                    'volume': float(series.volumes[bar]),
+                    'change_24h': float(features['change'][bar]),
+                    'high_low_range': float(features['volatility'][bar])
+                }
+                for bar in bars[first:first + batch_size]
+            ]
+            for decision, snapshot in zip(self.generate_trading_decisions(snapshots), snapshots):
+                if decision['action'] == 'HOLD':
+                    continue
+                trade = dict(decision, symbol=symbol, timestamp=snapshot['timestamp'])
+                if trade['action'] == 'SELL':
+                    trade['amount'] = min(trade['amount'], self._current_position)
+                if trade['amount'] <= 0:
+                    continue
+                order = self.format_order(trade)
+                result = self.simulate_historical_trade(order)
+                if trade['action'] == 'BUY' and result['cost'] + result['fees'] > cash:
+                    order['amount'] *= cash / (result['cost'] + result['fees']) * (1 - 1e-9)
+                    result = self.simulate_historical_trade(order)
+                if result['filled'] <= 0:
+                    continue
+                order['amount'] = result['filled']
+                cash += (result['cost'] if trade['action'] == 'SELL' else -result['cost']) - result['fees']
+                self.update_position(result)
+                orders.append(order)
+
+        results = self.run_backtest(orders)
+        results['decisions'] = len(bars)
+        return results
+
+    def submit_backtest(self, orders: List[Dict[str, Any]]) -> Future:
+        """Submit an order batch to the backtest worker pool and return its future"""
+        return self.submit_backtests([orders])[0]
 
-    def stop_backtest(self):
-        """Stop the current backtest gracefully"""
+    def submit_backtests(self, order_batches: List[List[Dict[str, Any]]]) -> List[Future]:
+        """Submit several order batches (e.g. one per strategy) to the worker pool"""
+        series = self._get_series()
+        if self.stop_event.is_set() or not self.executor.pending():
+            self.stop_event.clear()
+            self.executor.reset()
+        self.running = True
+        futures = self.executor.submit_batch(
+            (run_backtest_job, (series, orders, self.initial_balance, self.fee_rate, self.price_mode,
+                                self.fill_model))
+            for orders in order_batches
+        )
+        for future in futures:
+            future.add_done_callback(self._on_backtest_done)
+        return futures
+
+    def run_parameter_sweep(self, space: SearchSpace, profile_names: tuple = PROFILE_NAMES,
+                            samples: Optional[int] = None, seed: Optional[int] = None,
+                            results_path: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Sweep profile parameters over the loaded history on all CPU cores, returning ranked results"""
+        runner = SweepRunner(
+            self._get_series(),
+            [load_profile(name) for name in profile_names],
+            space,
+            samples=samples,
+            seed=seed,
+            max_workers=getattr(self.config, 'backtest_workers', None),
+            initial_balance=self.initial_balance,
+            fee_rate=self.fee_rate,
+            results_path=results_path
+        )
+        for result in runner.run():
+            if self.stop_event.is_set():
+                break
+            if self.debug:
+                print_backtest_progress(f"Sweep run finished: {result['profile']} {result['total_return']:+.2f}%")
+        print_sweep_results(runner.ranked)
+        return runner.ranked
+
+    def run_walk_forward(self, space: SearchSpace, in_sample: int, out_of_sample: int,
+                         profile_name: str = 'default', step: Optional[int] = None,
+                         samples: Optional[int] = None, seed: Optional[int] = None) -> Dict[str, Any]:
+        """Walk-forward optimize a profile over the loaded history (window sizes in bars)"""
+        runner = WalkForwardRunner(
+            self._get_series(),
+            load_profile(profile_name),
+            space,
+            in_sample,
+            out_of_sample,
+            step=step,
+            samples=samples,
+            seed=seed,
+            max_workers=getattr(self.config, 'backtest_workers', None),
+            initial_balance=self.initial_balance,
+            fee_rate=self.fee_rate
+        )
+        results = runner.run()
+        print_walk_forward_results(results)
+        return results
+
+    def _on_backtest_done(self, future: Future) -> None:
+        if not self.executor.pending():
+            self.running = False
+
+    def _report_progress(self, completed: int, total: int) -> None:
+        if self.debug:
+            print_backtest_progress(f"Backtests completed: {completed}/{total}")
+
+    def stop_backtest(self, timeout: float = 5.0) -> bool:
+        """Stop running backtests gracefully, returning False if jobs are still running after timeout"""
         if self.running:
             self.stop_event.set()
-            if self._current_thread and self._current_thread.is_alive():
-                self._current_thread.join(timeout=5)  # Wait up to 5 seconds
-                if self._current_thread.is_alive():
-                    if self.debug:
-                        print_backtest_error("Backtest thread did not stop gracefully")
-                    return False
+            self.executor.cancel()
+            if not self.executor.wait(timeout=timeout):
+                if self.debug:
+                    print_backtest_error("Backtest workers did not stop gracefully")
+                return False
+            self.running = False
         return True
 
     def is_running(self) -> bool:
@@ -122,5 +291,4 @@ class BacktestTraderAgent(TraderAgent):
     def cleanup(self):
         """Cleanup resources before shutdown"""
         self.stop_backtest()
-        while not self.result_queue.empty():
-            _ = self.result_queue.get_nowait() 
\ No newline at end of file
+        self.executor.shutdown() 
\ No newline at end of file
@@ -1,9 +1,16 @@
-from typing import Dict, Any
+import asyncio
+from typing import Dict, Any, List, Optional
 from queue import Queue
 from threading import Event
 from .trader import TraderAgent
-import time
 from pydantic import Field, ConfigDict
+from src.llm.batch import BatchDecider, DEFAULT_MAX_WAIT
+from src.trading.async_engine import AsyncTradingEngine
+from src.trading.clock import Scheduler
+from src.trading.fill_pipeline import FillPipeline
+from src.trading.fills import FILLED, PARTIALLY_FILLED
+from src.trading.order_tracker import OrderTracker
+from src.utils.display import print_trading_error, print_gate_metrics
 
 class LiveTraderAgent(TraderAgent):
     """Executes real trades on the exchange"""
@@ -14,51 +21,175 @@ class LiveTraderAgent(TraderAgent):
     trading_pairs: Queue = Field(default_factory=Queue)
     stop_event: Event = Field(default_factory=Event)
     running: bool = Field(default=False)
+    mock: bool = Field(default=False)
+    async_engine: Optional[AsyncTradingEngine] = Field(default=None)
+    order_tracker: Optional[OrderTracker] = Field(default=None)
+    batch_decider: Optional[BatchDecider] = Field(default=None)
+    scheduler: Optional[Scheduler] = Field(default=None)
     
     def __init__(self, config, exchange_client=None):
         super().__init__(config)
         self.exchange = exchange_client
         self.stop_event = Event()
         self.running = False
+        self.mock = getattr(config, 'mock', False)
+        if exchange_client is not None:
+            # Open orders are polled in the background; fills update the position as they arrive
+            self.order_tracker = OrderTracker(
+                exchange_client,
+                min_interval=getattr(config, 'order_poll_min_interval', 0.5),
+                max_interval=getattr(config, 'order_poll_max_interval', 10.0),
+                on_error=self._on_tracker_error
+            )
+            self.order_tracker.subscribe(self.update_position, (FILLED, PARTIALLY_FILLED))
 
-    def start_trading(self):
-        """Start the trading loop"""
+    def start_trading(self, duration: Optional[float] = None):
+        """
+        Start the trading loop: a trading step every config.trading_interval on the clock's scheduler.
+
+        Args:
+            duration: Stop after this many seconds of clock time (runs until stopped if None).
+                With a SimulatedClock, a day of trading intervals completes in milliseconds.
+        """
         self.running = True
         self.stop_event.clear()
-        
-        while not self.stop_event.is_set():
-            try:
-                # Get trading pair from queue (if any)
-                if not self.trading_pairs.empty():
-                    symbol = self.trading_pairs.get()
-                    
-                    # 1. Get fresh market data
-                    market_data = self.data_analyst.fetch_market_data(
-                        self.exchange, symbol
-                    )
-                    
-                    # 2. Make trading decision
-                    decision = self.generate_trading_decision(market_data)
-                    
-                    # 3. Execute if needed
-                    if decision['action'] != 'HOLD':
-                        self.execute_trade(decision)
-                        
-                # Sleep between iterations
-                time.sleep(self.config.trading_interval)
-                    
-            except Exception as e:
-                if self.debug:
-                    print_api_error(f"Trading error: {str(e)}")
+        if self.order_tracker is not None:
+            self.order_tracker.start()
+        if self.fill_pipeline is not None:
+            self.fill_pipeline.start()
+        end_time = self.clock.time() + duration if duration is not None else float('inf')
+        self.scheduler = Scheduler(self.clock)
+        self.scheduler.every(self.config.trading_interval, self._scheduled_step)
+        # Checked after the scheduler is set, so stop_trading() stops one or the other
+        if not self.stop_event.is_set():
+            self.scheduler.run_until(end_time)
+        self.running = False
+
+    def _scheduled_step(self):
+        """Trading step of the scheduler, which keeps running after a failed one"""
+        try:
+            self.trading_step()
+        except Exception as e:
+            if self.debug:
+                print_trading_error(f"Trading error: {str(e)}")
+
+    def trading_step(self):
+        """Run one trading iteration for the next queued pair"""
+        # Get trading pair from queue (if any)
+        if not self.trading_pairs.empty():
+            symbol = self.trading_pairs.get()
+            
+            # 1. Get fresh market data
+            market_data = self.fetch_market_data(symbol)
+            
+            # 2. Make trading decision
+            decision = self.generate_trading_decision(market_data)
+            
+            # 3. Execute if needed
+            if decision['action'] != 'HOLD':
+                self.execute_trade(decision)
+
+    def fetch_market_data(self, symbol: str) -> Dict[str, Any]:
+        """Fresh market data for symbol from the exchange's 24h ticker (ccxt fetch_ticker)"""
+        if self.exchange is None:
+            raise ValueError("No exchange client to fetch market data from")
+        ticker = self.exchange.fetch_ticker(symbol)
+        price = float(ticker['last'])
+        high = float(ticker.get('high') or price)
+        low = float(ticker.get('low') or price)
+        return {
+            'symbol': symbol,
+            'price': price,
+            'volume': float(ticker.get('quoteVolume') or 0.0),
+            'change_24h': float(ticker.get('percentage') or 0.0),
+            'high_low_range': (high - low) / low * 100 if low > 0 else 0.0
+        }
+
+    def start_async_trading(self, symbols: List[str], interval: Optional[float] = None):
+        """
+        Trade several pairs concurrently, one asyncio task per pair (blocks until stop_trading).
+
+        Each pair is refreshed every interval seconds (default config.trading_interval)
+        regardless of the number of pairs; LLM calls and exchange requests are capped by
+        config.llm_concurrency and config.exchange_concurrency. With config.llm_batch_size > 1,
+        decisions of pairs due within config.llm_batch_max_wait seconds are batched into one prompt.
+        """
+        llm_concurrency = getattr(self.config, 'llm_concurrency', 2)
+        batch_size = getattr(self.config, 'llm_batch_size', 1)
+        decide = self.generate_trading_decision
+        if batch_size > 1:
+            # Pairs due at about the same time share one LLM call
+            self.batch_decider = BatchDecider(
+                self.generate_trading_decisions,
+                batch_size=batch_size,
+                max_wait=getattr(self.config, 'llm_batch_max_wait', DEFAULT_MAX_WAIT),
+                concurrency=llm_concurrency
+            )
+            decide = self.batch_decider.decide
+            llm_concurrency *= batch_size
+        self.async_engine = AsyncTradingEngine(
+            fetch_market_data=self.fetch_market_data,
+            decide=decide,
+            execute=self.execute_trade,
+            interval=interval or self.config.trading_interval,
+            llm_concurrency=llm_concurrency,
+            exchange_concurrency=getattr(self.config, 'exchange_concurrency', 4),
+            on_error=self._on_pair_error,
+            clock=self.clock
+        )
+        for symbol in symbols:
+            self.async_engine.add_pair(symbol)
+        self.running = True
+        if self.order_tracker is not None:
+            self.order_tracker.start()
+        if self.fill_pipeline is not None:
+            self.fill_pipeline.start()
+        try:
+            asyncio.run(self.async_engine.run())
+        finally:
+            self.running = False
+
+    def _on_pair_error(self, symbol: str, error: Exception):
+        if self.debug:
+            print_trading_error(f"Trading error for {symbol}: {str(error)}")
+
+    def _on_tracker_error(self, source: str, error: Exception):
+        print_trading_error(f"Order tracking error ({source}): {str(error)}")
+
+    def _on_fill_error(self, source: str, error: Exception):
+        print_trading_error(f"Fill booking error ({source}): {str(error)}")
 
     def stop_trading(self):
         """Stop the trading loop"""
         self.stop_event.set()
+        if self.scheduler is not None:
+            self.scheduler.stop()
+        if self.async_engine is not None:
+            self.async_engine.stop()
+        if self.order_tracker is not None:
+            self.order_tracker.stop()
+        if self.batch_decider is not None:
+            self.batch_decider.stop()
+        if self.fill_pipeline is not None:
+            self.fill_pipeline.stop()
+        if self.decision_cache is not None:
+            self.decision_cache.save()
+        if self.debug and self.decision_gate is not None:
+            print_gate_metrics(self.decision_gate.metrics.as_dict(),
+                               self.decision_cache.stats() if self.decision_cache is not None else None)
         self.running = False
 
-    def add_trading_pair(self, symbol: str):
-        """Add a pair to trade"""
-        self.trading_pairs.put(symbol)
+    def add_trading_pair(self, symbol: str, interval: Optional[float] = None):
+        """Add a pair to trade (takes effect immediately when the async engine is running)"""
+        if self.async_engine is not None and self.async_engine.running:
+            self.async_engine.add_pair(symbol, interval)
+        else:
+            self.trading_pairs.put(symbol)
+
+    def remove_trading_pair(self, symbol: str):
+        """Stop trading a pair in the async engine"""
+        if self.async_engine is not None:
+            self.async_engine.remove_pair(symbol)
 
     def execute_trade(self, trade_params: Dict[str, Any]) -> Dict[str, Any]:
         """Execute live trade on exchange"""
@@ -74,18 +205,27 @@ class LiveTraderAgent(TraderAgent):
             # Execute on real exchange
             response = self.exchange.create_order(**order)
             
-            # Monitor execution
-            execution_result = self.monitor_orders(response)
-            
-            if self.debug:
-                print_trading_data(execution_result)
-                
-            return execution_result
+            # Track execution without waiting for the fill
+            return self.monitor_orders(response)
             
         except Exception as e:
-            print_api_error(str(e))
+            print_trading_error(str(e))
             return self._get_default_decision(str(e))
             
+    def monitor_orders(self, order: Dict[str, Any]) -> Dict[str, Any]:
+        """Hand the order to the order tracker and return immediately; fills arrive as events"""
+        if self.order_tracker is not None:
+            self.order_tracker.track(order)
+        return order
+
+    def subscribe_portfolio(self, portfolio_manager, exchange: str, account_id: str) -> FillPipeline:
+        """Record fills reported by the order tracker as portfolio transactions, booked in batches"""
+        self.connect_portfolio(self.fill_pipeline or FillPipeline(portfolio_manager, on_error=self._on_fill_error),
+                               exchange, account_id)
+        if self.running:
+            self.fill_pipeline.start()
+        return self.fill_pipeline
+
     def mock_execute_trade(self, order: Dict[str, Any]) -> Dict[str, Any]:
         """Execute mock trade for testing"""
         return {
@@ -1,15 +1,14 @@
-from typing import Dict, Optional
+from typing import Any, Dict, List, Optional
 from rich.console import Console
-from rich.table import Table, box
-from datetime import datetime
+from datetime import datetime, timedelta
+from dataclasses import asdict
 from pathlib import Path
 import json
 from dotenv import load_dotenv
 from crewai import Agent
 from src.config.models.portfolio import AccountType, Action
-from src.agents.data_analyst import BTC, ETH
-import src.agents.data_analyst as dt
-from coinbase.rest import RESTClient
+from src.utils.order_archive import OrderArchive, parse_order_date
+from src.utils.portfolio_view import PortfolioPrinter, PORTFOLIO_PATH, load_portfolio, price_portfolio
 import os
 from rich.console import Console
 console = Console()  # Create console instance for colored output
@@ -20,150 +19,19 @@ from src.config.models.portfolio import (
     Account, AccountType, Action
 )
 
-class PortfolioPrinter:
-    def __init__(self, console: Console):
-        self.console = console
-
-    def print_transaction_added(self, action: Action, amount: float, symbol: str, 
-                              price: float, exchange: str, account: str):
-        self.console.print(
-            f"\n[green]{action.value}[/] {amount} {symbol} @ {price:,.2f} "
-            f"on {exchange} ({account})"
-        )
-
-    def get_portfolio(self, portfolio: Dict, coingecko_prices: Dict):
-        self.console.print("\n[dim]─── Portfolio Overview ───[/]")
-
-    def print_portfolio(self, portfolio: Dict):
-        """
-        Print the portfolio overview using rich.
-        
-        Args:
-            portfolio (Dict): Updated portfolio data.
-        """
-        self.console.print("\n[dim]─── Portfolio Overview ───[/]")
-        
-        currency = portfolio.get('display_currency', '$')
-        total_portfolio_value = 0
-        total_cost = 0
-        total_pnl = 0
-
-        for exchange_name, exchange in portfolio['exchanges'].items():
-            self.console.print(f"[bold]{exchange_name}[/]")
-            
-            if not exchange['accounts']:
-                print("Empty portfolio...continue")
-                continue
-
-            for account_id, account in exchange['accounts'].items():
-                account_value = 0
-                account_cost = 0
-                account_pnl = 0
-
-                table = Table(show_header=True, header_style="bold magenta", box=box.ROUNDED)
-                table.add_column(f"{account['name']}", style="dim", justify="left")
-                table.add_column("Amount", justify="right", style="cyan")
-                table.add_column("Cost", justify="right", style="cyan")
-                table.add_column("Value", justify="right", style="cyan")
-                table.add_column("PNL", justify="right", style="cyan")
-                table.add_column("PNL %", justify="right", style="cyan")
-
-                for symbol, pos in account['positions'].items():
-                    table.add_row(
-                        symbol,
-                        f"{pos['amount']:.4f}",
-                        f"{currency}{pos['mean_price']:,.2f}",
-                        f"{currency}{pos['total_value']:,.2f}",
-                        f"[green]{currency}{pos['pnl']:,.2f}[/]" if pos['pnl'] >= 0 else f"[red]{currency}{pos['pnl']:,.2f}[/]",
-                        f"[green]{pos['pnl_percentage']:+.2f}%[/]" if pos['pnl'] >= 0 else f"[red]{pos['pnl_percentage']:+.2f}%[/]"
-                    )
-
-                    account_value += pos['total_value']
-                    account_cost += pos['amount'] * pos['mean_price']
-                    account_pnl += pos['pnl']
-
-                total_portfolio_value += account_value
-                total_cost += account_cost
-                total_pnl += account_pnl
-
-                table.add_row(
-                    "[bold]Total[/]", "", "",
-                    f"[bold]{currency}{account_value:,.2f}[/]",
-                    f"[green]{currency}{account_pnl:,.2f}[/]" if account_pnl >= 0 else f"[red]{currency}{account_pnl:,.2f}[/]",
-                    f"[green]{(account_pnl / account_cost) * 100:+.2f}%[/]" if account_pnl >= 0 else f"[red]{(account_pnl / account_cost) * 100:+.2f}%[/]"
-                )
-                self.console.print(table)
-
-    def print_orders(self, portfolio: Dict, exchange: Optional[str] = None, 
-                    account: Optional[str] = None, order_id: Optional[str] = None):
-        table = Table(show_edge=True, box=None)
-        table.add_column("Exchange", style="dim")
-        table.add_column("Account", style="dim")
-        table.add_column("Market", style="dim")
-        table.add_column("Type", style="dim")
-        table.add_column("Date", style="dim")
-        table.add_column("Amount", justify="right", style="dim")
-        table.add_column("Price", justify="right", style="dim")
-        table.add_column("Subtotal", justify="right", style="dim")
-        table.add_column("Fee", justify="right", style="dim")
-        table.add_column("Total", justify="right", style="dim")
-        
-        currency = portfolio.get('display_currency', '$')
-        all_orders = []  # New list to collect all orders
-        
-        for exch_name, exch_data in portfolio['exchanges'].items():
-            if exchange and exchange != exch_name:
-                continue
-                
-            for acc_id, acc_data in exch_data['accounts'].items():
-                if account and account != acc_id:
-                    continue
-                    
-                for symbol, pos in acc_data['positions'].items():
-                    for order in pos['orders']:
-                        if order_id and order['order_id'] != order_id:
-                            continue
-                        # Collect order info with exchange and account details
-                        all_orders.append({
-                            'exchange': exch_name,
-                            'account': acc_data['name'],
-                            'order': order
-                        })
-        
-        # Sort orders by date (newest first)
-        all_orders.sort(key=lambda x: x['order']['last_filled'], reverse=True)
-        
-        # Add sorted orders to table
-        for order_info in all_orders:
-            order = order_info['order']
-            order_style = "green" if "Buy" in order['order_type'] else "red"
-            
-            table.add_row(
-                order_info['exchange'],
-                order_info['account'],
-                order['pair'],
-                f"[{order_style}]{order['order_type']}[/]",
-                order['last_filled'],
-                f"x{order['amount']:.6f}",
-                f"{currency}{order['execution_price']:,.2f}",
-                f"{currency}{order['subtotal']:,.2f}",
-                f"{currency}{order['fee']:,.2f}",
-                f"{currency}{order['total']:,.2f}"
-            )
-        
-        self.console.print("\n[dim]─── Orders Overview ───[/]")
-        self.console.print(table)
-
 class PortfolioManagerAgent(Agent):
     """Agent responsible for portfolio management"""
     # Pydantic configuration
     model_config = ConfigDict(arbitrary_types_allowed=True)
     # Declare fields using Pydantic's Field
     config: Dict = Field(default_factory=dict)
-    portfolio_path: str = Field(default=str(Path(__file__).parent.parent / 'config' / 'data' / 'portfolio.json'))
+    portfolio_path: str = Field(default=str(PORTFOLIO_PATH))
     printer: PortfolioPrinter = Field(default_factory=lambda: PortfolioPrinter(Console()))
     portfolio: Portfolio = Field(default_factory=Portfolio)
-    coinbase_client: Optional[RESTClient] = Field(default=None)
+    coinbase_client: Optional[Any] = Field(default=None)  # coinbase.rest.RESTClient, created on first sync
+    order_archive: Optional[OrderArchive] = Field(default=None)
+    archive_horizon_days: int = Field(default=90)      # Orders older than this move to the cold archive
+    archive_max_orders: int = Field(default=100)       # Max hot orders kept per position
 
     def __init__(self, config: Dict, **kwargs):
         super().__init__(
@@ -178,7 +46,9 @@ class PortfolioManagerAgent(Agent):
             tools=[],
         )
         self.config = config
-        self._load_portfolio()  # Load portfolio immediately
+        self.archive_horizon_days = getattr(config, 'archive_horizon_days', self.archive_horizon_days)
+        self.archive_max_orders = getattr(config, 'archive_max_orders', self.archive_max_orders)
+        self._load_portfolio(getattr(config, 'portfolio_path', None))  # Load portfolio immediately
         self._validate_portfolio_structure()  # Ensure all required fields exist
         self._initialize_virtual_exchange()  # Initialize virtual exchange if it doesn't exist        self.session = agentops.start_session(name=self.role)
             
@@ -186,29 +56,9 @@ class PortfolioManagerAgent(Agent):
         """Load portfolio from file, handling empty or invalid files"""
         if path:
             self.portfolio_path = path
+        self.order_archive = OrderArchive(str(Path(self.portfolio_path).with_suffix('.archive.jsonl.gz')))
 
-        # Initialize a fresh portfolio if loading fails
-        self.portfolio = Portfolio()
-
-        try:
-            with open(self.portfolio_path, 'r') as f:
-                data = json.load(f)
-                
-                # Check if file is empty or missing required structure
-                if not data or 'exchanges' not in data:
-                    console.print("[yellow]Portfolio file is empty or invalid. Initializing a fresh portfolio.[/]")
-                    return self.portfolio
-                
-                # Parse the portfolio data
-                self.portfolio = Portfolio.parse_obj(data)
-                console.print("[green]Portfolio loaded successfully![/]")
-                
-        except (FileNotFoundError, json.JSONDecodeError) as e:
-            # Handle both missing file and invalid JSON
-            console.print(f"[yellow]Error loading portfolio: {e}. Initializing a fresh portfolio.[/]")
-        except Exception as e:
-            console.print(f"[red]Unexpected error loading portfolio: {e}[/]")
-        
+        self.portfolio = load_portfolio(self.portfolio_path, console)
         return self.portfolio
 
     def _validate_portfolio_structure(self) -> None:
@@ -232,10 +82,90 @@ class PortfolioManagerAgent(Agent):
 
     def _save_portfolio(self):
         console.print("Saving portfolio...")
+        self.archive_orders()
         with open(self.portfolio_path, 'w') as f:
             portfolio_dict = self.portfolio.dict()
             json.dump(portfolio_dict, f, indent=4)
 
+    def archive_orders(self) -> int:
+        """
+        Move orders older than archive_horizon_days, or beyond archive_max_orders
+        per position, from the hot portfolio to the cold order archive.
+
+        Returns:
+            int: Number of orders archived.
+        """
+        if self.order_archive is None:
+            return 0
+        cutoff = datetime.now() - timedelta(days=self.archive_horizon_days)
+        archived = 0
+        for exchange_name, exchange in self.portfolio.exchanges.items():
+            for account_id, account in exchange.accounts.items():
+                for symbol, position in account.positions.items():
+                    orders = position.orders
+                    # Orders are chronological: archive the overflow, then anything past the horizon
+                    keep_from = max(0, len(orders) - self.archive_max_orders)
+                    while keep_from < len(orders):
+                        filled = parse_order_date(orders[keep_from].last_filled)
+                        if filled is None or filled >= cutoff:
+                            break
+                        keep_from += 1
+                    if keep_from:
+                        self.order_archive.append(exchange_name, account_id, symbol,
+                                                  [asdict(order) for order in orders[:keep_from]])
+                        position.orders = orders[keep_from:]
+                        position.archived_orders += keep_from
+                        archived += keep_from
+        return archived
+
+    def _position_orders(self, exchange: str, account_id: str, symbol: str,
+                         position: Position) -> List[OrderDetails]:
+        """Full order history of a position, paging in archived orders only if it has any"""
+        if not position.archived_orders or self.order_archive is None:
+            return list(position.orders)
+        archived = [OrderDetails(**order) for order in self.order_archive.orders(exchange, account_id, symbol)]
+        return archived + position.orders
+
+    def _page_in_archived_orders(self, portfolio_dict: Dict, exchange: Optional[str] = None,
+                                 account: Optional[str] = None) -> None:
+        """Prepend archived orders to the order lists of a portfolio dict"""
+        for exch_name, exch_data in portfolio_dict['exchanges'].items():
+            if exchange and exchange != exch_name:
+                continue
+            for acc_id, acc_data in exch_data['accounts'].items():
+                if account and account != acc_id:
+                    continue
+                for symbol, pos in acc_data['positions'].items():
+                    if pos.get('archived_orders'):
+                        pos['orders'] = self.order_archive.orders(exch_name, acc_id, symbol) + pos['orders']
+
+    def recompute_position(self, exchange: str, account_id: str, symbol: str) -> Position:
+        """Recompute a position's amount, mean price, costs and fees by replaying its full order history"""
+        position = self.portfolio.exchanges[exchange].accounts[account_id].positions[symbol]
+        amount = subtotal_cost = total_cost = total_fees = mean_price = 0.0
+        for order in self._position_orders(exchange, account_id, symbol, position):
+            if "Buy" in order.order_type:
+                amount += order.amount
+                subtotal_cost += order.subtotal
+                total_fees += order.fee
+                total_cost += order.total
+                mean_price = subtotal_cost / amount if amount else 0.0
+            else:
+                amount -= order.amount
+                subtotal_cost = amount * mean_price
+                total_cost = subtotal_cost + total_fees
+        position.amount = float(amount)
+        position.mean_price = float(mean_price)
+        position.subtotal_cost = float(subtotal_cost)
+        position.total_cost = float(total_cost)
+        position.total_fees = float(total_fees)
+        return position
+
+    @staticmethod
+    def _history_amount(orders: List[OrderDetails]) -> float:
+        """Amount held according to an order history"""
+        return sum(order.amount if "Buy" in order.order_type else -order.amount for order in orders)
+
     def _create_exchange(self, name: str) -> Exchange:
         if name not in self.portfolio.exchanges:
             print("create exchange")
@@ -256,76 +186,100 @@ class PortfolioManagerAgent(Agent):
             self._save_portfolio()
         return exchange.accounts[account_id]
 
-    def update_portfolio(self) -> Dict:
+    def update_portfolio(self, prices: Optional[Dict] = None) -> Dict:
         """
         Update the portfolio with the latest CoinGecko prices and recalculate metrics.
         
         Args:
-            coingecko_prices (Dict): Latest prices from CoinGecko.
+            prices (Dict): Already fetched CoinGecko prices (e.g. kept warm by a
+                PriceRefresher); fetched now when None.
         
         Returns:
             Dict: Updated portfolio data.
         """
-        portfolio_dict = self.portfolio.dict()
-        coingecko_prices = dt.coingecko_get_price(
-            crypto_ids=[BTC, ETH], 
-            currency=self.config.display_currency
-        )
-        # Mapping from portfolio symbols to CoinGecko IDs
-        symbol_to_coingecko = {
-            "BTC": "bitcoin",
-            "ETH": "ethereum",
-            "SOL": "solana",
-            "XRP": "xrp",
-            "DOGE": "dogecoin",
-            "USDT": "tether",
-            "USDC": "usd-coin",
-            "BTC/USDT": "bitcoin",
-            "ETH/USDT": "ethereum",
-            "SOL/USDT": "solana",
-            "XRP/USDT": "xrp",
-            "DOGE/USDT": "dogecoin",
-        }
-
-        # Update portfolio with latest prices and recalculate metrics
-        for exchange_name, exchange in portfolio_dict['exchanges'].items():
-            for account_id, account in exchange['accounts'].items():
-                for symbol, position in account['positions'].items():
-                    coingecko_id = symbol_to_coingecko.get(symbol, symbol.lower())
-                    current_price = coingecko_prices.get(coingecko_id, {}).get('price', position['mean_price'])
-
-                    # Update position with current price
-                    position['current_price'] = current_price
-                    position['total_value'] = position['amount'] * current_price
-                    position['pnl'] = position['total_value'] - (position['amount'] * position['mean_price'])
-                    position['pnl_percentage'] = (position['pnl'] / (position['amount'] * position['mean_price'])) * 100
-
-        return portfolio_dict
-
-    def show_portfolio(self) -> Dict:
+        return price_portfolio(self.portfolio.dict(), self.config.display_currency, prices)
+
+    def show_portfolio(self, prices: Optional[Dict] = None, prices_age: Optional[float] = None) -> Dict:
         """
         Fetch the latest portfolio data, update it with CoinGecko prices, and display it.
         
+        Args:
+            prices (Dict): Already fetched prices to value the portfolio with, instead of fetching.
+            prices_age (float): Seconds since those prices were fetched, shown under the overview.
+        
         Returns:
             Dict: Updated portfolio data in JSON format.
         """
-        updated_portfolio = self.update_portfolio()
+        updated_portfolio = self.update_portfolio(prices)
         self.printer.print_portfolio(updated_portfolio)
+        if prices_age is not None:
+            self.printer.print_prices_age(prices_age)
         return updated_portfolio
 
     def show_orders(self, exchange:  Optional[str] = None, 
                    account: Optional[str] = None, order_id: Optional[str] = None):
         portfolio_dict = self.portfolio.dict()
+        # The archive is only read for positions that have archived orders
+        if self.order_archive is not None:
+            self._page_in_archived_orders(portfolio_dict, exchange, account)
         self.printer.print_orders(portfolio_dict, exchange, account, order_id)
 
     def add_transaction(self, exchange: str, account_id: str, symbol: str, 
-                   amount: float, price: float, action: Action, fee_rate: float = 0.5) -> None:
+                   amount: float, price: float, action: Action, fee_rate: float = 0.5,
+                   order_id: Optional[str] = None, filled_at: Optional[datetime] = None) -> None:
         """Add a new transaction to a specific account in an exchange"""
+        account = self._apply_transaction(exchange, account_id, symbol, amount, price, action, fee_rate,
+                                          order_id, filled_at)
+
+        # Save changes immediately
+        self._save_portfolio()
+        
+        # Print confirmation
+        self.printer.print_transaction_added(
+            action, amount, symbol, price, exchange, account.name
+        )
+
+    def add_transactions(self, transactions: List[Dict]) -> int:
+        """
+        Add a batch of transactions with a single portfolio save.
+
+        Args:
+            transactions: Dicts with the add_transaction arguments (exchange, account_id,
+                symbol, amount, price, action and optional fee_rate, order_id, filled_at).
+
+        Returns:
+            int: Number of transactions added; invalid ones are reported and skipped.
+
+        Raises:
+            OSError: If the portfolio can't be saved; the transactions stay
+                applied in memory, so save_portfolio() can retry.
+        """
+        added = 0
+        for transaction in transactions:
+            try:
+                self._apply_transaction(**transaction, verbose=False)
+                added += 1
+            except (ValueError, KeyError, TypeError) as e:
+                console.print(f"[yellow]Skipped transaction: {e}[/]")
+        if added:
+            self._save_portfolio()
+        return added
+
+    def save_portfolio(self) -> None:
+        """Save the portfolio, e.g. to retry a save of add_transactions that failed"""
+        self._save_portfolio()
+
+    def _apply_transaction(self, exchange: str, account_id: str, symbol: str,
+                           amount: float, price: float, action: Action, fee_rate: float = 0.5,
+                           order_id: Optional[str] = None, filled_at: Optional[datetime] = None,
+                           verbose: bool = True) -> Account:
+        """Apply a transaction to the in-memory portfolio without saving it"""
         if exchange not in self.portfolio.exchanges or \
         account_id not in self.portfolio.exchanges[exchange].accounts:
             raise ValueError(f"Invalid exchange or account: {exchange}/{account_id}")
 
         account = self.portfolio.exchanges[exchange].accounts[account_id]
+        filled_at = filled_at or datetime.now()
         
         # Calculate transaction values
         subtotal = amount * price                    # 0.5 * 70000 = 35000
@@ -334,7 +288,7 @@ class PortfolioManagerAgent(Agent):
         
         # Create the order details
         order = OrderDetails(
-            order_id=f"{action.value.lower()}-{datetime.now().strftime('%Y%m%d-%H%M%S')}",
+            order_id=order_id or f"{action.value.lower()}-{filled_at.strftime('%Y%m%d-%H%M%S')}",
             pair=symbol,
             order_type=f"Market {action.value.title()}",
             amount=float(amount),
@@ -342,21 +296,23 @@ class PortfolioManagerAgent(Agent):
             subtotal=float(subtotal),
             fee=float(fee),
             total=float(total),
-            last_filled=datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            last_filled=filled_at.strftime('%Y-%m-%d %H:%M:%S')
         )
         
-        if action.value == Action.SELL:
-            if symbol not in account.positions:
+        # Positions are keyed by base asset
+        base_asset = symbol.split('/')[0]
+        if action is Action.SELL:
+            if base_asset not in account.positions:
                 raise ValueError(f"Cannot SELL {symbol}: no position exists")
-            current_amount = account.positions[symbol].amount
-            if amount > current_amount:
+            current_amount = account.positions[base_asset].amount
+            if amount > current_amount * (1 + 1e-9):
                 raise ValueError(f"Cannot SELL {amount} {symbol}: only {float(current_amount)} available")
 
         # Handle position creation or update
-        base_asset = symbol.split('/')[0]
         if base_asset not in account.positions:
             # Create new position (only for BUY)
-            print('create new position')
+            if verbose:
+                print('create new position')
             account.positions[base_asset] = Position(
                 amount=float(amount),
                 mean_price=float(price),
@@ -366,7 +322,8 @@ class PortfolioManagerAgent(Agent):
                 orders=[order]                  # List of orders
             )
         else:
-            print('update position')
+            if verbose:
+                print('update position')
             position = account.positions[base_asset]
             current_amount = float(position.amount)
             current_cost = float(position.subtotal_cost)
@@ -387,6 +344,10 @@ class PortfolioManagerAgent(Agent):
             else: 
                 # For SELL actions, reduce the amount and adjust costs
                 new_amount = float(current_amount) - float(amount)
+                if new_amount <= current_amount * 1e-9:
+                    # Remove position if no amount left
+                    self._drop_position(exchange, account_id, base_asset)
+                    return account
                 position.amount = float(new_amount)
                 position.subtotal_cost = float(new_amount * position.mean_price)
                 position.total_cost = float(new_amount * position.mean_price) + float(position.total_fees)
@@ -394,13 +355,29 @@ class PortfolioManagerAgent(Agent):
             # Append the new order to the position's order history
             position.orders.append(order)
 
-        # Save changes immediately
-        self._save_portfolio()
-        
-        # Print confirmation
-        self.printer.print_transaction_added(
-            action, amount, symbol, price, exchange, account.name
-        )
+        return account
+
+    def create_account(self, exchange_name: str, account_id: str, name: str,
+                       account_type: AccountType = AccountType.REAL) -> Account:
+        """Create (or return) an account, e.g. the one a live trader books its fills into"""
+        return self._create_account(exchange_name, account_id, name, account_type)
+
+    def create_virtual_accounts(self, accounts: Dict[str, str]) -> List[Account]:
+        """Create (or return) virtual accounts from account_id -> name, e.g. one per paper-traded strategy"""
+        exchange = self.portfolio.exchanges.setdefault("virtual", Exchange(name="virtual"))
+        created = False
+        for account_id, name in accounts.items():
+            if account_id not in exchange.accounts:
+                exchange.accounts[account_id] = Account(
+                    account_id=account_id,
+                    name=name,
+                    account_type=AccountType.VIRTUAL,
+                    positions={}
+                )
+                created = True
+        if created:
+            self._save_portfolio()
+        return [exchange.accounts[account_id] for account_id in accounts]
 
     def _initialize_virtual_exchange(self):
         """Initialize virtual exchange with a default simulation account if it doesn't exist"""
@@ -465,30 +442,63 @@ class PortfolioManagerAgent(Agent):
                     order_found = True
                     # Remove the order
                     position.orders.remove(order)
-                    
-                    # Recalculate position after removing order
-                    if "Buy" in order.order_type:
-                        position.amount -= order.amount
-                    else:  # Sell
-                        position.amount += order.amount
-                    
-                    # Update position values
-                    if position.amount > 0:
-                        position.estimated_value_usd = position.amount * position.mean_price
-                    else:
-                        # Remove position if no amount left
-                        del account.positions[symbol]
-                    
-                    # Save changes
-                    self._save_portfolio()
-                    
-                    # Use printer for output
-                    self.printer.print_transaction_deleted(order_id, exchange, account.name)
+                    self._remove_order_and_save(exchange, account_id, symbol, order)
                     return
 
+        # Fall back to the cold archive, only read when the order is not hot
+        record = self.order_archive.find(exchange, account_id, order_id) if self.order_archive else None
+        if record and record['symbol'] in account.positions and account.positions[record['symbol']].archived_orders:
+            order_found = True
+            self.order_archive.delete(exchange, account_id, record['symbol'], order_id)
+            account.positions[record['symbol']].archived_orders -= 1
+            self._remove_order_and_save(exchange, account_id, record['symbol'], OrderDetails(**record['order']))
+            return
+
         if not order_found:
             raise ValueError(f"Order {order_id} not found in {exchange}/{account_id}")
 
+    def _remove_order_and_save(self, exchange: str, account_id: str, symbol: str, order: OrderDetails) -> None:
+        """
+        Update a position after one of its orders was removed, then persist.
+
+        The position is rebuilt from its order history only when that history
+        (plus the removed order) accounts for the whole amount. Otherwise, e.g.
+        for Coinbase-synced amounts without orders, only the removed order is
+        taken out of the position.
+        """
+        account = self.portfolio.exchanges[exchange].accounts[account_id]
+        position = account.positions[symbol]
+        remaining = self._position_orders(exchange, account_id, symbol, position)
+        signed = order.amount if "Buy" in order.order_type else -order.amount
+        if abs(self._history_amount(remaining) + signed - position.amount) <= 1e-9 * max(1.0, abs(position.amount)):
+            position = self.recompute_position(exchange, account_id, symbol)
+        elif "Buy" in order.order_type:
+            position.amount -= order.amount
+            position.subtotal_cost -= order.subtotal
+            position.total_fees -= order.fee
+            position.total_cost -= order.total
+            if position.amount > 0:
+                position.mean_price = position.subtotal_cost / position.amount
+        else:
+            position.amount += order.amount
+            position.subtotal_cost = position.amount * position.mean_price
+            position.total_cost = position.subtotal_cost + position.total_fees
+        if position.amount <= 0:
+            # Remove position if no amount left
+            self._drop_position(exchange, account_id, symbol)
+
+        # Save changes
+        self._save_portfolio()
+
+        # Use printer for output
+        self.printer.print_transaction_deleted(order.order_id, exchange, account.name)
+
+    def _drop_position(self, exchange: str, account_id: str, symbol: str) -> None:
+        """Remove a closed position with its archived orders, so a new position in symbol starts clean"""
+        position = self.portfolio.exchanges[exchange].accounts[account_id].positions.pop(symbol)
+        if position.archived_orders and self.order_archive is not None:
+            self.order_archive.purge(exchange, account_id, symbol)
+
     def init_coinbase_client(self) -> None:
         """Initialize Coinbase client using environment variables."""
         load_dotenv()
@@ -496,9 +506,10 @@ class PortfolioManagerAgent(Agent):
         api_secret = os.getenv('COINBASE_API_SECRET', '')
         
         if not api_key or not api_secret:
-            self.console.print("[yellow]Coinbase API key and secret not found in environment variables. Skipping Coinbase sync.[/]")
+            console.print("[yellow]Coinbase API key and secret not found in environment variables. Skipping Coinbase sync.[/]")
             return
         
+        from coinbase.rest import RESTClient  # Only needed when syncing Coinbase
         self.coinbase_client = RESTClient(api_key=api_key, api_secret=api_secret)
         console.print("[green]Coinbase client initialized successfully![/]")
 
@@ -1,7 +1,6 @@
 # receptionist.py
 from typing import Dict, Any, List
 from crewai import Agent
-import readline
 from rich.console import Console
 console = Console() 
 # Autocomplete function
@@ -12,10 +11,14 @@ def completer(text, state):
     else:
         return None
 
-# Set the completer function
-readline.set_completer(completer)
-# Use tab for autocomplete
-readline.parse_and_bind("tab: complete")
+def enable_completion() -> None:
+    """Tab completion of commands, set up on the first prompt"""
+    import readline
+    if readline.get_completer() is not completer:
+        # Set the completer function
+        readline.set_completer(completer)
+        # Use tab for autocomplete
+        readline.parse_and_bind("tab: complete")
 
 VALID_COMMANDS: Dict[str, str] = {
             'show_portfolio': 'Portfolio overview',
@@ -48,6 +51,7 @@ class ReceptionistAgent(Agent):
             console.print(f"[green]•[/] [yellow]{cmd:<14}[/] - {desc}")
 
     def get_user_input(self) -> str:
+        enable_completion()
         console.print("\n[bold green]Enter a command:[/]")
         user_input = input("> ").strip().lower()
         if user_input in VALID_COMMANDS:
@@ -13,7 +13,7 @@ class TestTraderAgent(TraderAgent):
             order = self.format_order(trade_params)
             
             # Simulate trade execution
-            execution_result = self.simulate_execution(order)
+            execution_result = self.simulate_execution(order, trade_params.get('volume_24h', 0.0))
             
             if self.debug:
                 print_mock_trading()
@@ -23,17 +23,10 @@ class TestTraderAgent(TraderAgent):
         except Exception as e:
             return self._get_default_decision(str(e))
             
-    def simulate_execution(self, order: Dict[str, Any]) -> Dict[str, Any]:
-        """Simulate trade execution with artificial delay"""
-        import time
-        time.sleep(self._trade_delay)  # Simulate network delay
+    def simulate_execution(self, order: Dict[str, Any], volume: float = 0.0) -> Dict[str, Any]:
+        """Simulate trade execution with artificial delay, filled through the fill model"""
+        self.clock.sleep(self._trade_delay)  # Simulate network delay
         
-        return {
-            'id': f"test-{order['symbol']}-{time.time()}",
-            'status': 'FILLED',
-            'filled': order['amount'],
-            'price': order['params']['price'],  # Use price from order params
-            'cost': order['amount'] * order['params']['price'],
-            'fees': order['amount'] * order['params']['price'] * 0.001,
-            'side': order['side']  # Add side for position tracking
-        } 
\ No newline at end of file
+        result = self.fill_model.fill_order(order, volume=volume)
+        result['id'] = f"test-{order['symbol']}-{self.clock.time()}"
+        return result
@@ -1,22 +1,106 @@
+import time
 from abc import abstractmethod
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from crewai import Agent
 from pydantic import Field, ConfigDict
+from src.trading.exits import ExitRules, ExitRuleEngine
+from src.trading.fills import FillModel, FILLED, PARTIALLY_FILLED
+from src.trading.clock import Clock, RealClock
+from src.trading.fill_pipeline import FillPipeline
+from src.trading.prefilter import DecisionGate
+from src.config.profiles import load_profile
+from src.llm.decision_cache import DecisionCache
+from src.llm.prompts import build_batch_prompt, parse_batch_response, parse_decision_fields
+from src.llm.streaming import StreamingDecisionClient
+from src.llm.router import LLMRouter
+from src.utils.display import print_trading_error, print_trading_reasoning
+
+DEFAULT_TRADE_DELAY = 0.1  # Seconds of simulated network delay per order
 
 class TraderAgent(Agent):
     """Base trader agent with shared functionality"""
     
     model_config = ConfigDict(arbitrary_types_allowed=True)
     
+    config: Any = Field(default=None)
     historical_data: List = Field(default_factory=list)
     current_position: float = Field(default=0.0)
     entry_price: float = Field(default=0.0)
+    exit_engine: Optional[ExitRuleEngine] = Field(default=None)
+    fill_model: FillModel = Field(default_factory=FillModel)
+    clock: Clock = Field(default_factory=RealClock)
+    fill_pipeline: Optional[FillPipeline] = Field(default=None)
+    portfolio_exchange: str = Field(default='virtual')
+    portfolio_account: Optional[str] = Field(default=None)
+    profile: Dict[str, Any] = Field(default_factory=dict)
+    decision_gate: Optional[DecisionGate] = Field(default=None)
+    decision_cache: Optional[DecisionCache] = Field(default=None)
+    decision_stream: Optional[StreamingDecisionClient] = Field(default=None)
+    llm_router: Optional[LLMRouter] = Field(default=None)
     
     def __init__(self, config):
         super().__init__(config)
+        self.config = config
         self._historical_data = []
         self._current_position = 0.0
         self._entry_price = 0.0
+        # Simulated fills use the configured model (e.g. SlippageFillModel), naive fills otherwise
+        self.fill_model = getattr(config, 'fill_model', None) or FillModel()
+        # Waits go through the clock, so simulations can run on simulated or accelerated time
+        self.clock = getattr(config, 'clock', None) or RealClock()
+        self._trade_delay = getattr(config, 'trade_delay', DEFAULT_TRADE_DELAY)
+        # Fills are booked into the portfolio through a shared pipeline when one is configured
+        self.fill_pipeline = getattr(config, 'fill_pipeline', None)
+        self.portfolio_exchange = getattr(config, 'portfolio_exchange', self.portfolio_exchange)
+        self.portfolio_account = getattr(config, 'portfolio_account', None)
+        self.profile = getattr(config, 'profile', None) or load_profile(getattr(config, 'profile_name', 'default'))
+        # Decisions the profile rules can settle (HOLD inside the threshold, stop/take-profit exits) skip the LLM
+        if getattr(config, 'prefilter', True):
+            self.decision_gate = DecisionGate(self.profile)
+        # LLM decisions are reused for market states in the same buckets (decision_cache=False disables);
+        # they are only persisted across runs when config.decision_cache_path is set
+        cache = getattr(config, 'decision_cache', None)
+        if cache is None:
+            cache = DecisionCache(getattr(config, 'decision_cache_path', None),
+                                  ttl=getattr(config, 'decision_cache_ttl', 300.0), clock=self.clock)
+        self.decision_cache = cache if cache is not False else None
+        # Streamed completions let orders go out before the model has finished its reasoning
+        self.decision_stream = getattr(config, 'decision_stream', None)
+        # Several LLM backends: hedged at their p95 latency, failing over on errors
+        self.llm_router = getattr(config, 'llm_router', None)
+
+    def connect_portfolio(self, fill_pipeline: FillPipeline, exchange: str, account_id: str) -> None:
+        """Book every fill of this trader into exchange/account_id through fill_pipeline"""
+        self.fill_pipeline = fill_pipeline
+        self.portfolio_exchange = exchange
+        self.portfolio_account = account_id
+
+    def set_exit_rules(self, profile: Dict[str, Any]) -> None:
+        """Enforce the profile's stop-loss, trailing-stop and take-profit rules on filled positions"""
+        self.exit_engine = ExitRuleEngine(ExitRules.from_profile(profile))
+        if self.decision_gate is not None:
+            self.decision_gate = DecisionGate(profile, self.exit_engine)
+
+    def check_exits(self, prices: Dict[str, float]) -> List[Dict[str, Any]]:
+        """
+        Evaluate exit rules for all open positions against the latest prices.
+
+        Returns:
+            List of SELL trade parameters ready for execute_trade, with the
+            triggering rule in 'reason'.
+        """
+        if self.exit_engine is None:
+            return []
+        return [
+            {
+                'symbol': order['symbol'],
+                'action': 'SELL',
+                'amount': min(order['amount'], self._current_position),
+                'price': order['price'],
+                'reason': order['reason']
+            }
+            for order in self.exit_engine.evaluate(prices)
+        ]
 
     def validate_trade(self, trade_params: Dict[str, Any]) -> bool:
         """Validate trade parameters"""
@@ -41,18 +125,222 @@ class TraderAgent(Agent):
             return False
 
     def format_order(self, trade_params: Dict[str, Any]) -> Dict[str, Any]:
-        """Format trade parameters into order"""
-        return {
+        """
+        Format trade parameters into order.
+
+        MARKET by default; 'order_type' LIMIT takes its limit from 'limit_price' and
+        STOP its trigger from 'stop_price'. 'time_in_force' (GTC, IOC or FOK) is only
+        sent with LIMIT orders.
+        """
+        order_type = trade_params.get('order_type', 'MARKET').upper()
+        order = {
             'symbol': trade_params['symbol'],
-            'type': 'MARKET',
+            'type': order_type,
             'side': trade_params['action'],
             'amount': trade_params['amount'],
             'params': {
-                'timeInForce': 'GTC',
                 'timestamp': trade_params.get('timestamp'),
                 'price': trade_params.get('price', 0)
             }
         }
+        if order_type == 'LIMIT':
+            order['price'] = trade_params['limit_price']
+            order['params']['timeInForce'] = trade_params.get('time_in_force', 'GTC')
+        elif order_type == 'STOP':
+            order['params']['stopPrice'] = trade_params['stop_price']
+        return order
+
+    def generate_trading_decision(self, market_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Decide on market data: through the decision gate when the profile rules settle
+        it, otherwise by prompting the LLM with the profile's prompt_template.
+
+        Returns:
+            Dict: Decision with 'symbol', 'action', 'amount', 'price', 'confidence' and 'reasoning'.
+        """
+        try:
+            decision, key = self._decide_without_llm(market_data)
+            if decision is not None:
+                return decision
+            return self._ask_llm(market_data, key)
+        except Exception as e:
+            if self.debug:
+                print_trading_error(f"Decision error: {str(e)}")
+            return self._get_default_decision(str(e))
+
+    def generate_trading_decisions(self, snapshots: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Decide on several market snapshots (pairs or candles) with a single LLM call.
+
+        Snapshots the gate or cache settle skip the LLM; the rest are packed into one
+        batched prompt. Items missing from or unparseable in the batched answer are
+        retried with their own prompt.
+
+        Returns:
+            List of decisions, in snapshot order.
+        """
+        decisions: List[Optional[Dict[str, Any]]] = [None] * len(snapshots)
+        pending = []
+        for i, market_data in enumerate(snapshots):
+            try:
+                decisions[i], key = self._decide_without_llm(market_data)
+                if decisions[i] is None:
+                    pending.append((i, key))
+            except Exception as e:
+                decisions[i] = self._get_default_decision(str(e))
+
+        items: List[Optional[Dict[str, Any]]] = [None] * len(pending)
+        if len(pending) > 1:
+            try:
+                prompts = [self.build_prompt(snapshots[i]) for i, _ in pending]
+                started = time.perf_counter()
+                response = self._llm_call(build_batch_prompt(prompts, [snapshots[i].get('symbol') for i, _ in pending]))
+                if self.decision_gate is not None:
+                    self.decision_gate.record_llm_call(time.perf_counter() - started)
+                items = parse_batch_response(str(response), len(pending))
+            except Exception as e:
+                if self.debug:
+                    print_trading_error(f"Batched decision error: {str(e)}")
+
+        for (i, key), fields in zip(pending, items):
+            if fields is None:
+                # Single prompt for a lone item, or per-item fallback for what the batch didn't answer
+                decisions[i] = self._retry_single(snapshots[i], key)
+                continue
+            decisions[i] = self._decision_from_fields(fields, snapshots[i])
+            if key is not None:
+                self.decision_cache.put(key, decisions[i])
+        return decisions
+
+    def _retry_single(self, market_data: Dict[str, Any], key: Optional[str]) -> Dict[str, Any]:
+        """_ask_llm, returning the default decision on error"""
+        try:
+            return self._ask_llm(market_data, key)
+        except Exception as e:
+            if self.debug:
+                print_trading_error(f"Decision error: {str(e)}")
+            return self._get_default_decision(str(e))
+
+    def _decide_without_llm(self, market_data: Dict[str, Any]) -> tuple:
+        """Decision from the gate or the cache, else (None, cache key for the LLM decision)"""
+        if self.decision_gate is not None:
+            started = time.perf_counter()
+            decision = self.decision_gate.evaluate(market_data, self._current_position, self._entry_price)
+            self.decision_gate.record_gate_time(time.perf_counter() - started)
+            if decision is not None:
+                return decision, None
+
+        key = None
+        if self.decision_cache is not None:
+            key = self.decision_cache.key(self.profile, market_data, self._current_position, self._entry_price)
+            cached = self.decision_cache.get(key)
+            if cached is not None:
+                return self._reuse_decision(cached, market_data), None
+        return None, key
+
+    def _ask_llm(self, market_data: Dict[str, Any], key: Optional[str] = None) -> Dict[str, Any]:
+        """Single-prompt LLM decision, cached under key"""
+        started = time.perf_counter()
+        if self.decision_stream is not None:
+            decision = self._ask_llm_streaming(market_data)
+        else:
+            decision = self.parse_decision(str(self._llm_call(self.build_prompt(market_data))), market_data)
+        if self.decision_gate is not None:
+            self.decision_gate.record_llm_call(time.perf_counter() - started)
+        if key is not None and decision.get('source') == 'llm':
+            self.decision_cache.put(key, decision)
+        return decision
+
+    def _llm_call(self, prompt: str) -> str:
+        return (self.llm_router or self.llm).call(prompt)
+
+    def _ask_llm_streaming(self, market_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Decision parsed from the streamed completion as soon as Action/Amount/Confidence arrive"""
+        symbol = market_data.get('symbol')
+
+        def log_reasoning(reasoning: str):
+            if self.debug:
+                print_trading_reasoning(symbol, reasoning)
+
+        streamed = self.decision_stream.decide(self.build_prompt(market_data), on_reasoning=log_reasoning)
+        if streamed.fields is None:
+            return self._get_default_decision("Unparseable LLM response")
+        decision = self._decision_from_fields(streamed.fields, market_data)
+        decision['time_to_decision'] = streamed.time_to_decision
+        return decision
+
+    def _reuse_decision(self, decision: Dict[str, Any], market_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Adapt a cached decision to the current price and position"""
+        decision.update(symbol=market_data.get('symbol'), price=float(market_data['price']), source='cache')
+        if decision['action'] == 'SELL':
+            decision['amount'] = min(decision['amount'], self._current_position)
+            if decision['amount'] <= 0:
+                decision.update(action='HOLD', amount=0.0)
+        return decision
+
+    def build_prompt(self, market_data: Dict[str, Any]) -> str:
+        """Fill the profile's prompt_template with market data, position and trading parameters"""
+        profile = self.profile
+        threshold = profile['price_change_threshold']
+        sizing = profile['position_sizing']
+        volatility = float(market_data.get('high_low_range', 0.0))
+        required = min(max(threshold['base'] * (1 + threshold['volatility_multiplier'] * volatility),
+                           threshold['min_threshold']), threshold['max_threshold'])
+        take_profit = profile['trading_params'].get('take_profit', [])
+        position_note = ""
+        if self._current_position > 0 and self._entry_price > 0:
+            position_note = f" ({(float(market_data['price']) / self._entry_price - 1) * 100:+.2f}% vs entry)"
+        return profile['prompt_template'].format(
+            price=market_data['price'],
+            volume=market_data.get('volume', 0.0),
+            change_24h=market_data.get('change_24h', 0.0),
+            high_low_range=volatility,
+            current_position=self._current_position,
+            entry_price=self._entry_price,
+            position_note=position_note,
+            min_size=sizing['min_position_size'],
+            max_size=sizing['max_position_size'],
+            base_threshold=threshold['base'],
+            required_change=round(required, 4),
+            stop_loss=profile['stop_loss']['initial'],
+            trailing_stop=profile['stop_loss']['trailing'],
+            take_profit_str=", ".join(f"{tp['target']}% ({tp['size'] * 100:.0f}%)" for tp in take_profit),
+            min_confidence=profile['trading_params']['min_confidence']
+        )
+
+    def parse_decision(self, response: str, market_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Parse an 'Action/Amount/Confidence/Reasoning' LLM response into a decision"""
+        fields = parse_decision_fields(response)
+        if fields is None:
+            return self._get_default_decision("Unparseable LLM response")
+        return self._decision_from_fields(fields, market_data)
+
+    def _decision_from_fields(self, fields: Dict[str, Any], market_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Turn parsed decision fields into a decision. Amounts are clamped to the profile's
+        position size range (sells to the position held), and decisions below
+        min_confidence become HOLD.
+        """
+        action, amount, confidence = fields['action'], fields['amount'], fields['confidence']
+        sizing = self.profile['position_sizing']
+        min_confidence = self.profile['trading_params']['min_confidence']
+        if action == 'BUY':
+            amount = min(max(amount, sizing['min_position_size']), sizing['max_position_size'])
+        elif action == 'SELL':
+            amount = min(amount or self._current_position, self._current_position)
+        if action != 'HOLD' and (confidence < min_confidence or amount <= 0):
+            action, amount = 'HOLD', 0.0
+
+        return {
+            'symbol': market_data.get('symbol'),
+            'action': action,
+            'amount': amount,
+            'price': float(market_data['price']),
+            'confidence': confidence,
+            'min_confidence': min_confidence,
+            'reasoning': fields['reasoning'],
+            'source': 'llm'
+        }
 
     @abstractmethod
     def execute_trade(self, trade_params: Dict[str, Any]) -> Dict[str, Any]:
@@ -77,11 +365,18 @@ class TraderAgent(Agent):
 
     def update_position(self, trade_result: Dict[str, Any]) -> None:
         """Update current position after trade"""
-        if trade_result['status'] == 'FILLED':
+        if trade_result['status'] in (FILLED, PARTIALLY_FILLED):
+            symbol = trade_result.get('symbol')
             if trade_result['side'] == 'BUY':
                 self._current_position += trade_result['filled']
                 self._entry_price = trade_result['price']
+                if self.exit_engine is not None and symbol:
+                    self.exit_engine.add_position(symbol, symbol, trade_result['filled'], trade_result['price'])
             elif trade_result['side'] == 'SELL':
                 self._current_position = max(0.0, self._current_position - trade_result['filled'])
                 if self._current_position == 0.0:
                     self._entry_price = 0.0
+                if self.exit_engine is not None and symbol:
+                    self.exit_engine.cap_position(symbol, self._current_position)
+            if self.fill_pipeline is not None and self.portfolio_account and symbol:
+                self.fill_pipeline.submit(self.portfolio_exchange, self.portfolio_account, trade_result)
@@ -1,10 +1,27 @@
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Union
 from .trader import TraderAgent
+from pydantic import Field
+from src.backtest.engine import HistoricalSeries
+from src.config.profiles import load_profile, PROFILE_NAMES
+from src.trading.matching import MatchingEngine
+from src.trading.multi_strategy import MultiStrategyRunner
+from src.utils.display import print_leaderboard
 #from src.utils.display import print_mock_trading
 
 class VirtualTraderAgent(TraderAgent):
     """Simulates trades in sandbox environment"""
     
+    matching_engine: Optional[MatchingEngine] = Field(default=None)
+    account_id: str = Field(default='virtual-1')
+    
+    def __init__(self, config):
+        super().__init__(config)
+        # Limit and stop orders rest in the matching engine, which may be shared by several virtual accounts
+        self.matching_engine = getattr(config, 'matching_engine', None) or MatchingEngine(self.fill_model)
+        self.account_id = getattr(config, 'virtual_account', 'virtual-1')
+        self.matching_engine.subscribe(self.account_id, self.update_position)
+        self.portfolio_account = self.portfolio_account or self.account_id
+    
     def execute_trade(self, trade_params: Dict[str, Any]) -> Dict[str, Any]:
         """Execute simulated trade"""
         try:
@@ -13,8 +30,13 @@ class VirtualTraderAgent(TraderAgent):
                 
             order = self.format_order(trade_params)
             
+            if order['type'] != 'MARKET':
+                # Fills are applied to the position through the engine subscription
+                return self.matching_engine.submit(order, self.account_id)
+            
             # Simulate trade execution
-            execution_result = self.simulate_execution(order)
+            execution_result = self.simulate_execution(order, trade_params.get('volume_24h', 0.0))
+            self.update_position(execution_result)
             
             if self.debug:
                 print_mock_trading()
@@ -24,17 +46,42 @@ class VirtualTraderAgent(TraderAgent):
         except Exception as e:
             return self._get_default_decision(str(e))
             
-    def simulate_execution(self, order: Dict[str, Any]) -> Dict[str, Any]:
-        """Simulate trade execution with artificial delay"""
-        import time
-        time.sleep(self._trade_delay)  # Simulate network delay
+    def simulate_execution(self, order: Dict[str, Any], volume: float = 0.0) -> Dict[str, Any]:
+        """Simulate trade execution with artificial delay, filled through the fill model"""
+        self.clock.sleep(self._trade_delay)  # Simulate network delay
         
-        return {
-            'id': f"test-{order['symbol']}-{time.time()}",
-            'status': 'FILLED',
-            'filled': order['amount'],
-            'price': order['params']['price'],  # Use price from order params
-            'cost': order['amount'] * order['params']['price'],
-            'fees': order['amount'] * order['params']['price'] * 0.001,
-            'side': order['side']  # Add side for position tracking
-        } 
\ No newline at end of file
+        result = self.fill_model.fill_order(order, volume=volume)
+        result['id'] = f"test-{order['symbol']}-{self.clock.time()}"
+        return result
+
+    def on_price_tick(self, symbol: str, price: float, volume: float = 0.0) -> List[Dict[str, Any]]:
+        """Feed a price to the matching engine, filling every resting order it crosses"""
+        return self.matching_engine.on_tick(symbol, price, volume)
+
+    def cancel_order(self, order_id: str) -> Optional[Dict[str, Any]]:
+        """Cancel a resting limit or stop order"""
+        return self.matching_engine.cancel(order_id)
+
+    def paper_trade_strategies(self, source: Union[str, HistoricalSeries], symbol: str,
+                               profile_names: tuple = PROFILE_NAMES, lookbacks: tuple = (),
+                               portfolio_manager=None) -> List[Dict[str, Any]]:
+        """
+        Paper-trade every profile (and lookback) over one market feed, each in its
+        own virtual account, and print the leaderboard.
+
+        Args:
+            source: Path to a .npy candle file or a series.
+            symbol: Traded pair, e.g. 'BTC/USD'.
+            profile_names: Profiles to run.
+            lookbacks: Optional feature lookbacks; one strategy per profile and lookback.
+            portfolio_manager: Books fills into virtual-<strategy> accounts when given.
+        """
+        runner = MultiStrategyRunner.from_profiles(
+            {name: load_profile(name) for name in profile_names},
+            lookbacks,
+            portfolio_manager=portfolio_manager,
+            fee_rate=self.fill_model.fee_rate
+        )
+        leaderboard = runner.run(source, symbol)
+        print_leaderboard(leaderboard)
+        return leaderboard
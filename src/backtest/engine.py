@@ -0,0 +1,223 @@
+from dataclasses import dataclass
+from enum import Enum
+from typing import Dict, Any, List, Optional, Union
+import numpy as np
+from src.trading.fills import FillModel, fill_status
+
+class PriceMode(Enum):
+    NEAREST = "nearest"
+    PREVIOUS = "previous"
+    NEXT = "next"
+
+@dataclass
+class HistoricalSeries:
+    """Historical price series stored as sorted NumPy arrays"""
+    timestamps: np.ndarray  # int64 milliseconds, ascending
+    prices: np.ndarray      # float64
+    volumes: np.ndarray     # float64, zeros when unknown
+
+    def __post_init__(self):
+        self.timestamps = np.asarray(self.timestamps, dtype=np.int64)
+        self.prices = np.asarray(self.prices, dtype=np.float64)
+        self.volumes = np.asarray(self.volumes, dtype=np.float64)
+        if len(self.timestamps) and np.any(np.diff(self.timestamps) < 0):
+            order = np.argsort(self.timestamps, kind='stable')
+            self.timestamps = self.timestamps[order]
+            self.prices = self.prices[order]
+            self.volumes = self.volumes[order]
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def slice(self, start: int = 0, end: Optional[int] = None) -> 'HistoricalSeries':
+        """Return a view of bars [start:end] without copying the arrays"""
+        return HistoricalSeries(self.timestamps[start:end], self.prices[start:end], self.volumes[start:end])
+
+    @classmethod
+    def from_records(cls, records: List[Dict[str, Any]]) -> 'HistoricalSeries':
+        """Build from a list of dicts with 'timestamp' and 'price' (or 'total_value') and optional 'volume'"""
+        timestamps = np.fromiter((r['timestamp'] for r in records), dtype=np.int64, count=len(records))
+        prices = np.fromiter((r.get('price', r.get('total_value')) for r in records), dtype=np.float64, count=len(records))
+        volumes = np.fromiter((r.get('volume', 0.0) for r in records), dtype=np.float64, count=len(records))
+        return cls(timestamps, prices, volumes)
+
+    @classmethod
+    def from_coingecko(cls, data: Dict[str, Any]) -> 'HistoricalSeries':
+        """Build from the output of coingecko_get_historical_data"""
+        series = cls.from_records(data.get('prices', []))
+        volumes = data.get('total_volumes', [])
+        if len(volumes) == len(series):
+            series.volumes = np.fromiter((v['total_value'] for v in volumes), dtype=np.float64, count=len(volumes))
+        return series
+
+    def index_at(self, timestamps: Union[np.ndarray, List[int]],
+                 mode: PriceMode = PriceMode.NEAREST) -> np.ndarray:
+        """
+        Resolve bar indices for timestamps (vectorized binary search).
+
+        PREVIOUS and NEXT never look across the ends of the series: the index
+        is -1 where there is no bar at or before (PREVIOUS) or at or after
+        (NEXT) the timestamp, rather than a later or staler bar.
+        """
+        if not len(self):
+            raise ValueError("No historical data available")
+        ts = np.asarray(timestamps, dtype=np.int64)
+        last = len(self) - 1
+        if mode is PriceMode.PREVIOUS:
+            idx = np.searchsorted(self.timestamps, ts, side='right') - 1
+        elif mode is PriceMode.NEXT:
+            idx = np.searchsorted(self.timestamps, ts, side='left')
+        else:
+            right = np.clip(np.searchsorted(self.timestamps, ts, side='left'), 0, last)
+            left = np.clip(right - 1, 0, last)
+            return np.where(np.abs(ts - self.timestamps[left]) <= np.abs(self.timestamps[right] - ts), left, right)
+        return np.where(idx <= last, idx, -1)
+
+    def price_at(self, timestamps: Union[np.ndarray, List[int]],
+                 mode: PriceMode = PriceMode.NEAREST) -> np.ndarray:
+        """Resolve prices for timestamps (NaN where index_at finds no bar)"""
+        idx = self.index_at(timestamps, mode)
+        return np.where(idx >= 0, self.prices[idx], np.nan)
+
+class BacktestEngine:
+    """Vectorized backtest over a historical series and a batch of orders"""
+
+    def __init__(self, series: HistoricalSeries, initial_balance: float = 10000.0,
+                 fee_rate: float = 0.001, price_mode: PriceMode = PriceMode.NEAREST,
+                 fill_model: Optional[FillModel] = None):
+        self.series = series
+        self.initial_balance = initial_balance
+        self.fee_rate = fee_rate
+        self.price_mode = price_mode
+        self.fill_model = fill_model or FillModel(fee_rate)
+
+    def _cap_to_account(self, signed: np.ndarray, fill_prices: np.ndarray) -> np.ndarray:
+        """
+        Reduce orders that can't be filled in full: sells to the position held,
+        buys to the cash available. Each cap depends on every earlier fill, so
+        this is one pass over the orders (not the bars).
+        """
+        rate = self.fill_model.fee_rate
+        position, cash = 0.0, self.initial_balance
+        capped = []
+        for qty, price in zip(signed.tolist(), fill_prices.tolist()):
+            if qty > 0:
+                qty = max(0.0, min(qty, cash / (price * (1 + rate))))
+            else:
+                qty = -min(-qty, position)
+            position += qty
+            cash -= qty * price + abs(qty) * price * rate
+            capped.append(qty)
+        return np.asarray(capped, dtype=np.float64)
+
+    def run(self, orders: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Run a batch of orders (as produced by TraderAgent.format_order).
+
+        Returns:
+            Dict: Backtest results, see run_arrays.
+        """
+        count = len(orders)
+        timestamps = np.fromiter((o['params']['timestamp'] for o in orders), dtype=np.int64, count=count)
+        sides = np.fromiter((1 if o['side'] == 'BUY' else -1 for o in orders), dtype=np.int8, count=count)
+        amounts = np.fromiter((o['amount'] for o in orders), dtype=np.float64, count=count)
+        symbol = orders[0]['symbol'] if orders else ''
+        return self.run_arrays(timestamps, sides, amounts, symbol)
+
+    def run_arrays(self, timestamps: np.ndarray, sides: np.ndarray, amounts: np.ndarray,
+                   symbol: str = '') -> Dict[str, Any]:
+        """
+        Run a batch of orders given as arrays.
+
+        Args:
+            timestamps: Order timestamps in milliseconds.
+            sides: +1 for BUY, -1 for SELL.
+            amounts: Order amounts in base asset.
+            symbol: Symbol used for trade ids.
+
+        Fills go through the engine's fill model; when it allows partial fills,
+        sells are capped at the position held and buys at the cash available.
+        Orders without a bar to fill at (before the series with PREVIOUS, after
+        it with NEXT or latency) are skipped.
+
+        Returns:
+            Dict: initial/final balance, total fees, max drawdown (%), equity and
+            drawdown arrays per bar, the trade log and the number of skipped orders.
+        """
+        order = np.argsort(timestamps, kind='stable')
+        timestamps = np.asarray(timestamps, dtype=np.int64)[order]
+        requested = np.asarray(amounts, dtype=np.float64)[order]
+        sides = np.asarray(sides)[order]
+
+        if self.fill_model.latency_ms:
+            # Delayed fills land on the first bar at or after the delayed timestamp
+            idx = self.series.index_at(timestamps + self.fill_model.latency_ms, PriceMode.NEXT)
+        else:
+            idx = self.series.index_at(timestamps, self.price_mode)
+        priced = idx >= 0
+        skipped = int(len(idx) - np.count_nonzero(priced))
+        timestamps, requested, sides, idx = timestamps[priced], requested[priced], sides[priced], idx[priced]
+        signed = np.where(sides > 0, 1.0, -1.0) * requested
+        is_buy = signed > 0
+
+        fill_prices, filled, fees = self.fill_model.fill(signed, np.abs(signed), self.series.prices[idx],
+                                                         self.series.volumes[idx])
+        signed = np.sign(signed) * filled
+        if self.fill_model.partial_fills:
+            signed = self._cap_to_account(signed, fill_prices)
+            fees = np.abs(signed) * fill_prices * self.fill_model.fee_rate
+        cash_delta = -signed * fill_prices - fees
+
+        positions = np.cumsum(signed)
+        if np.any(positions < -1e-12):
+            bad = int(np.argmax(positions < -1e-12))
+            raise ValueError(f"Insufficient position for sell at {int(timestamps[bad])}")
+        balances = self.initial_balance + np.cumsum(cash_delta)
+        tolerance = 1e-9 * max(self.initial_balance, 1.0)
+        if np.any(balances < -tolerance):
+            bad = int(np.argmax(balances < -tolerance))
+            raise ValueError(f"Insufficient balance for buy at {int(timestamps[bad])}")
+
+        # Spread order effects over the bar grid, then integrate
+        n = len(self.series)
+        position_steps = np.zeros(n)
+        cash_steps = np.zeros(n)
+        np.add.at(position_steps, idx, signed)
+        np.add.at(cash_steps, idx, cash_delta)
+        equity = self.initial_balance + np.cumsum(cash_steps) + np.cumsum(position_steps) * self.series.prices
+        peak = np.maximum.accumulate(equity)
+        drawdown = np.where(peak > 0, (equity - peak) / peak, 0.0)
+
+        # Orders the fill model (or the account caps) left unfilled are not trades
+        trade_log = [
+            {
+                'id': f"backtest-{symbol}-{ts}",
+                'status': fill_status(amount, abs(qty)),
+                'symbol': symbol,
+                'side': 'BUY' if buy else 'SELL',
+                'filled': abs(qty),
+                'price': price,
+                'cost': abs(qty) * price,
+                'fees': fee,
+                'timestamp': ts,
+                'position': pos
+            }
+            for ts, buy, amount, qty, price, fee, pos in zip(timestamps.tolist(), is_buy.tolist(), requested.tolist(),
+                                                             signed.tolist(), fill_prices.tolist(), fees.tolist(),
+                                                             positions.tolist())
+            if qty != 0
+        ]
+
+        return {
+            'initial_balance': self.initial_balance,
+            'final_balance': float(equity[-1]) if n else self.initial_balance,
+            'final_cash': float(balances[-1]) if len(balances) else self.initial_balance,
+            'final_position': float(positions[-1]) if len(positions) else 0.0,
+            'total_fees': float(fees.sum()),
+            'max_drawdown': float(drawdown.min() * 100) if n else 0.0,
+            'trades': len(trade_log),
+            'skipped': skipped,
+            'equity': equity,
+            'drawdown': drawdown,
+            'trade_log': trade_log
+        }
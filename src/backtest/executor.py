@@ -0,0 +1,121 @@
+import multiprocessing as mp
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+from threading import Lock
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from .engine import BacktestEngine, HistoricalSeries, PriceMode
+from src.trading.fills import FillModel
+
+# Set in each worker process by _init_worker
+_cancel_event = None
+
+def _init_worker(cancel_event, initializer: Optional[Callable], initargs: Tuple) -> None:
+    global _cancel_event
+    _cancel_event = cancel_event
+    if initializer is not None:
+        initializer(*initargs)
+
+def backtest_cancelled() -> bool:
+    """Cooperative cancellation check for long-running jobs inside worker processes"""
+    return _cancel_event is not None and _cancel_event.is_set()
+
+def _run_job(fn: Callable, args: Tuple, kwargs: Dict[str, Any]) -> Any:
+    if backtest_cancelled():
+        raise InterruptedError("Backtest stopped by user")
+    return fn(*args, **kwargs)
+
+def run_backtest_job(series: HistoricalSeries, orders: List[Dict[str, Any]], initial_balance: float = 10000.0,
+                     fee_rate: float = 0.001, price_mode: PriceMode = PriceMode.NEAREST,
+                     fill_model: Optional[FillModel] = None) -> Dict[str, Any]:
+    """Backtest job executed in a worker process"""
+    engine = BacktestEngine(series, initial_balance=initial_balance, fee_rate=fee_rate, price_mode=price_mode,
+                            fill_model=fill_model)
+    return engine.run(orders)
+
+class BacktestExecutor:
+    """
+    Long-lived process pool for CPU-bound backtest runs.
+
+    The pool is created on first submission and reused until shutdown().
+    Jobs are cancelled cooperatively: cancel() drops pending jobs and raises a
+    shared event that running jobs can poll through backtest_cancelled().
+    """
+
+    def __init__(self, max_workers: Optional[int] = None,
+                 progress_callback: Optional[Callable[[int, int], None]] = None,
+                 initializer: Optional[Callable] = None, initargs: Tuple = ()):
+        self.max_workers = max_workers
+        self.progress_callback = progress_callback
+        self._initializer = initializer
+        self._initargs = initargs
+        self._context = mp.get_context()
+        self._cancel_event = self._context.Event()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._futures: List[Future] = []
+        self._lock = Lock()
+        self.completed = 0
+        self.total = 0
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=self._context,
+                initializer=_init_worker,
+                initargs=(self._cancel_event, self._initializer, self._initargs)
+            )
+        return self._pool
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        """Submit a job and return its future"""
+        future = self._get_pool().submit(_run_job, fn, args, kwargs)
+        with self._lock:
+            self._futures = [f for f in self._futures if not f.done()]
+            self._futures.append(future)
+            self.total += 1
+        future.add_done_callback(self._on_done)
+        return future
+
+    def submit_batch(self, jobs: Iterable[Tuple[Callable, Tuple]]) -> List[Future]:
+        """Submit (fn, args) jobs and return their futures in submission order"""
+        return [self.submit(fn, *args) for fn, args in jobs]
+
+    def _on_done(self, future: Future) -> None:
+        with self._lock:
+            self.completed += 1
+            completed, total = self.completed, self.total
+        if self.progress_callback is not None:
+            self.progress_callback(completed, total)
+
+    def pending(self) -> int:
+        """Number of submitted jobs that have not finished yet"""
+        with self._lock:
+            return sum(1 for f in self._futures if not f.done())
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait for submitted jobs, returning True if all of them finished within timeout"""
+        with self._lock:
+            futures = [f for f in self._futures if not f.done()]
+        _, not_done = wait(futures, timeout=timeout)
+        return not not_done
+
+    def cancel(self) -> None:
+        """Cancel pending jobs and signal running jobs to stop"""
+        self._cancel_event.set()
+        with self._lock:
+            futures = list(self._futures)
+        for future in futures:
+            future.cancel()
+
+    def reset(self) -> None:
+        """Clear the cancellation signal and progress counters before a new run"""
+        self._cancel_event.clear()
+        with self._lock:
+            self.completed = 0
+            self.total = 0
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Cancel outstanding work and stop the worker processes"""
+        if self._pool is not None:
+            self.cancel()
+            self._pool.shutdown(wait=wait, cancel_futures=True)
+            self._pool = None
@@ -0,0 +1,88 @@
+from multiprocessing import shared_memory
+from typing import Dict, Any, Optional, Tuple
+import numpy as np
+from .engine import HistoricalSeries
+
+_FIELDS = ('timestamps', 'prices', 'volumes')
+
+def share_arrays(arrays: Dict[str, np.ndarray]) -> Tuple[Dict[str, Any], list]:
+    """
+    Copy arrays into shared memory blocks once.
+
+    Returns:
+        Tuple of (descriptor, blocks): the picklable descriptor lets worker
+        processes attach read-only views; blocks must be kept alive and
+        released with release_blocks by the owner.
+    """
+    descriptor, blocks = {}, []
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+        descriptor[name] = (block.name, array.shape, array.dtype.str)
+        blocks.append(block)
+    return descriptor, blocks
+
+def attach_arrays(descriptor: Dict[str, Any]) -> Tuple[Dict[str, np.ndarray], list]:
+    """Attach read-only views on arrays shared with share_arrays"""
+    arrays, blocks = {}, []
+    for name, (block_name, shape, dtype) in descriptor.items():
+        try:
+            # track=False: workers must not unlink blocks owned by the parent process
+            block = shared_memory.SharedMemory(name=block_name, track=False)
+        except TypeError:  # Python < 3.13
+            block = shared_memory.SharedMemory(name=block_name)
+        array = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+        array.flags.writeable = False
+        arrays[name] = array
+        blocks.append(block)
+    return arrays, blocks
+
+def release_blocks(blocks: list, unlink: bool = True) -> None:
+    """Close (and by default unlink) shared memory blocks"""
+    for block in blocks:
+        block.close()
+        if unlink:
+            block.unlink()
+
+class SharedSeries:
+    """HistoricalSeries (plus optional feature arrays) published once to shared memory"""
+
+    def __init__(self, series: HistoricalSeries, features: Optional[Dict[str, np.ndarray]] = None):
+        arrays = {field: getattr(series, field) for field in _FIELDS}
+        for name, array in (features or {}).items():
+            arrays[f"feature:{name}"] = array
+        self.descriptor, self._blocks = share_arrays(arrays)
+
+    def close(self) -> None:
+        """Release the shared memory blocks"""
+        release_blocks(self._blocks)
+        self._blocks = []
+
+    def __enter__(self) -> 'SharedSeries':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+# Set in each worker process by attach_shared_series
+_worker_series: Optional[HistoricalSeries] = None
+_worker_features: Dict[str, np.ndarray] = {}
+_worker_blocks: list = []
+
+def attach_shared_series(descriptor: Dict[str, Any]) -> None:
+    """Worker initializer: attach the shared series and features without copying them"""
+    global _worker_series, _worker_features, _worker_blocks
+    arrays, _worker_blocks = attach_arrays(descriptor)
+    _worker_series = HistoricalSeries(*(arrays[field] for field in _FIELDS))
+    _worker_features = {name.split(':', 1)[1]: array for name, array in arrays.items() if name.startswith('feature:')}
+
+def worker_series() -> HistoricalSeries:
+    """Series attached in the current worker process"""
+    if _worker_series is None:
+        raise RuntimeError("No shared series attached in this process")
+    return _worker_series
+
+def worker_features() -> Dict[str, np.ndarray]:
+    """Shared feature arrays attached in the current worker process"""
+    return _worker_features
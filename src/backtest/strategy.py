@@ -0,0 +1,112 @@
+from typing import Dict, Any, Optional, Tuple
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from .engine import HistoricalSeries
+from src.trading.exits import ExitRules, exit_schedule
+
+DEFAULT_LOOKBACK = 60  # Bars used for change and volatility features
+
+def compute_features(prices: np.ndarray, lookback: int = DEFAULT_LOOKBACK) -> Dict[str, np.ndarray]:
+    """
+    Compute profile-independent features for a price series.
+
+    Returns:
+        Dict with 'change' (% change over lookback bars) and 'volatility'
+        (high-low range over lookback bars, in % of the current price).
+        The first lookback bars are zero.
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    n = len(prices)
+    change = np.zeros(n)
+    volatility = np.zeros(n)
+    if n > lookback:
+        change[lookback:] = (prices[lookback:] / prices[:-lookback] - 1) * 100
+        windows = sliding_window_view(prices, lookback + 1)
+        volatility[lookback:] = (windows.max(axis=1) - windows.min(axis=1)) / prices[lookback:] * 100
+    return {'change': change, 'volatility': volatility}
+
+class FeatureCache:
+    """Feature arrays computed once per series and lookback, then reused by every window and parameter set"""
+
+    def __init__(self, prices: np.ndarray):
+        self.prices = prices
+        self._features: Dict[int, Dict[str, np.ndarray]] = {}
+
+    def get(self, lookback: int = DEFAULT_LOOKBACK) -> Dict[str, np.ndarray]:
+        """Features for lookback, computed on first request"""
+        if lookback not in self._features:
+            self._features[lookback] = compute_features(self.prices, lookback)
+        return self._features[lookback]
+
+def required_change(profile: Dict[str, Any], volatility: np.ndarray) -> np.ndarray:
+    """Volatility-adjusted required price change (%) from the profile's price_change_threshold"""
+    threshold = profile['price_change_threshold']
+    required = threshold['base'] * (1 + threshold['volatility_multiplier'] * volatility)
+    return np.clip(required, threshold['min_threshold'], threshold['max_threshold'])
+
+def signal_confidence(change: np.ndarray, required: np.ndarray) -> np.ndarray:
+    """Rule-based confidence (0-100): 50 when change equals the required change, 100 at twice it"""
+    return np.clip(50 * np.abs(change) / required, 0, 100)
+
+def position_fraction(profile: Dict[str, Any]) -> float:
+    """Fraction of available balance allocated per trade (risk per trade over stop distance)"""
+    sizing = profile['position_sizing']
+    fraction = sizing['risk_per_trade'] / (profile['stop_loss']['initial'] / 100)
+    return float(np.clip(fraction, sizing['min_position_size'], sizing['max_position_size']))
+
+def profile_orders(series: HistoricalSeries, profile: Dict[str, Any],
+                   features: Optional[Dict[str, np.ndarray]] = None,
+                   initial_balance: float = 10000.0, fee_rate: float = 0.001,
+                   start: int = 0, end: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Generate long-only orders for a profile without LLM calls.
+
+    Entries are taken when the change exceeds the volatility-adjusted required
+    change with at least min_confidence; each take-profit tier closes its share
+    of the position, and the remainder is closed on the stop loss, the
+    trailing stop or a reverse signal. Only series[start:end] is traded; features are
+    computed over the whole series unless provided (e.g. from a FeatureCache).
+
+    Returns:
+        Tuple of (timestamps, sides, amounts) arrays for BacktestEngine.run_arrays.
+    """
+    if features is None:
+        features = compute_features(series.prices)
+    end = len(series) if end is None else end
+    prices = series.prices[start:end]
+    change = features['change'][start:end]
+    required = required_change(profile, features['volatility'][start:end])
+    confidence = signal_confidence(change, required)
+    min_confidence = profile['trading_params'].get('min_confidence', 0)
+
+    entries = np.flatnonzero((change > required) & (confidence >= min_confidence))
+    exit_signal = change < -required
+    fraction = position_fraction(profile)
+    rules = ExitRules.from_profile(profile)
+
+    bars, sides, amounts = [], [], []
+    cash = initial_balance
+    bar = 0
+    while True:
+        k = int(np.searchsorted(entries, bar))
+        if k >= len(entries):
+            break
+        entry = int(entries[k])
+        entry_price = float(prices[entry])
+        amount = cash * fraction / (entry_price * (1 + fee_rate))
+        if amount <= 0:
+            break
+        cash -= amount * entry_price * (1 + fee_rate)
+        bars.append(entry); sides.append(1); amounts.append(amount)
+
+        schedule = exit_schedule(prices, entry, entry_price, rules, exit_signal)
+        for exit_bar, share, _ in schedule:
+            sold = amount * share
+            cash += sold * float(prices[exit_bar]) * (1 - fee_rate)
+            bars.append(exit_bar); sides.append(-1); amounts.append(sold)
+        if sum(share for _, share, _ in schedule) < 1 - 1e-9:
+            break  # Still open at the end of the series
+        bar = schedule[-1][0] + 1
+
+    timestamps = series.timestamps[start:end][np.asarray(bars, dtype=np.int64)]
+    return timestamps, np.asarray(sides, dtype=np.int8), np.asarray(amounts, dtype=np.float64)
@@ -0,0 +1,215 @@
+import time
+from collections import deque
+from itertools import islice
+from typing import Dict, Any, Callable, Iterable, Iterator, List, Optional, Tuple, Union
+import numpy as np
+from .engine import HistoricalSeries
+from .strategy import DEFAULT_LOOKBACK, position_fraction
+from src.trading.exits import ExitRules
+
+CANDLE_DTYPE = np.dtype([('timestamp', '<i8'), ('price', '<f8'), ('volume', '<f8')])
+DEFAULT_CHUNK_SIZE = 65536
+TRADE_LOG_SIZE = 100  # Most recent trades kept in streaming results
+
+Candle = Tuple[int, float, float]  # (timestamp, price, volume)
+Order = Dict[str, Any]             # {'side': 'BUY'|'SELL', 'amount': float}
+
+def write_candles(path: str, series: HistoricalSeries) -> None:
+    """Write a series to a memory-mappable .npy candle file"""
+    candles = np.lib.format.open_memmap(path, mode='w+', dtype=CANDLE_DTYPE, shape=(len(series),))
+    candles['timestamp'] = series.timestamps
+    candles['price'] = series.prices
+    candles['volume'] = series.volumes
+    candles.flush()
+    del candles
+
+def iter_file_chunks(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[np.ndarray]:
+    """Stream a .npy candle file chunk by chunk through a read-only memory map"""
+    candles = np.load(path, mmap_mode='r')
+    for start in range(0, len(candles), chunk_size):
+        yield candles[start:start + chunk_size]
+
+def iter_series_chunks(series: HistoricalSeries, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[np.ndarray]:
+    """Stream an in-memory series chunk by chunk"""
+    for start in range(0, len(series), chunk_size):
+        chunk = np.empty(min(chunk_size, len(series) - start), dtype=CANDLE_DTYPE)
+        chunk['timestamp'] = series.timestamps[start:start + chunk_size]
+        chunk['price'] = series.prices[start:start + chunk_size]
+        chunk['volume'] = series.volumes[start:start + chunk_size]
+        yield chunk
+
+def candle_events(chunks: Iterable[np.ndarray]) -> Iterator[Candle]:
+    """Flatten candle chunks into (timestamp, price, volume) events"""
+    for chunk in chunks:
+        yield from zip(chunk['timestamp'].tolist(), chunk['price'].tolist(), chunk['volume'].tolist())
+
+def window_features(window: deque, lookback: int) -> Tuple[float, float]:
+    """Change and volatility (%) over the last lookback + 1 prices of window, which ends with the current price"""
+    price = window[-1]
+    if len(window) > lookback + 1:
+        window = list(islice(window, len(window) - lookback - 1, None))
+    return (price / window[0] - 1) * 100, (max(window) - min(window)) / price * 100
+
+def apply_fill(order: Order, price: float, state: Dict[str, Any], fee_rate: float) -> Optional[Dict[str, Any]]:
+    """Fill an order at price against an account state, capped by available cash or position"""
+    if order['side'] == 'BUY':
+        amount = min(order['amount'], state['cash'] / (price * (1 + fee_rate)))
+        if amount <= 0:
+            return None
+        fees = amount * price * fee_rate
+        held = state['position']
+        state['entry_price'] = (state['entry_price'] * held + price * amount) / (held + amount)
+        state['position'] = held + amount
+        state['cash'] -= amount * price + fees
+    else:
+        amount = min(order['amount'], state['position'])
+        if amount <= 0:
+            return None
+        fees = amount * price * fee_rate
+        state['position'] -= amount
+        state['cash'] += amount * price - fees
+        if state['position'] <= 1e-12:
+            state['position'] = 0.0
+            state['entry_price'] = 0.0
+    return {'status': 'FILLED', 'side': order['side'], 'filled': amount, 'price': price,
+            'cost': amount * price, 'fees': fees}
+
+class ProfileStreamingStrategy:
+    """
+    Streaming counterpart of backtest.strategy.profile_orders: the same
+    entry/exit rules evaluated candle by candle over a rolling window.
+    """
+
+    def __init__(self, profile: Dict[str, Any], lookback: int = DEFAULT_LOOKBACK):
+        self.profile = profile
+        self.lookback = lookback
+        self.window = lookback + 1
+        self.fraction = position_fraction(profile)
+        self.min_confidence = profile['trading_params'].get('min_confidence', 0)
+        rules = ExitRules.from_profile(profile)
+        self.stop = rules.stop_loss / 100
+        self.trailing = rules.trailing / 100
+        self.activation = rules.activation_threshold / 100
+        self.tiers = [(target / 100, min(max(size, 0.0), 1.0)) for target, size in rules.take_profit]
+        threshold = profile['price_change_threshold']
+        self.base = threshold['base']
+        self.multiplier = threshold['volatility_multiplier']
+        self.min_threshold = threshold['min_threshold']
+        self.max_threshold = threshold['max_threshold']
+
+    def __call__(self, candle: Candle, window: deque, state: Dict[str, Any]) -> List[Order]:
+        if len(window) < self.window:
+            return []
+        change, volatility = window_features(window, self.lookback)
+        return self.decide(candle[1], change, volatility, state)
+
+    def decide(self, price: float, change: float, volatility: float, state: Dict[str, Any]) -> List[Order]:
+        """Orders for the current candle given its change and volatility features (%)"""
+        # Scalar versions of strategy.required_change / signal_confidence (NumPy scalars are slow per event)
+        required = min(max(self.base * (1 + self.multiplier * volatility), self.min_threshold), self.max_threshold)
+
+        if state['position'] > 0:
+            return self._exits(price, change, required, state)
+        if change > required and min(50 * change / required, 100) >= self.min_confidence:
+            amount = state['cash'] * self.fraction / (price * (1 + state['fee_rate']))
+            state['max_price'] = price
+            state['tier'] = 0
+            return [{'side': 'BUY', 'amount': amount}]
+        return []
+
+    def _exits(self, price: float, change: float, required: float, state: Dict[str, Any]) -> List[Order]:
+        """Scalar version of trading.exits.exit_schedule: full close first, then take-profit tiers"""
+        entry = state['entry_price']
+        max_price = state['max_price'] = max(state['max_price'], price)
+        if (price <= entry * (1 - self.stop) or change < -required
+                or (max_price >= entry * (1 + self.activation) and price <= max_price * (1 - self.trailing))):
+            return [{'side': 'SELL', 'amount': state['position']}]
+        orders = []
+        remaining = state['position']
+        while state['tier'] < len(self.tiers) and price >= entry * (1 + self.tiers[state['tier']][0]):
+            amount = remaining * self.tiers[state['tier']][1]
+            remaining -= amount
+            orders.append({'side': 'SELL', 'amount': amount})
+            state['tier'] += 1
+        return orders
+
+class StreamingBacktest:
+    """
+    Event-driven backtest with bounded memory.
+
+    Candles are pulled from a chunked source and pushed one by one to a
+    strategy callback together with the rolling price window (ending with the
+    current candle) and the account state. Only the window, the open
+    position and a short trade log stay resident, so memory does not grow
+    with the length of the backtest.
+    """
+
+    def __init__(self, strategy: Callable[[Candle, deque, Dict[str, Any]], List[Order]],
+                 window: int = DEFAULT_LOOKBACK + 1, initial_balance: float = 10000.0,
+                 fee_rate: float = 0.001, should_stop: Optional[Callable[[], bool]] = None):
+        self.strategy = strategy
+        self.window = getattr(strategy, 'window', window)
+        self.initial_balance = initial_balance
+        self.fee_rate = fee_rate
+        self.should_stop = should_stop
+
+    def run(self, source: Union[str, HistoricalSeries, Iterable[np.ndarray]],
+            chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict[str, Any]:
+        """
+        Run the backtest over a .npy candle file path, a HistoricalSeries or an iterable of candle chunks.
+
+        Returns:
+            Dict: Same summary keys as BacktestEngine (without per-bar arrays),
+            plus events processed and events_per_second.
+        """
+        if isinstance(source, str):
+            chunks = iter_file_chunks(source, chunk_size)
+        elif isinstance(source, HistoricalSeries):
+            chunks = iter_series_chunks(source, chunk_size)
+        else:
+            chunks = source
+
+        state = {'cash': self.initial_balance, 'position': 0.0, 'entry_price': 0.0,
+                 'max_price': 0.0, 'tier': 0, 'fee_rate': self.fee_rate}
+        window: deque = deque(maxlen=self.window)
+        trade_log: deque = deque(maxlen=TRADE_LOG_SIZE)
+        peak = equity = self.initial_balance
+        max_drawdown = total_fees = 0.0
+        trades = events = 0
+        started = time.perf_counter()
+
+        for candle in candle_events(chunks):
+            timestamp, price, _ = candle
+            window.append(price)
+            for order in self.strategy(candle, window, state) or ():
+                fill = self._fill(order, price, state)
+                if fill:
+                    fill['timestamp'] = timestamp
+                    total_fees += fill['fees']
+                    trades += 1
+                    trade_log.append(fill)
+            equity = state['cash'] + state['position'] * price
+            peak = max(peak, equity)
+            max_drawdown = min(max_drawdown, (equity - peak) / peak if peak > 0 else 0.0)
+            events += 1
+            if self.should_stop is not None and events % 4096 == 0 and self.should_stop():
+                raise InterruptedError("Backtest stopped by user")
+
+        elapsed = time.perf_counter() - started
+        return {
+            'initial_balance': self.initial_balance,
+            'final_balance': equity,
+            'final_cash': state['cash'],
+            'final_position': state['position'],
+            'total_fees': total_fees,
+            'max_drawdown': max_drawdown * 100,
+            'trades': trades,
+            'trade_log': list(trade_log),
+            'events': events,
+            'elapsed': elapsed,
+            'events_per_second': events / elapsed if elapsed > 0 else 0.0
+        }
+
+    def _fill(self, order: Order, price: float, state: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Fill an order at the candle price, capped by available cash or position"""
+        return apply_fill(order, price, state, self.fee_rate)
@@ -0,0 +1,130 @@
+import bisect
+import itertools
+import json
+import random
+from concurrent.futures import as_completed
+from typing import Dict, Any, Iterator, List, Optional, Sequence, Union
+import numpy as np
+from .engine import BacktestEngine, HistoricalSeries
+from .executor import BacktestExecutor
+from .shared import SharedSeries, attach_shared_series, worker_series, worker_features
+from .strategy import compute_features, profile_orders
+from src.config.profiles import apply_overrides
+
+# A search space maps dotted profile paths to candidate values, or to a
+# (low, high) tuple sampled uniformly in random mode, e.g.
+# {'stop_loss.initial': [1.0, 2.0, 5.0], 'position_sizing.risk_per_trade': (0.01, 0.05)}
+SearchSpace = Dict[str, Union[Sequence[Any], tuple]]
+
+def grid(space: SearchSpace) -> List[Dict[str, Any]]:
+    """Every combination of the candidate values in space"""
+    paths = list(space)
+    return [dict(zip(paths, values)) for values in itertools.product(*(space[p] for p in paths))]
+
+def random_sample(space: SearchSpace, samples: int, seed: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Random combinations: lists are sampled by choice, (low, high) tuples uniformly"""
+    rng = random.Random(seed)
+    return [
+        {
+            path: rng.uniform(*values) if isinstance(values, tuple) else rng.choice(list(values))
+            for path, values in space.items()
+        }
+        for _ in range(samples)
+    ]
+
+def run_profile_backtest(profile: Dict[str, Any], series: HistoricalSeries,
+                         features: Optional[Dict[str, np.ndarray]] = None,
+                         initial_balance: float = 10000.0, fee_rate: float = 0.001,
+                         start: int = 0, end: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Backtest the rule-based profile strategy on bars [start:end] and return
+    summary stats (no per-bar arrays). Features cover the whole series.
+    """
+    if features is None:
+        features = compute_features(series.prices)
+    timestamps, sides, amounts = profile_orders(series, profile, features, initial_balance, fee_rate, start, end)
+    engine = BacktestEngine(series.slice(start, end), initial_balance, fee_rate)
+    result = engine.run_arrays(timestamps, sides, amounts)
+    return {
+        'profile': profile.get('name'),
+        'total_return': (result['final_balance'] - initial_balance) / initial_balance * 100,
+        'final_balance': result['final_balance'],
+        'max_drawdown': result['max_drawdown'],
+        'trades': result['trades'],
+        'total_fees': result['total_fees']
+    }
+
+def _sweep_job(profile: Dict[str, Any], overrides: Dict[str, Any],
+               initial_balance: float, fee_rate: float) -> Dict[str, Any]:
+    """Sweep job executed in a worker process against the shared series"""
+    summary = run_profile_backtest(apply_overrides(profile, overrides), worker_series(),
+                                   worker_features() or None, initial_balance, fee_rate)
+    summary['params'] = overrides
+    return summary
+
+class SweepRunner:
+    """
+    Parallel parameter sweep of trading profiles over one historical series.
+
+    The series and its features are published once to shared memory and
+    attached read-only by every worker. Results are yielded as runs finish,
+    kept ranked by total return and optionally appended to an NDJSON file.
+    """
+
+    def __init__(self, series: HistoricalSeries, profiles: List[Dict[str, Any]], space: SearchSpace,
+                 samples: Optional[int] = None, seed: Optional[int] = None,
+                 max_workers: Optional[int] = None, initial_balance: float = 10000.0,
+                 fee_rate: float = 0.001, results_path: Optional[str] = None):
+        self.series = series
+        self.profiles = profiles
+        self.space = space
+        self.samples = samples
+        self.seed = seed
+        self.max_workers = max_workers
+        self.initial_balance = initial_balance
+        self.fee_rate = fee_rate
+        self.results_path = results_path
+        self.ranked: List[Dict[str, Any]] = []
+        self.errors: List[str] = []
+
+    def combinations(self) -> List[Dict[str, Any]]:
+        """Parameter combinations evaluated for each profile"""
+        if self.samples is None:
+            return grid(self.space)
+        return random_sample(self.space, self.samples, self.seed)
+
+    def _rank(self, result: Dict[str, Any]) -> None:
+        bisect.insort(self.ranked, result, key=lambda r: -r['total_return'])
+
+    def run(self) -> Iterator[Dict[str, Any]]:
+        """Run all profile/parameter combinations, yielding each result as it finishes"""
+        combinations = self.combinations()
+        features = compute_features(self.series.prices)
+        results_file = open(self.results_path, 'a') if self.results_path else None
+        with SharedSeries(self.series, features) as shared:
+            executor = BacktestExecutor(
+                max_workers=self.max_workers,
+                initializer=attach_shared_series,
+                initargs=(shared.descriptor,)
+            )
+            try:
+                futures = executor.submit_batch(
+                    (_sweep_job, (profile, overrides, self.initial_balance, self.fee_rate))
+                    for profile in self.profiles
+                    for overrides in combinations
+                )
+                for future in as_completed(futures):
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        self.errors.append(str(e))
+                        continue
+                    self._rank(result)
+                    if results_file:
+                        results_file.write(json.dumps(result) + '\n')
+                        results_file.flush()
+                    yield result
+            finally:
+                executor.shutdown()
+                if results_file:
+                    results_file.close()
@@ -0,0 +1,124 @@
+from concurrent.futures import as_completed
+from typing import Dict, Any, List, Optional, Tuple
+import numpy as np
+from .engine import HistoricalSeries
+from .executor import BacktestExecutor
+from .shared import SharedSeries, attach_shared_series, worker_series, worker_features
+from .strategy import FeatureCache, DEFAULT_LOOKBACK
+from .sweep import SearchSpace, grid, random_sample, run_profile_backtest
+from src.config.profiles import apply_overrides
+
+def walk_forward_windows(length: int, in_sample: int, out_of_sample: int,
+                         step: Optional[int] = None) -> List[Tuple[int, int, int]]:
+    """
+    Rolling (is_start, is_end / oos_start, oos_end) bar indices.
+
+    Each window optimizes on [is_start, is_end) and evaluates on the next
+    out_of_sample bars; windows advance by step (default out_of_sample).
+    """
+    step = step or out_of_sample
+    windows = []
+    start = 0
+    while start + in_sample + out_of_sample <= length:
+        windows.append((start, start + in_sample, start + in_sample + out_of_sample))
+        start += step
+    return windows
+
+def _walk_forward_job(window: int, bounds: Tuple[int, int, int], profile: Dict[str, Any],
+                      combinations: List[Dict[str, Any]], objective: str,
+                      initial_balance: float, fee_rate: float) -> Dict[str, Any]:
+    """Optimize one in-sample window and evaluate the best parameters out of sample"""
+    series, features = worker_series(), worker_features()
+    is_start, is_end, oos_end = bounds
+    best_params, best_is = None, None
+    for overrides in combinations:
+        summary = run_profile_backtest(apply_overrides(profile, overrides), series, features,
+                                       initial_balance, fee_rate, is_start, is_end)
+        if best_is is None or summary[objective] > best_is[objective]:
+            best_params, best_is = overrides, summary
+    oos = run_profile_backtest(apply_overrides(profile, best_params), series, features,
+                               initial_balance, fee_rate, is_end, oos_end)
+    return {
+        'window': window,
+        'is_start': int(series.timestamps[is_start]),
+        'oos_start': int(series.timestamps[is_end]),
+        'oos_end': int(series.timestamps[oos_end - 1]),
+        'params': best_params,
+        'is_return': best_is['total_return'],
+        'oos_return': oos['total_return'],
+        'oos_max_drawdown': oos['max_drawdown'],
+        'oos_trades': oos['trades'],
+        'oos_fees': oos['total_fees']
+    }
+
+class WalkForwardRunner:
+    """
+    Walk-forward optimization of a trading profile.
+
+    Features are computed once for the whole series (they only look back, so
+    slicing them per window adds no lookahead) and shared read-only with the
+    workers; every window and parameter set reuses them. Windows run in
+    parallel on the backtest worker pool.
+    """
+
+    def __init__(self, series: HistoricalSeries, profile: Dict[str, Any], space: SearchSpace,
+                 in_sample: int, out_of_sample: int, step: Optional[int] = None,
+                 samples: Optional[int] = None, seed: Optional[int] = None,
+                 objective: str = 'total_return', lookback: int = DEFAULT_LOOKBACK,
+                 max_workers: Optional[int] = None, initial_balance: float = 10000.0,
+                 fee_rate: float = 0.001):
+        self.series = series
+        self.profile = profile
+        self.space = space
+        self.windows = walk_forward_windows(len(series), in_sample, out_of_sample, step)
+        self.samples = samples
+        self.seed = seed
+        self.objective = objective
+        self.features = FeatureCache(series.prices).get(lookback)
+        self.max_workers = max_workers
+        self.initial_balance = initial_balance
+        self.fee_rate = fee_rate
+
+    def run(self) -> Dict[str, Any]:
+        """Run all windows and return per-window and aggregate out-of-sample stats"""
+        if not self.windows:
+            raise ValueError("Series too short for the requested in-sample/out-of-sample windows")
+        combinations = grid(self.space) if self.samples is None \
+            else random_sample(self.space, self.samples, self.seed)
+        results = []
+        with SharedSeries(self.series, self.features) as shared:
+            executor = BacktestExecutor(
+                max_workers=self.max_workers,
+                initializer=attach_shared_series,
+                initargs=(shared.descriptor,)
+            )
+            try:
+                futures = executor.submit_batch(
+                    (_walk_forward_job, (i, bounds, self.profile, combinations, self.objective,
+                                         self.initial_balance, self.fee_rate))
+                    for i, bounds in enumerate(self.windows)
+                )
+                for future in as_completed(futures):
+                    results.append(future.result())
+            finally:
+                executor.shutdown()
+
+        results.sort(key=lambda r: r['window'])
+        return {'windows': results, 'aggregate': self.aggregate(results)}
+
+    @staticmethod
+    def aggregate(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Aggregate out-of-sample statistics across windows"""
+        oos = np.array([r['oos_return'] for r in results]) / 100
+        is_returns = np.array([r['is_return'] for r in results]) / 100
+        return {
+            'windows': len(results),
+            'mean_oos_return': float(oos.mean() * 100),
+            'compounded_oos_return': float((np.prod(1 + oos) - 1) * 100),
+            'mean_is_return': float(is_returns.mean() * 100),
+            # Share of in-sample performance retained out of sample
+            'efficiency': float(oos.mean() / is_returns.mean()) if is_returns.mean() else 0.0,
+            'positive_windows': float((oos > 0).mean() * 100),
+            'worst_drawdown': float(min(r['oos_max_drawdown'] for r in results)),
+            'oos_trades': int(sum(r['oos_trades'] for r in results))
+        }
@@ -0,0 +1,225 @@
+"""
+Headless subcommands of main.py for cron jobs and monitors.
+
+Each command does only the I/O it needs (portfolio file, CoinGecko, Coinbase)
+and writes one JSON document to stdout, or one JSON record per line with
+--ndjson. Anything the underlying code prints for humans goes to stderr.
+With --daemon, portfolio, orders and prices are answered by a running
+agency daemon (the daemon command) from its warm state instead.
+"""
+import argparse
+import json
+import os
+import sys
+from contextlib import redirect_stdout
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Only the stdlib daemon client is imported up front: with --daemon nothing else is needed
+from src.client import DAEMON_URL, DaemonClient
+
+# A command returns the JSON document and the records emitted with --ndjson
+CommandResult = Tuple[Any, List[Dict[str, Any]]]
+
+def add_commands(parser: argparse.ArgumentParser) -> None:
+    """Register the headless subcommands on the main.py parser"""
+    parser.add_argument('--daemon', nargs='?', const=DAEMON_URL, metavar='URL',
+                        help=f"Query a running agency daemon (default {DAEMON_URL})")
+    commands = parser.add_subparsers(dest='command', metavar='command')
+
+    def add(name: str, handler: Callable[[argparse.Namespace], CommandResult], help: str) -> argparse.ArgumentParser:
+        command = commands.add_parser(name, help=help)
+        command.add_argument('--ndjson', action='store_true', help='One JSON record per line')
+        command.set_defaults(handler=handler)
+        return command
+
+    portfolio = add('portfolio', portfolio_command,
+                    'Positions with current prices and PnL (unpriced positions have priced=false)')
+    portfolio.add_argument('--path', help='Portfolio file (default src/config/data/portfolio.json)')
+    portfolio.add_argument('--no-prices', action='store_true', help='Skip the CoinGecko price update')
+
+    orders = add('orders', orders_command, 'Portfolio orders, newest first')
+    orders.add_argument('--path', help='Portfolio file (default src/config/data/portfolio.json)')
+    orders.add_argument('--exchange', help='Only orders of this exchange')
+    orders.add_argument('--account', help='Only orders of this account id')
+    orders.add_argument('--symbol', help='Only orders of this symbol')
+    orders.add_argument('--archived', action='store_true', help='Include orders from the cold archive')
+
+    prices = add('prices', prices_command, 'Current CoinGecko prices')
+    prices.add_argument('coins', nargs='*', default=['bitcoin', 'ethereum'], help='CoinGecko ids')
+
+    add('sync-coinbase', sync_coinbase_command, 'Sync Coinbase positions into the portfolio')
+
+    backtest = add('backtest', backtest_command, 'Backtest trading profiles on historical prices')
+    backtest.add_argument('--coin', default='bitcoin', help='CoinGecko id')
+    backtest.add_argument('--timeframe', default='30d', choices=['1d', '7d', '30d', '365d', 'ytd'])
+    backtest.add_argument('--data', help='Price history JSON (CoinGecko format or list of records) instead of CoinGecko')
+    backtest.add_argument('--profile', action='append', help='Profile name (repeatable, default: all)')
+    backtest.add_argument('--balance', type=float, default=10000.0, help='Initial balance')
+    backtest.add_argument('--fee', type=float, default=0.001, help='Fee rate')
+
+    daemon = add('daemon', daemon_command, 'Keep the agency resident and serve a local HTTP JSON API')
+    daemon.add_argument('--host', default='127.0.0.1', help='Interface to listen on')
+    daemon.add_argument('--port', type=int, default=8765, help='Port to listen on')
+    daemon.add_argument('--exchange', help='ccxt exchange id traders order on (keys from <ID>_API_KEY/_API_SECRET)')
+
+def run_command(args: argparse.Namespace) -> int:
+    """Run a subcommand; returns the process exit code"""
+    out = sys.stdout
+    try:
+        with redirect_stdout(sys.stderr):
+            document, records = args.handler(args)
+    except (ValueError, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    if args.ndjson:
+        for record in records:
+            out.write(json.dumps(record, default=str) + "\n")
+    else:
+        out.write(json.dumps(document, indent=2, default=str) + "\n")
+    out.flush()
+    return 0
+
+def portfolio_command(args: argparse.Namespace) -> CommandResult:
+    if args.daemon:
+        return portfolio_positions(DaemonClient(args.daemon).portfolio())
+    from src.utils.portfolio_view import PORTFOLIO_PATH, load_portfolio, price_portfolio
+    portfolio = load_portfolio(args.path or str(PORTFOLIO_PATH), strict=True).dict()
+    if not args.no_prices:
+        portfolio = price_portfolio(portfolio, args.display_currency)
+        portfolio['prices_ok'] = prices_ok(portfolio)
+    return portfolio_positions(portfolio)
+
+def prices_ok(portfolio: Dict[str, Any]) -> bool:
+    """Whether every position of a priced portfolio dict got a current price"""
+    return all(position.get('priced', False)
+               for exchange in portfolio['exchanges'].values()
+               for account in exchange['accounts'].values()
+               for position in account['positions'].values())
+
+def portfolio_positions(portfolio: Dict[str, Any]) -> CommandResult:
+    """Portfolio dict without orders (they have their own command), and its positions as records"""
+    for exchange in portfolio['exchanges'].values():
+        for account in exchange['accounts'].values():
+            for position in account['positions'].values():
+                position.pop('orders', None)  # Orders have their own command
+    positions = [
+        {'exchange': exchange_name, 'account': account_id, 'symbol': symbol,
+         **position}
+        for exchange_name, exchange in portfolio['exchanges'].items()
+        for account_id, account in exchange['accounts'].items()
+        for symbol, position in account['positions'].items()
+    ]
+    return portfolio, positions
+
+def orders_command(args: argparse.Namespace) -> CommandResult:
+    if args.daemon:
+        orders = DaemonClient(args.daemon).orders(args.exchange, args.account, args.symbol, args.archived)
+        return orders, orders
+    from src.utils.order_archive import OrderArchive
+    from src.utils.portfolio_view import PORTFOLIO_PATH, load_portfolio
+    path = args.path or str(PORTFOLIO_PATH)
+    portfolio = load_portfolio(path, strict=True).dict()
+    archive = OrderArchive(str(Path(path).with_suffix('.archive.jsonl.gz'))) if args.archived else None
+    orders = select_orders(portfolio, args.exchange, args.account, args.symbol, archive)
+    return orders, orders
+
+def select_orders(portfolio: Dict[str, Any], exchange: Optional[str] = None, account: Optional[str] = None,
+                  symbol: Optional[str] = None, archive: Optional["OrderArchive"] = None) -> List[Dict[str, Any]]:
+    """Orders of a portfolio dict as flat records, newest first; archived ones too when archive is given"""
+    orders = []
+    for exchange_name, exchange_data in portfolio['exchanges'].items():
+        if exchange and exchange != exchange_name:
+            continue
+        for account_id, account_data in exchange_data['accounts'].items():
+            if account and account != account_id:
+                continue
+            for position_symbol, position in account_data['positions'].items():
+                if symbol and symbol != position_symbol:
+                    continue
+                position_orders = position['orders']
+                if archive is not None and position.get('archived_orders'):
+                    position_orders = archive.orders(exchange_name, account_id, position_symbol) + position_orders
+                orders.extend(
+                    {'exchange': exchange_name, 'account': account_id, 'symbol': position_symbol, **order}
+                    for order in position_orders
+                )
+    orders.sort(key=lambda order: order['last_filled'], reverse=True)
+    return orders
+
+def prices_command(args: argparse.Namespace) -> CommandResult:
+    if args.daemon:
+        # The daemon refreshes the portfolio's coins; others aren't in its snapshot
+        snapshot = DaemonClient(args.daemon).prices()['prices']
+        prices = {coin: snapshot[coin] for coin in args.coins if coin in snapshot}
+        return prices, [{'id': coin, **data} for coin, data in prices.items()]
+    from src.utils.coingecko import coingecko_get_price
+    prices = coingecko_get_price(args.coins, args.display_currency)
+    if prices is None:
+        raise ValueError("CoinGecko prices unavailable")
+    return prices, [{'id': coin, **data} for coin, data in prices.items()]
+
+def sync_coinbase_command(args: argparse.Namespace) -> CommandResult:
+    # The sync logic lives on the portfolio manager; it is built without an LLM
+    from src.agents.portfolio_manager import PortfolioManagerAgent
+    portfolio_manager = PortfolioManagerAgent(SimpleNamespace(llm=None, debug=args.debug,
+                                                              display_currency=args.display_currency))
+    portfolio_manager.init_coinbase_client()
+    if portfolio_manager.coinbase_client is None:
+        raise ValueError("Coinbase API key and secret not configured")
+    portfolio_manager.sync_coinbase()
+    coinbase = portfolio_manager.portfolio.dict()['exchanges'].get('coinbase', {'accounts': {}})
+    accounts = [
+        {'account': account_id, 'name': account['name'], 'positions': len(account['positions'])}
+        for account_id, account in coinbase['accounts'].items()
+    ]
+    return {'exchange': 'coinbase', 'accounts': accounts}, accounts
+
+def backtest_command(args: argparse.Namespace) -> CommandResult:
+    from src.backtest.sweep import run_profile_backtest
+    from src.config.profiles import load_profile, PROFILE_NAMES
+    series = _load_series(args.data, args.coin, args.display_currency, args.timeframe)
+    if len(series) == 0:
+        raise ValueError("No price history to backtest")
+    results = []
+    for name in args.profile or PROFILE_NAMES:
+        summary = run_profile_backtest(load_profile(name), series, initial_balance=args.balance, fee_rate=args.fee)
+        results.append({'coin': args.coin if not args.data else Path(args.data).stem, 'bars': len(series), **summary})
+    return results, results
+
+def daemon_command(args: argparse.Namespace) -> CommandResult:
+    from src.daemon import AgencyDaemon
+    exchange_client = _exchange_client(args.exchange) if args.exchange else None
+    daemon = AgencyDaemon(args, args.host, args.port, args.price_refresh, exchange_client=exchange_client)
+    print(f"Agency daemon listening on {daemon.url}")
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    status = {'status': 'stopped', 'url': daemon.url}
+    return status, [status]
+
+def _exchange_client(exchange_id: str) -> Any:
+    """Authenticated ccxt client of exchange_id, keys from <ID>_API_KEY and <ID>_API_SECRET"""
+    import ccxt
+    if exchange_id not in ccxt.exchanges:
+        raise ValueError(f"Unknown exchange: {exchange_id}")
+    prefix = exchange_id.upper()
+    api_key, api_secret = os.getenv(f'{prefix}_API_KEY', ''), os.getenv(f'{prefix}_API_SECRET', '')
+    if not api_key or not api_secret:
+        raise ValueError(f"{prefix}_API_KEY and {prefix}_API_SECRET not configured")
+    return getattr(ccxt, exchange_id)({'apiKey': api_key, 'secret': api_secret, 'enableRateLimit': True})
+
+def _load_series(path: Optional[str], coin: str, currency: str, timeframe: str) -> "HistoricalSeries":
+    """Price history from a JSON file, or from CoinGecko"""
+    from src.backtest.engine import HistoricalSeries
+    if path:
+        with open(path, 'r') as f:
+            data = json.load(f)
+        return HistoricalSeries.from_records(data) if isinstance(data, list) else HistoricalSeries.from_coingecko(data)
+    from src.utils.coingecko import TimeFrame, coingecko_get_historical_data
+    data = coingecko_get_historical_data(coin, currency, TimeFrame(timeframe))
+    if data is None:
+        raise ValueError(f"CoinGecko history unavailable for {coin}")
+    return HistoricalSeries.from_coingecko(data)
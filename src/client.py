@@ -0,0 +1,92 @@
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlencode
+from urllib.request import Request, urlopen
+
+DAEMON_URL = os.getenv('CRYPTO_DAEMON_URL', 'http://127.0.0.1:8765')
+# Written by the daemon, readable by its user only; requests must carry the token
+DAEMON_TOKEN_PATH = os.getenv('CRYPTO_DAEMON_TOKEN', str(Path.home() / '.crypto_agency' / 'daemon.token'))
+
+class DaemonClient:
+    """
+    Thin client of the agency daemon (src/daemon.py).
+
+    Only the standard library is imported, so a query costs an interpreter
+    start and one local HTTP round trip. Requests are authenticated with the
+    token the daemon wrote to token_path. Errors raise ValueError with the
+    daemon's message, or OSError when the daemon can't be reached.
+    """
+
+    def __init__(self, url: str = DAEMON_URL, timeout: float = 30.0, token_path: str = DAEMON_TOKEN_PATH):
+        self.url = url.rstrip('/')
+        self.timeout = timeout
+        self.token_path = token_path
+        self._token: Optional[str] = None
+
+    def health(self) -> Dict[str, Any]:
+        return self._request('GET', '/health')
+
+    def portfolio(self) -> Dict[str, Any]:
+        return self._request('GET', '/portfolio')
+
+    def orders(self, exchange: Optional[str] = None, account: Optional[str] = None,
+               symbol: Optional[str] = None, archived: bool = False) -> List[Dict[str, Any]]:
+        query = {'exchange': exchange, 'account': account, 'symbol': symbol, 'archived': '1' if archived else None}
+        return self._request('GET', '/orders', query=query)
+
+    def prices(self) -> Dict[str, Any]:
+        return self._request('GET', '/prices')
+
+    def add_transaction(self, exchange: str, account: str, symbol: str, amount: float, price: float,
+                        action: str, fee_rate: float = 0.5) -> Dict[str, Any]:
+        return self._request('POST', '/transactions', {
+            'exchange': exchange, 'account': account, 'symbol': symbol,
+            'amount': amount, 'price': price, 'action': action, 'fee_rate': fee_rate
+        })
+
+    def traders(self) -> List[Dict[str, Any]]:
+        return self._request('GET', '/traders')
+
+    def start_trader(self, name: str, symbols: List[str], interval: Optional[float] = None,
+                     profile: Optional[str] = None) -> Dict[str, Any]:
+        return self._request('POST', '/traders', {'name': name, 'symbols': symbols,
+                                                  'interval': interval, 'profile': profile})
+
+    def stop_trader(self, name: str) -> Dict[str, Any]:
+        return self._request('DELETE', f"/traders/{name}")
+
+    def shutdown(self) -> Dict[str, Any]:
+        return self._request('POST', '/shutdown')
+
+    def _request(self, method: str, path: str, body: Optional[Dict[str, Any]] = None,
+                 query: Optional[Dict[str, Any]] = None) -> Any:
+        query = {key: value for key, value in (query or {}).items() if value is not None}
+        url = f"{self.url}{path}?{urlencode(query)}" if query else f"{self.url}{path}"
+        data = json.dumps(body).encode() if body is not None else None
+        request = Request(url, data=data, method=method, headers={
+            'Content-Type': 'application/json',
+            'Authorization': f"Bearer {self._read_token()}"
+        })
+        try:
+            with urlopen(request, timeout=self.timeout) as response:
+                return json.loads(response.read())
+        except HTTPError as e:
+            try:
+                message = json.loads(e.read()).get('error', e.reason)
+            except ValueError:
+                message = e.reason
+            raise ValueError(f"Daemon error {e.code}: {message}")
+        except URLError as e:
+            raise OSError(f"Agency daemon not reachable at {self.url}: {e.reason}")
+
+    def _read_token(self) -> str:
+        if self._token is None:
+            try:
+                with open(self.token_path, 'r') as f:
+                    self._token = f.read().strip()
+            except OSError as e:
+                raise OSError(f"Agency daemon token not readable at {self.token_path}: {e.strerror}")
+        return self._token
@@ -40,6 +40,7 @@ class Position:
     total_cost: float = 0.0
     total_fees: float = 0.0
     orders: List[OrderDetails] = field(default_factory=list)
+    archived_orders: int = 0  # Orders moved to the cold archive (see OrderArchive)
 
 @dataclass
 class Account:
@@ -60,6 +61,7 @@ class Account:
                     'subtotal_cost': pos.subtotal_cost,
                     'total_cost': pos.total_cost,
                     'total_fees': pos.total_fees,
+                    'archived_orders': pos.archived_orders,
                     'orders': [
                         {
                             'order_id': order.order_id,
@@ -151,7 +153,8 @@ class Portfolio:
                         subtotal_cost=pos_data['subtotal_cost'],
                         total_cost=pos_data['total_cost'],
                         total_fees=pos_data['total_fees'],
-                        orders=orders
+                        orders=orders,
+                        archived_orders=pos_data.get('archived_orders', 0)
                     )
                 
                 exchange.accounts[account_id] = account
@@ -0,0 +1,46 @@
+import copy
+import json
+from pathlib import Path
+from typing import Dict, Any
+
+PROFILES_DIR = Path(__file__).parent / 'data'
+PROFILE_NAMES = ('default', 'aggressive', 'conservative')
+
+def load_profile(name: str = 'default') -> Dict[str, Any]:
+    """Load a trading profile (default, aggressive, conservative) from config/data"""
+    with open(PROFILES_DIR / f"{name}.json", 'r') as f:
+        profile = json.load(f)
+    profile.setdefault('name', name)
+    return profile
+
+def _resolve_path(profile: Dict[str, Any], path: str) -> list:
+    """Split a dotted path, resolving bare trading_params keys such as 'min_confidence'"""
+    keys = path.split('.')
+    if keys[0] not in profile and keys[0] in profile.get('trading_params', {}):
+        keys.insert(0, 'trading_params')
+    return keys
+
+def get_profile_value(profile: Dict[str, Any], path: str) -> Any:
+    """Get a profile value by dotted path (e.g. 'stop_loss.initial')"""
+    value = profile
+    for key in _resolve_path(profile, path):
+        value = value[int(key)] if isinstance(value, list) else value[key]
+    return value
+
+def set_profile_value(profile: Dict[str, Any], path: str, value: Any) -> None:
+    """Set a profile value by dotted path (e.g. 'position_sizing.risk_per_trade')"""
+    keys = _resolve_path(profile, path)
+    target = profile
+    for key in keys[:-1]:
+        target = target[int(key)] if isinstance(target, list) else target.setdefault(key, {})
+    if isinstance(target, list):
+        target[int(keys[-1])] = value
+    else:
+        target[keys[-1]] = value
+
+def apply_overrides(profile: Dict[str, Any], overrides: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a copy of profile with dotted-path overrides applied"""
+    profile = copy.deepcopy(profile)
+    for path, value in overrides.items():
+        set_profile_value(profile, path, value)
+    return profile
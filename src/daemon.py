@@ -0,0 +1,326 @@
+"""
+Resident agency process with a localhost HTTP JSON API.
+
+The daemon keeps the LLM clients (and model warm-up), the parsed portfolio
+and a background price refresher alive, so queries through DaemonClient
+(src/client.py) skip interpreter startup, imports and cold caches.
+
+Every request needs the header "Authorization: Bearer <token>", with the
+token the daemon writes at startup to a file only its user can read
+(DAEMON_TOKEN_PATH). Requests for another Host than the local one (DNS
+rebinding) and non-JSON bodies (cross-site form posts) are rejected.
+
+    GET    /health                  uptime, price age, traders
+    GET    /portfolio               valuation at the refreshed prices
+    GET    /orders                  ?exchange=&account=&symbol=&archived=1
+    GET    /prices                  refreshed prices and their age
+    GET    /traders                 running traders
+    POST   /transactions            {exchange, account, symbol, amount, price, action, fee_rate?}
+    POST   /traders                 {name, symbols, interval?, profile?, exchange?}
+    DELETE /traders/<name>          stop a trader
+    POST   /shutdown
+"""
+import copy
+import hmac
+import json
+import os
+import secrets
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock, Thread
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from src.cli import portfolio_positions, prices_ok, select_orders
+from src.client import DAEMON_TOKEN_PATH
+from src.config.models.portfolio import Action
+from src.utils.coingecko import coingecko_get_price
+from src.utils.portfolio_view import portfolio_coins, price_portfolio
+from src.utils.price_refresher import PriceRefresher, DEFAULT_REFRESH_INTERVAL
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+LOCAL_HOSTS = {'127.0.0.1', 'localhost', '::1'}
+
+class DaemonError(Exception):
+    """Request error answered with an HTTP status"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+class AgencyDaemon:
+    """Serves portfolio, prices, transactions and traders of one resident agency"""
+
+    def __init__(self, config, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                 price_interval: float = DEFAULT_REFRESH_INTERVAL, portfolio_manager=None,
+                 fetch_prices: Callable[[List[str], str], Optional[Dict[str, Any]]] = coingecko_get_price,
+                 token_path: str = DAEMON_TOKEN_PATH, exchange_client=None):
+        """
+        Args:
+            config: main.py configuration (debug, display_currency, ...).
+            host: Interface to listen on; keep it local.
+            port: TCP port (0 picks a free one, see url).
+            price_interval: Seconds between price refreshes.
+            portfolio_manager: Existing PortfolioManagerAgent; the agency (LLM clients)
+                and a portfolio manager are created when None.
+            fetch_prices: Price source, CoinGecko by default.
+            token_path: File the access token is written to (mode 0600).
+            exchange_client: ccxt-style client traders order through (default
+                config.exchange_client); traders can't be started without one.
+        """
+        self.config = config
+        self.exchange_client = exchange_client if exchange_client is not None \
+            else getattr(config, 'exchange_client', None)
+        self.token_path = token_path
+        self._token = secrets.token_urlsafe(32)
+        if portfolio_manager is None:
+            from src.agency import CryptoAgency
+            from src.agents.portfolio_manager import PortfolioManagerAgent
+            self.agency = CryptoAgency(config)
+            portfolio_manager = PortfolioManagerAgent(config)
+        self.portfolio_manager = portfolio_manager
+        self.prices = PriceRefresher(self._coins, getattr(config, 'display_currency', 'usd'),
+                                     price_interval, fetch=fetch_prices)
+        self.traders: Dict[str, Tuple[Any, Thread]] = {}
+        self.started_at = time.time()
+        self._lock = Lock()  # Portfolio reads and writes (fills included), traders
+        self._routes = {
+            ('GET', 'health'): self.health,
+            ('GET', 'portfolio'): self.portfolio,
+            ('GET', 'orders'): self.orders,
+            ('GET', 'prices'): self.price_snapshot,
+            ('GET', 'traders'): self.list_traders,
+            ('POST', 'transactions'): self.add_transaction,
+            ('POST', 'traders'): self.start_trader,
+            ('DELETE', 'traders'): self.stop_trader,
+            ('POST', 'shutdown'): self.request_shutdown
+        }
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._write_token()
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def serve_forever(self) -> None:
+        """Start price refreshes and serve until shutdown"""
+        self.prices.start()
+        try:
+            self._server.serve_forever()
+        finally:
+            self.close()
+
+    def start(self) -> 'AgencyDaemon':
+        """Serve in a background thread"""
+        Thread(target=self.serve_forever, name="agency-daemon", daemon=True).start()
+        return self
+
+    def shutdown(self) -> None:
+        self._server.shutdown()
+
+    def close(self) -> None:
+        with self._lock:
+            names = list(self.traders)
+        for name in names:
+            self.stop_trader({}, name)
+        self.prices.stop()
+        self._server.server_close()
+        self._remove_token()
+
+    # Endpoints: (query or JSON body, path argument) -> JSON document
+
+    def health(self, params: Dict[str, Any], arg: Optional[str] = None) -> Dict[str, Any]:
+        return {
+            'status': 'ok',
+            'pid': os.getpid(),
+            'uptime': time.time() - self.started_at,
+            'prices_age': self.prices.age,
+            'traders': self._trader_names()
+        }
+
+    def portfolio(self, params: Dict[str, Any], arg: Optional[str] = None) -> Dict[str, Any]:
+        with self._lock:
+            portfolio = self.portfolio_manager.portfolio.dict()
+        portfolio = price_portfolio(portfolio, self.prices.currency, self.prices.prices)
+        portfolio['prices_ok'] = prices_ok(portfolio)
+        portfolio, _ = portfolio_positions(portfolio)
+        portfolio['prices_age'] = self.prices.age
+        return portfolio
+
+    def orders(self, params: Dict[str, Any], arg: Optional[str] = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            portfolio = self.portfolio_manager.portfolio.dict()
+        archive = self.portfolio_manager.order_archive if params.get('archived') in ('1', 'true') else None
+        return select_orders(portfolio, params.get('exchange'), params.get('account'), params.get('symbol'), archive)
+
+    def price_snapshot(self, params: Dict[str, Any], arg: Optional[str] = None) -> Dict[str, Any]:
+        if not self.prices.wait_ready(float(params.get('wait', 10))):
+            raise DaemonError(503, "Prices not available yet")
+        return {'currency': self.prices.currency, 'age': self.prices.age, 'prices': self.prices.prices}
+
+    def list_traders(self, params: Dict[str, Any], arg: Optional[str] = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            traders = list(self.traders.items())
+        return [
+            {'name': name, 'running': trader.is_running, 'alive': thread.is_alive(),
+             'symbols': trader.async_engine.pairs if trader.async_engine is not None else [],
+             # Failing iterations don't stop a trader: report them per pair
+             'errors': {symbol: {'errors': stats.errors, 'last_error': stats.last_error}
+                        for symbol, stats in dict(trader.async_engine.stats).items() if stats.errors}
+             if trader.async_engine is not None else {},
+             'fill_errors': {'errors': trader.fill_pipeline.errors, 'last_error': trader.fill_pipeline.last_error}
+             if trader.fill_pipeline is not None else {}}
+            for name, (trader, thread) in traders
+        ]
+
+    def add_transaction(self, params: Dict[str, Any], arg: Optional[str] = None) -> Dict[str, Any]:
+        try:
+            action = Action(str(params['action']).upper())
+            transaction = (params['exchange'], params['account'], params['symbol'],
+                           float(params['amount']), float(params['price']), action)
+        except (KeyError, ValueError) as e:
+            raise DaemonError(400, f"Invalid transaction: {e}")
+        try:
+            with self._lock:
+                self.portfolio_manager.add_transaction(*transaction, fee_rate=float(params.get('fee_rate', 0.5)))
+                position = self.portfolio_manager.portfolio.dict()['exchanges'][params['exchange']] \
+                    ['accounts'][params['account']]['positions'].get(params['symbol'])
+        except ValueError as e:
+            raise DaemonError(400, str(e))
+        return {'added': True, 'position': position}
+
+    def start_trader(self, params: Dict[str, Any], arg: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Run a live trader on the daemon's exchange client over symbols in its own thread.
+        Its fills are booked into the account named after it on params['exchange']
+        (default 'live'), created if needed.
+        """
+        from src.agents.live_trader import LiveTraderAgent
+        from src.trading.fill_pipeline import FillPipeline
+        name, symbols = params.get('name'), params.get('symbols')
+        if not name or not symbols:
+            raise DaemonError(400, "A trader needs a name and symbols")
+        if self.exchange_client is None:
+            raise DaemonError(400, "No exchange client configured (start the daemon with --exchange)")
+        exchange = params.get('exchange') or 'live'
+        config = copy.copy(self.config)
+        if params.get('profile'):
+            config.profile_name = params['profile']
+        trader = LiveTraderAgent(config, self.exchange_client)
+        # Fills are booked under the daemon lock, like the API's own portfolio writes
+        trader.connect_portfolio(FillPipeline(self.portfolio_manager, lock=self._lock), exchange, name)
+        thread = Thread(target=trader.start_async_trading, args=(symbols, params.get('interval')),
+                        name=f"trader-{name}", daemon=True)
+        with self._lock:
+            if name in self.traders:
+                raise DaemonError(409, f"Trader {name} is already running")
+            self.portfolio_manager.create_account(exchange, name, name)
+            self.traders[name] = (trader, thread)
+        thread.start()
+        return {'name': name, 'symbols': symbols}
+
+    def stop_trader(self, params: Dict[str, Any], arg: Optional[str] = None) -> Dict[str, Any]:
+        name = arg or params.get('name')
+        with self._lock:
+            if name not in self.traders:
+                raise DaemonError(404, f"No trader named {name}")
+            trader, thread = self.traders.pop(name)
+        # Outside the lock: stopping books the last fills, which takes it
+        trader.stop_trading()
+        thread.join(5.0)
+        return {'name': name, 'stopped': not thread.is_alive()}
+
+    def request_shutdown(self, params: Dict[str, Any], arg: Optional[str] = None) -> Dict[str, Any]:
+        # shutdown() waits for the serving loop, so it can't run in this request's thread
+        Thread(target=self.shutdown, daemon=True).start()
+        return {'status': 'shutting down'}
+
+    def _trader_names(self) -> List[str]:
+        with self._lock:
+            return list(self.traders)
+
+    def _write_token(self) -> None:
+        """Write the access token to a file readable by the current user only"""
+        os.makedirs(os.path.dirname(self.token_path) or '.', mode=0o700, exist_ok=True)
+        fd = os.open(self.token_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        try:
+            os.fchmod(fd, 0o600)  # The file may predate this daemon with looser permissions
+            os.write(fd, self._token.encode())
+        finally:
+            os.close(fd)
+
+    def _remove_token(self) -> None:
+        try:
+            with open(self.token_path, 'r') as f:
+                if f.read().strip() != self._token:
+                    return  # Written by another daemon since
+            os.remove(self.token_path)
+        except OSError:
+            pass
+
+    def _check_request(self, method: str, headers) -> None:
+        """Reject foreign hosts, non-JSON bodies and requests without the token"""
+        host = urlparse(f"//{headers.get('Host', '')}").hostname
+        if host not in LOCAL_HOSTS | {self._server.server_address[0]}:
+            raise DaemonError(403, f"Host not allowed: {headers.get('Host')}")
+        if method != 'GET' and headers.get_content_type() != 'application/json':
+            raise DaemonError(415, "Content-Type must be application/json")
+        scheme, _, token = headers.get('Authorization', '').partition(' ')
+        if scheme.lower() != 'bearer' or not hmac.compare_digest(token.strip(), self._token):
+            raise DaemonError(401, "Missing or invalid token")
+
+    def _coins(self) -> List[str]:
+        with self._lock:
+            return portfolio_coins(self.portfolio_manager.portfolio.dict())
+
+    def _handler(self):
+        daemon = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                self._dispatch('GET')
+
+            def do_POST(self):
+                self._dispatch('POST')
+
+            def do_DELETE(self):
+                self._dispatch('DELETE')
+
+            def _dispatch(self, method: str):
+                url = urlparse(self.path)
+                parts = [part for part in url.path.split('/') if part]
+                route = daemon._routes.get((method, parts[0] if parts else ''))
+                try:
+                    # Read the body first: replying before it is consumed resets the connection
+                    length = int(self.headers.get('Content-Length', 0))
+                    body = self.rfile.read(length) if length else b''
+                    daemon._check_request(method, self.headers)
+                    if route is None:
+                        raise DaemonError(404, f"Unknown endpoint: {method} {url.path}")
+                    params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+                    if body:
+                        try:
+                            params.update(json.loads(body))
+                        except ValueError as e:
+                            raise DaemonError(400, f"Invalid JSON body: {e}")
+                    self._reply(200, route(params, parts[1] if len(parts) > 1 else None))
+                except DaemonError as e:
+                    self._reply(e.status, {'error': str(e)})
+                except Exception as e:
+                    self._reply(500, {'error': str(e)})
+
+            def _reply(self, status: int, document: Any):
+                body = json.dumps(document, default=str).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                if getattr(daemon.config, 'debug', False):
+                    super().log_message(format, *args)
+
+        return Handler
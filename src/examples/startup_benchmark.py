@@ -0,0 +1,102 @@
+"""
+Startup-time benchmark based on python -X importtime.
+
+Imports each module in a fresh interpreter, then prints the wall time and the
+slowest imports by cumulative time. For example:
+
+    python src/examples/startup_benchmark.py
+    python src/examples/startup_benchmark.py src.agency --top 20
+"""
+import argparse
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+project_root = str(Path(__file__).parent.parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+from rich.console import Console
+from rich.table import Table
+
+DEFAULT_MODULES = ['src', 'src.agents', 'src.utils.portfolio_view', 'src.main', 'src.agency']
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+def measure_import(module: str, runs: int = 3) -> Dict[str, Any]:
+    """
+    Import module in fresh interpreters and keep the fastest run.
+
+    Returns:
+        Dict: wall time in seconds, the per-module importtime entries
+        (self/cumulative microseconds, nesting depth) and any error output.
+    """
+    best: Dict[str, Any] = {}
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', f"import {module}" if module else "pass"],
+            cwd=project_root, capture_output=True, text=True
+        )
+        wall = time.perf_counter() - started
+        if best and wall >= best['wall']:
+            continue
+        imports = []
+        for line in result.stderr.splitlines():
+            match = IMPORTTIME_LINE.match(line)
+            if match:
+                imports.append({
+                    'module': match.group(4),
+                    'self_us': int(match.group(1)),
+                    'cumulative_us': int(match.group(2)),
+                    'depth': (len(match.group(3)) - 1) // 2
+                })
+        errors = [line for line in result.stderr.splitlines() if not line.startswith('import time:')]
+        best = {'module': module, 'wall': wall, 'imports': imports,
+                'error': errors[-1] if result.returncode != 0 and errors else None}
+    return best
+
+def print_benchmark(results: List[Dict[str, Any]], baseline: Dict[str, Any], top: int = 10):
+    """Print wall times per module, then the slowest imports each adds to a bare interpreter"""
+    startup = {entry['module'] for entry in baseline['imports']}
+    console = Console()
+    console.print("\n[dim]─── Startup Time ───[/]")
+    table = Table(show_edge=False, box=None, padding=(0, 1))
+    table.add_column("Module", style="dim")
+    table.add_column("Wall", justify="right")
+    table.add_column("Imports", justify="right", style="dim")
+    table.add_column("Error", style="red")
+    table.add_row("(interpreter)", f"{baseline['wall'] * 1000:,.0f}ms", str(len(baseline['imports'])), "")
+    for result in results:
+        table.add_row(result['module'], f"{result['wall'] * 1000:,.0f}ms",
+                      str(len(result['imports'])), result['error'] or "")
+    console.print(table)
+
+    for result in results:
+        # Top two levels of what the module adds to interpreter startup
+        slowest = sorted((entry for entry in result['imports']
+                          if entry['depth'] <= 1 and entry['module'] not in startup),
+                         key=lambda entry: entry['cumulative_us'], reverse=True)[:top]
+        if not slowest:
+            continue
+        console.print(f"\n[dim]─── Slowest imports: {result['module']} ───[/]")
+        table = Table(show_edge=False, box=None, padding=(0, 1))
+        table.add_column("Import", style="dim")
+        table.add_column("Cumulative", justify="right")
+        table.add_column("Self", justify="right", style="dim")
+        for entry in slowest:
+            table.add_row(entry['module'], f"{entry['cumulative_us'] / 1000:,.1f}ms",
+                          f"{entry['self_us'] / 1000:,.1f}ms")
+        console.print(table)
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure module import (startup) time")
+    parser.add_argument('modules', nargs='*', default=DEFAULT_MODULES, help='Modules to import')
+    parser.add_argument('--runs', type=int, default=3, help='Runs per module (fastest is kept)')
+    parser.add_argument('--top', type=int, default=10, help='Slowest imports shown per module')
+    args = parser.parse_args()
+    baseline = measure_import('', args.runs)
+    print_benchmark([measure_import(module, args.runs) for module in args.modules], baseline, args.top)
+
+if __name__ == "__main__":
+    main()
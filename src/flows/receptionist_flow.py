@@ -3,28 +3,47 @@ from typing import List, Dict, Any
 from crewai import Flow, Agent
 from src.agents.receptionist import ReceptionistAgent
 from src.agents.portfolio_manager import PortfolioManagerAgent
+from src.utils.portfolio_view import portfolio_coins
+from src.utils.price_refresher import PriceRefresher, DEFAULT_REFRESH_INTERVAL
+
+PRICE_WAIT = 5.0  # Seconds show_portfolio waits for the first background refresh before fetching itself
 
 class ReceptionistFlow(Flow):
     """Routing workflow for receptionist"""
     
-    def __init__(self, receptionist: ReceptionistAgent, portfolio_manager: PortfolioManagerAgent):
+    def __init__(self, receptionist: ReceptionistAgent, portfolio_manager: PortfolioManagerAgent,
+                 price_refresh: float = DEFAULT_REFRESH_INTERVAL):
         self.receptionist = receptionist
         self.portfolio_manager = portfolio_manager
+        # Prices are refreshed while the prompt is idle, so commands render without a network round trip
+        self.price_refresher = PriceRefresher(
+            lambda: portfolio_coins(self.portfolio_manager.portfolio.dict()),
+            getattr(portfolio_manager.config, 'display_currency', 'usd'),
+            price_refresh
+        )
         super().__init__()
 
     def route_command(self, cmd: str) -> None:
         """Route the command to the appropriate task or flow"""
         if cmd == 'show_portfolio':
-            self.portfolio_manager.show_portfolio()
+            if self.price_refresher.wait_ready(PRICE_WAIT):
+                # Valued from the warm prices (cheap), so transactions since the last refresh are included
+                self.portfolio_manager.show_portfolio(self.price_refresher.prices, self.price_refresher.age)
+            else:
+                self.portfolio_manager.show_portfolio()
         elif cmd == 'help':
             self.receptionist.print_helper()
 
     def kickoff(self) -> Dict[str, Any]:
         """Run the receptionist flow with direct handler execution."""
+        self.price_refresher.start()
         self.receptionist.print_welcome()
         self.receptionist.print_helper()  
-        while True:  
-            user_input = self.receptionist.get_user_input()
-            if user_input == 'exit':
-                break
-            self.route_command(user_input)
\ No newline at end of file
+        try:
+            while True:  
+                user_input = self.receptionist.get_user_input()
+                if user_input == 'exit':
+                    break
+                self.route_command(user_input)
+        finally:
+            self.price_refresher.stop()
\ No newline at end of file
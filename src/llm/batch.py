@@ -0,0 +1,139 @@
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from queue import Queue, Empty
+from threading import Event, Lock, Thread
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+DEFAULT_BATCH_SIZE = 4
+DEFAULT_MAX_WAIT = 0.5  # Seconds the first request of a batch waits for others
+
+class BatchDecider:
+    """
+    Groups concurrent single decisions into batched LLM calls.
+
+    decide(market_data) blocks its caller until the decision is ready, so it
+    can replace a per-pair decide function (e.g. in AsyncTradingEngine).
+    Requests are collected until batch_size are waiting or the first one
+    has waited max_wait seconds, then decided together through
+    decide_batch(list of market data) -> list of decisions. Up to
+    concurrency batches run at once. A larger batch_size or max_wait trades
+    latency for throughput; batch_size=1 sends every request on its own.
+    """
+
+    def __init__(self, decide_batch: Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]],
+                 batch_size: int = DEFAULT_BATCH_SIZE, max_wait: float = DEFAULT_MAX_WAIT,
+                 concurrency: int = 1):
+        if batch_size < 1:
+            raise ValueError(f"Invalid batch size: {batch_size}")
+        self.decide_batch = decide_batch
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self.concurrency = concurrency
+        self.batches = 0
+        self.requests = 0
+        self._queue: Queue = Queue()
+        self._stop = Event()
+        self._lock = Lock()  # start() and stop() may race, e.g. submit() during stop()
+        self._thread: Optional[Thread] = None
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def mean_batch_size(self) -> float:
+        return self.requests / self.batches if self.batches else 0.0
+
+    def decide(self, market_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Queue market_data for the next batch and wait for its decision"""
+        return self.submit(market_data).result()
+
+    def submit(self, market_data: Dict[str, Any]) -> Future:
+        """Queue market_data for the next batch; the future resolves to its decision"""
+        future: Future = Future()
+        # Queued with the lock held, so a concurrent stop() drains it or waits for it to run
+        with self._lock:
+            self._start()
+            self._queue.put((market_data, future))
+        return future
+
+    def start(self) -> None:
+        with self._lock:
+            self._start()
+
+    def _start(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._pool = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="llm-batch")
+            self._thread = Thread(target=self._run, name="batch-decider", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop collecting; queued requests are still decided"""
+        with self._lock:
+            self._stop.set()
+            self._queue.put(None)  # Wakes the collector waiting for a batch to fill
+            if self._thread is not None:
+                self._thread.join(timeout)
+                self._thread = None
+            while True:
+                batch = self._take(self.batch_size)
+                if not batch:
+                    break
+                self._decide(batch)
+            if self._pool is not None:
+                self._pool.shutdown(wait=True)
+                self._pool = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                first = self._queue.get(timeout=self.max_wait)
+            except Empty:
+                continue
+            if first is None:
+                continue
+            batch = [first]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.batch_size and not self._stop.is_set():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    request = self._queue.get(timeout=remaining)
+                except Empty:
+                    break
+                if request is None:
+                    break
+                batch.append(request)
+            # After a stop() whose join timed out the pool may be gone: decide here rather than lose the batch
+            pool = self._pool
+            if self._stop.is_set() or pool is None:
+                self._decide(batch)
+                continue
+            try:
+                pool.submit(self._decide, batch)
+            except RuntimeError:  # Shut down since the check
+                self._decide(batch)
+
+    def _take(self, limit: int) -> List[Tuple[Dict[str, Any], Future]]:
+        batch = []
+        while len(batch) < limit:
+            try:
+                request = self._queue.get_nowait()
+            except Empty:
+                break
+            if request is not None:
+                batch.append(request)
+        return batch
+
+    def _decide(self, batch: List[Tuple[Dict[str, Any], Future]]) -> None:
+        self.batches += 1
+        self.requests += len(batch)
+        try:
+            decisions = self.decide_batch([market_data for market_data, _ in batch])
+            if len(decisions) != len(batch):
+                raise ValueError(f"Expected {len(batch)} decisions, got {len(decisions)}")
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        for (_, future), decision in zip(batch, decisions):
+            future.set_result(decision)
@@ -0,0 +1,159 @@
+import hashlib
+import json
+import math
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, Optional
+from src.trading.clock import Clock, RealClock
+from src.utils.display import print_trading_error
+
+DEFAULT_TTL = 300.0         # Seconds a cached decision stays valid
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_SAVE_EVERY = 20     # Writes between saves to disk
+
+@dataclass
+class Quantization:
+    """Bucket widths of the cache key: decisions for market states in the same buckets are reused"""
+    price: float = 0.25        # % (log-scale price buckets)
+    change: float = 0.25       # Percentage points of change_24h
+    volatility: float = 0.5    # Percentage points of high_low_range
+    pnl: float = 0.5           # Percentage points of unrealized P&L of an open position
+
+def profile_fingerprint(profile: Dict[str, Any]) -> str:
+    """Short content hash of a trading profile, so cached decisions never cross profiles"""
+    payload = json.dumps(profile, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+class DecisionCache:
+    """
+    LRU cache of LLM trading decisions keyed on the profile and a quantized
+    market state (price, change and volatility buckets, flat/long position
+    and P&L bucket).
+
+    Entries expire after ttl seconds of clock time and the least recently
+    used ones are evicted beyond max_entries. With a path, entries are
+    loaded on start and written back every save_every writes and on save().
+    A disabled cache misses every lookup, e.g. for backtest-fidelity runs.
+    """
+
+    def __init__(self, path: Optional[str] = None, quantization: Optional[Quantization] = None,
+                 ttl: float = DEFAULT_TTL, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 save_every: int = DEFAULT_SAVE_EVERY, enabled: bool = True, clock: Optional[Clock] = None):
+        self.path = Path(path) if path else None
+        self.quantization = quantization or Quantization()
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.save_every = save_every
+        self.enabled = enabled
+        self.clock = clock or RealClock()
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._writes = 0
+        self._lock = Lock()
+        if self.path is not None and enabled:
+            self.load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def key(self, profile: Dict[str, Any], market_data: Dict[str, Any], position: float = 0.0,
+            entry_price: float = 0.0) -> str:
+        """Cache key of a decision request"""
+        q = self.quantization
+        price = float(market_data['price'])
+        state = [
+            profile_fingerprint(profile),
+            market_data.get('symbol'),
+            math.floor(math.log(price) / math.log1p(q.price / 100)) if price > 0 else 0,
+            math.floor(float(market_data.get('change_24h', 0.0)) / q.change),
+            math.floor(float(market_data.get('high_low_range', 0.0)) / q.volatility),
+            position > 0
+        ]
+        if position > 0 and entry_price > 0:
+            state.append(math.floor((price / entry_price - 1) * 100 / q.pnl))
+        return hashlib.sha256(json.dumps(state, separators=(',', ':')).encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Cached decision for key, or None (disabled, missing or expired)"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.clock.time() - entry['stored_at'] > self.ttl:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(entry['decision'])
+
+    def put(self, key: str, decision: Dict[str, Any]) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = {'stored_at': self.clock.time(), 'decision': dict(decision)}
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._writes += 1
+            save = self.path is not None and self._writes >= self.save_every
+        if save:
+            self.save()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def load(self) -> int:
+        """Load unexpired entries from path; returns how many were loaded"""
+        if self.path is None or not self.path.exists():
+            return 0
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print_trading_error(f"Error loading decision cache: {e}")
+            return 0
+        if data.get('quantization') != asdict(self.quantization):
+            return 0  # Keys built with other buckets would never match
+        now = self.clock.time()
+        with self._lock:
+            for key, entry in data.get('entries', []):
+                if now - entry['stored_at'] <= self.ttl:
+                    self._entries[key] = entry
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return len(self._entries)
+
+    def save(self) -> None:
+        """Write all entries, in LRU order, to path"""
+        if self.path is None:
+            return
+        with self._lock:
+            data = {'quantization': asdict(self.quantization), 'entries': list(self._entries.items())}
+            self._writes = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix('.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(data, f, separators=(',', ':'), default=str)
+        tmp.replace(self.path)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'enabled': self.enabled,
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hit_rate
+        }
@@ -0,0 +1,87 @@
+import json
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+from typing import Optional
+
+DEFAULT_RESPONSE = (
+    "Action: BUY\nAmount: 0.1\nConfidence: 75\n"
+    "Reasoning: Price broke above the required change on rising volume, "
+    "volatility is moderate and no position is open, so a small entry fits the profile.\n"
+)
+
+class FakeStreamingServer:
+    """
+    Local stand-in for a streaming LLM endpoint, for tests and latency checks.
+
+    Serves Ollama's /api/generate (NDJSON) and OpenAI's /v1/chat/completions
+    (SSE), streaming response in chunk_size-character tokens every
+    token_delay seconds after first_token_delay. A status other than 200
+    answers with that error instead, other paths with 404. Use url as the
+    client's base URL.
+    """
+
+    def __init__(self, response: str = DEFAULT_RESPONSE, chunk_size: int = 4, token_delay: float = 0.02,
+                 first_token_delay: float = 0.0, status: int = 200, host: str = '127.0.0.1', port: int = 0):
+        self.response = response
+        self.chunk_size = chunk_size
+        self.token_delay = token_delay
+        self.first_token_delay = first_token_delay
+        self.status = status
+        self.requests = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                json.loads(self.rfile.read(length) or b'{}')
+                server.requests += 1
+                ollama = self.path.startswith('/api/generate')
+                if not ollama and not self.path.startswith('/v1/chat/completions'):
+                    self.send_error(404)
+                    return
+                if server.status != 200:
+                    self.send_error(server.status)
+                    return
+                time.sleep(server.first_token_delay)
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/x-ndjson' if ollama else 'text/event-stream')
+                self.end_headers()
+                try:
+                    for chunk in server.chunks():
+                        if ollama:
+                            self._write(json.dumps({'response': chunk, 'done': False}) + "\n")
+                        else:
+                            self._write(f"data: {json.dumps({'choices': [{'delta': {'content': chunk}}]})}\n\n")
+                        time.sleep(server.token_delay)
+                    self._write(json.dumps({'response': '', 'done': True}) + "\n" if ollama else "data: [DONE]\n\n")
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # Client cancelled the stream
+
+            def _write(self, text: str):
+                self.wfile.write(text.encode())
+                self.wfile.flush()
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._thread: Optional[Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def chunks(self):
+        for start in range(0, len(self.response), self.chunk_size):
+            yield self.response[start:start + self.chunk_size]
+
+    def start(self) -> 'FakeStreamingServer':
+        self._thread = Thread(target=self._server.serve_forever, name="fake-llm", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,96 @@
+import json
+import re
+from typing import Any, Dict, List, Optional
+
+FIELD_PATTERN = re.compile(r'^\W*(Action|Amount|Confidence)\W*:\s*(.*)$', re.IGNORECASE | re.MULTILINE)
+REASONING_PATTERN = re.compile(r'Reasoning\W*:\s*(.*)', re.IGNORECASE | re.DOTALL)
+ITEM_PATTERN = re.compile(r'^\W*Item\s*#?\s*(\d+)\b\W*', re.IGNORECASE | re.MULTILINE)
+NUMBER_PATTERN = re.compile(r'-?\d+(?:\.\d+)?')
+
+BATCH_HEADER = (
+    "You are given {count} independent trading requests. Decide each one on its own data only.\n"
+)
+BATCH_FOOTER = (
+    "\nAnswer every item, in order. Start each answer with a line 'Item <number>:' followed by "
+    "the Action, Amount, Confidence and Reasoning lines requested in that item.\n"
+)
+
+def _number(value: Any) -> float:
+    if isinstance(value, (int, float)):
+        return float(value)
+    match = NUMBER_PATTERN.search(str(value or ''))
+    return float(match.group(0)) if match else 0.0
+
+def parse_decision_fields(text: str) -> Optional[Dict[str, Any]]:
+    """
+    Parse an 'Action/Amount/Confidence/Reasoning' answer.
+
+    Returns:
+        Dict with 'action' (BUY/SELL/HOLD), 'amount', 'confidence' and 'reasoning',
+        or None when no action can be found.
+    """
+    fields = {key.lower(): value.strip() for key, value in FIELD_PATTERN.findall(text)}
+    action = re.search(r'BUY|SELL|HOLD', fields.get('action', ''), re.IGNORECASE)
+    if action is None:
+        return None
+    reasoning = REASONING_PATTERN.search(text)
+    return {
+        'action': action.group(0).upper(),
+        'amount': max(_number(fields.get('amount')), 0.0),
+        'confidence': min(max(_number(fields.get('confidence')), 0.0), 100.0),
+        'reasoning': reasoning.group(1).strip() if reasoning else ''
+    }
+
+def build_batch_prompt(prompts: List[str], labels: Optional[List[str]] = None) -> str:
+    """Pack several single-decision prompts into one, as numbered items"""
+    parts = [BATCH_HEADER.format(count=len(prompts))]
+    for number, prompt in enumerate(prompts, start=1):
+        label = f" ({labels[number - 1]})" if labels and labels[number - 1] else ""
+        parts.append(f"\n### Item {number}{label}\n{prompt.strip()}\n")
+    parts.append(BATCH_FOOTER)
+    return "".join(parts)
+
+def parse_batch_response(text: str, count: int) -> List[Optional[Dict[str, Any]]]:
+    """
+    Split a batched answer into per-item decision fields.
+
+    Accepts a JSON array of objects (with 'action', 'amount', 'confidence',
+    'reasoning' and optionally 'item') or 'Item <n>:' blocks. Items that are
+    missing or can't be parsed are None, so callers can retry just those.
+    """
+    results: List[Optional[Dict[str, Any]]] = [None] * count
+    for position, entry in enumerate(_json_items(text)):
+        if not isinstance(entry, dict):
+            continue
+        entry = {str(key).lower(): value for key, value in entry.items()}
+        index = int(_number(entry['item'])) - 1 if 'item' in entry else position
+        action = str(entry.get('action', '')).strip().upper()
+        if 0 <= index < count and action in ('BUY', 'SELL', 'HOLD'):
+            results[index] = {
+                'action': action,
+                'amount': max(_number(entry.get('amount')), 0.0),
+                'confidence': min(max(_number(entry.get('confidence')), 0.0), 100.0),
+                'reasoning': str(entry.get('reasoning', '')).strip()
+            }
+    if any(result is not None for result in results):
+        return results
+
+    headers = list(ITEM_PATTERN.finditer(text))
+    for i, header in enumerate(headers):
+        index = int(header.group(1)) - 1
+        end = headers[i + 1].start() if i + 1 < len(headers) else len(text)
+        if 0 <= index < count and results[index] is None:
+            results[index] = parse_decision_fields(text[header.end():end])
+    if count == 1 and results[0] is None:
+        results[0] = parse_decision_fields(text)
+    return results
+
+def _json_items(text: str) -> List[Any]:
+    start, end = text.find('['), text.rfind(']')
+    if start < 0 or end <= start:
+        return []
+    try:
+        items = json.loads(text[start:end + 1])
+    except json.JSONDecodeError:
+        return []
+    return items if isinstance(items, list) else []
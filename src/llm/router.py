@@ -0,0 +1,143 @@
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+
+DEFAULT_WINDOW = 100        # Latencies kept per backend
+DEFAULT_HEDGE_DELAY = 5.0   # Seconds before hedging while a backend has too few samples
+DEFAULT_TIMEOUT = 60.0
+
+class LatencyTracker:
+    """Rolling latencies and counters of one LLM backend"""
+
+    def __init__(self, window: int = DEFAULT_WINDOW):
+        self.latencies: deque = deque(maxlen=window)
+        self.calls = 0
+        self.errors = 0
+        self.wins = 0       # Answers that were used
+        self._lock = Lock()
+
+    def record(self, seconds: float, ok: bool = True) -> None:
+        with self._lock:
+            self.calls += 1
+            if ok:
+                self.latencies.append(seconds)
+            else:
+                self.errors += 1
+
+    def percentile(self, q: float) -> Optional[float]:
+        with self._lock:
+            return float(np.percentile(self.latencies, q)) if self.latencies else None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'calls': self.calls,
+            'errors': self.errors,
+            'wins': self.wins,
+            'p50': self.percentile(50),
+            'p95': self.percentile(95)
+        }
+
+class LLMRouter:
+    """
+    Routes LLM calls over several backends (objects with call(prompt), e.g.
+    crewai LLMs), in priority order.
+
+    The first backend gets the request. If it hasn't answered within its
+    rolling p95 latency, the next backend gets the same request (hedge) and
+    the first answer wins. A backend error fails over to the next untried
+    backend at once. Losing requests finish in the background and still
+    count towards their backend's latency.
+    """
+
+    def __init__(self, backends: List[Tuple[str, Any]], hedge_percentile: float = 95.0, min_samples: int = 5,
+                 default_hedge_delay: float = DEFAULT_HEDGE_DELAY, timeout: float = DEFAULT_TIMEOUT,
+                 window: int = DEFAULT_WINDOW):
+        """
+        Args:
+            backends: (name, backend) pairs, highest priority first.
+            hedge_percentile: Latency percentile of the running backend after which to hedge.
+            min_samples: Latencies needed before the percentile is trusted.
+            default_hedge_delay: Hedge delay used until then.
+            timeout: Seconds before a call fails when no backend answered.
+        """
+        if not backends:
+            raise ValueError("LLMRouter needs at least one backend")
+        self.backends = list(backends)
+        self.hedge_percentile = hedge_percentile
+        self.min_samples = min_samples
+        self.default_hedge_delay = default_hedge_delay
+        self.timeout = timeout
+        self.trackers = {name: LatencyTracker(window) for name, _ in self.backends}
+        self.hedges = 0
+        self.failovers = 0
+        self._pool = ThreadPoolExecutor(max_workers=4 * len(self.backends), thread_name_prefix="llm-router")
+
+    def hedge_delay(self, name: str) -> float:
+        tracker = self.trackers[name]
+        if len(tracker.latencies) < self.min_samples:
+            return self.default_hedge_delay
+        return tracker.percentile(self.hedge_percentile)
+
+    def call(self, prompt: Any, **kwargs) -> str:
+        """Answer of the first backend to respond successfully"""
+        deadline = time.monotonic() + self.timeout
+        untried = list(self.backends)
+        running: Dict[Future, str] = {}
+        errors = []
+        hedge_at = deadline
+
+        def launch():
+            nonlocal hedge_at
+            name, backend = untried.pop(0)
+            running[self._pool.submit(self._timed_call, name, backend, prompt, kwargs)] = name
+            hedge_at = time.monotonic() + self.hedge_delay(name)
+
+        launch()
+        while running:
+            now = time.monotonic()
+            if now >= deadline:
+                break
+            # Wait for an answer, or until the newest request is due for a hedge
+            wait_for = min(deadline, hedge_at) - now if untried else deadline - now
+            done, _ = wait(list(running), timeout=wait_for, return_when=FIRST_COMPLETED)
+            if not done:
+                if untried:
+                    self.hedges += 1
+                    launch()
+                continue
+            for future in done:
+                name = running.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    errors.append(f"{name}: {e}")
+                    if untried:
+                        self.failovers += 1
+                        launch()
+                    continue
+                self.trackers[name].wins += 1
+                return result
+
+        if errors and not running:
+            raise RuntimeError(f"All LLM backends failed: {'; '.join(errors)}")
+        raise TimeoutError(f"No LLM backend answered within {self.timeout}s")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'hedges': self.hedges,
+            'failovers': self.failovers,
+            'backends': {name: tracker.as_dict() for name, tracker in self.trackers.items()}
+        }
+
+    def _timed_call(self, name: str, backend: Any, prompt: Any, kwargs: Dict[str, Any]) -> str:
+        started = time.perf_counter()
+        try:
+            result = backend.call(prompt, **kwargs)
+        except Exception:
+            self.trackers[name].record(time.perf_counter() - started, ok=False)
+            raise
+        self.trackers[name].record(time.perf_counter() - started)
+        return result
@@ -0,0 +1,169 @@
+import json
+import re
+import time
+from concurrent.futures import Future
+from threading import Event, Thread
+from typing import Any, Callable, Dict, Iterator, Optional
+import requests
+from .prompts import parse_decision_fields
+
+DECISION_FIELDS = ('action', 'amount', 'confidence')
+LINE_PATTERN = re.compile(r'^\W*(Action|Amount|Confidence|Reasoning)\W*:', re.IGNORECASE | re.MULTILINE)
+
+class IncrementalDecisionParser:
+    """
+    Parses an 'Action/Amount/Confidence/Reasoning' answer as it streams in.
+
+    A field counts once its line is complete (newline or the next field
+    started), so 'Amount: 0.1' is not taken while '0.15' may still be
+    arriving. The decision is ready when Action, Amount and Confidence are
+    known, or as soon as Reasoning starts.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self.fields: Optional[Dict[str, Any]] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.fields is not None
+
+    @property
+    def reasoning(self) -> str:
+        fields = parse_decision_fields(self.text)
+        return fields['reasoning'] if fields else ""
+
+    def feed(self, chunk: str) -> bool:
+        """Add streamed text; returns True once the decision fields are available"""
+        self.text += chunk
+        if self.fields is None:
+            # Only complete lines are parsed
+            complete = self.text[:self.text.rfind('\n') + 1]
+            seen = {match.group(1).lower() for match in LINE_PATTERN.finditer(complete)}
+            if 'reasoning' in seen or all(field in seen for field in DECISION_FIELDS):
+                self.fields = parse_decision_fields(complete)
+        return self.ready
+
+    def finish(self) -> Optional[Dict[str, Any]]:
+        """Parse whatever arrived when the stream ends"""
+        if self.fields is None:
+            self.fields = parse_decision_fields(self.text)
+        return self.fields
+
+class StreamingDecision:
+    """Decision fields available early; the rest of the completion (reasoning) arrives in reasoning_future"""
+
+    def __init__(self, fields: Optional[Dict[str, Any]], time_to_decision: float,
+                 reasoning_future: Future, cancel_event: Event):
+        self.fields = fields
+        self.time_to_decision = time_to_decision
+        self.reasoning_future = reasoning_future
+        self._cancel = cancel_event
+
+    def cancel(self) -> None:
+        """Stop reading the completion; reasoning_future resolves with what arrived so far"""
+        self._cancel.set()
+
+class StreamingDecisionClient:
+    """
+    Streams completions from the LLM endpoint configured for the agency
+    (Ollama /api/generate, or an OpenAI-compatible /v1/chat/completions
+    SSE stream) and returns trading decisions as soon as Action, Amount and
+    Confidence have been generated. The reasoning keeps streaming in a
+    background thread for logging, unless the caller cancels it.
+    """
+
+    def __init__(self, base_url: str, model: str, provider: str = 'ollama', api_key: Optional[str] = None,
+                 timeout: float = 120.0, finish_reasoning: bool = True):
+        self.base_url = base_url.rstrip('/')
+        self.model = model.split('/', 1)[1] if model.startswith(f"{provider}/") else model
+        self.provider = provider.lower()
+        self.api_key = api_key
+        self.timeout = timeout
+        self.finish_reasoning = finish_reasoning
+        self.session = requests.Session()
+
+    @classmethod
+    def from_llm(cls, llm: Any, provider: str = 'ollama', **kwargs) -> 'StreamingDecisionClient':
+        """Client for the endpoint and model of a crewai LLM"""
+        return cls(llm.base_url, llm.model, provider, getattr(llm, 'api_key', None), **kwargs)
+
+    def stream(self, prompt: str, cancel: Optional[Event] = None) -> Iterator[str]:
+        """Yield completion text chunks until the stream ends or cancel is set"""
+        if self.provider == 'ollama':
+            url = f"{self.base_url}/api/generate"
+            payload = {'model': self.model, 'prompt': prompt, 'stream': True}
+        else:
+            # OpenAI-compatible base URLs are given with or without the /v1 prefix
+            api = self.base_url if self.base_url.endswith('/v1') else f"{self.base_url}/v1"
+            url = f"{api}/chat/completions"
+            payload = {'model': self.model, 'stream': True, 'messages': [{'role': 'user', 'content': prompt}]}
+        headers = {'Authorization': f"Bearer {self.api_key}"} if self.api_key else {}
+
+        with self.session.post(url, json=payload, headers=headers, stream=True, timeout=self.timeout) as response:
+            response.raise_for_status()
+            for line in response.iter_lines(decode_unicode=True):
+                if cancel is not None and cancel.is_set():
+                    return
+                if not line:
+                    continue
+                if self.provider == 'ollama':
+                    data = json.loads(line)
+                    yield data.get('response', '')
+                    if data.get('done'):
+                        return
+                elif line.startswith('data:'):
+                    data = line[5:].strip()
+                    if data == '[DONE]':
+                        return
+                    delta = json.loads(data)['choices'][0].get('delta', {})
+                    yield delta.get('content') or ''
+
+    def complete(self, prompt: str) -> str:
+        """Whole completion, streamed"""
+        return "".join(self.stream(prompt))
+
+    def call(self, prompt: str, **kwargs) -> str:
+        """LLM-style call (e.g. as an LLMRouter backend)"""
+        return self.complete(prompt)
+
+    def decide(self, prompt: str, on_reasoning: Optional[Callable[[str], None]] = None) -> StreamingDecision:
+        """
+        Stream a decision prompt and return as soon as the decision fields are parsed.
+
+        Args:
+            prompt: Prompt asking for Action/Amount/Confidence/Reasoning.
+            on_reasoning: Called with the full reasoning once the completion ends.
+
+        Returns:
+            StreamingDecision: fields (None if the answer had no action), time to decision
+            and a future for the reasoning. With finish_reasoning=False the stream is closed
+            right after the decision.
+        """
+        parser = IncrementalDecisionParser()
+        ready, cancel = Event(), Event()
+        reasoning: Future = Future()
+        error = []
+        started = time.perf_counter()
+
+        def consume():
+            try:
+                for chunk in self.stream(prompt, cancel):
+                    if parser.feed(chunk) and not ready.is_set():
+                        ready.set()
+                        if not self.finish_reasoning:
+                            cancel.set()
+            except Exception as e:
+                error.append(e)
+            finally:
+                parser.finish()
+                ready.set()
+                reasoning.set_result(parser.reasoning)
+                if on_reasoning is not None and not error:
+                    on_reasoning(parser.reasoning)
+
+        Thread(target=consume, name="llm-stream", daemon=True).start()
+        ready.wait(self.timeout)
+        if error and not parser.ready:
+            raise error[0]
+        return StreamingDecision(parser.fields, time.perf_counter() - started, reasoning, cancel)
@@ -0,0 +1,79 @@
+import time
+from threading import Event, Thread
+from typing import Callable, Optional
+import requests
+
+MIN_KEEP_ALIVE = 300.0  # Seconds; Ollama's own default before unloading an idle model
+
+class ModelWarmer:
+    """
+    Preloads an Ollama model in the background and keeps it loaded.
+
+    The first request (an empty prompt, which only loads the model) measures
+    the model-ready latency. Afterwards a ping every ping_interval seconds
+    renews keep_alive, so idle gaps between trading decisions never unload
+    the model. Both are sized from the trading interval: pings at least once
+    per interval, keep_alive twice the interval (never below Ollama's 5 min).
+    """
+
+    def __init__(self, base_url: str, model: str, trading_interval: float = 60.0, timeout: float = 300.0,
+                 on_ready: Optional[Callable[[str, float], None]] = None):
+        self.base_url = base_url.rstrip('/')
+        self.model = model.split('/', 1)[1] if model.startswith('ollama/') else model
+        self.keep_alive = max(2 * trading_interval, MIN_KEEP_ALIVE)
+        self.ping_interval = min(trading_interval, self.keep_alive / 2)
+        self.timeout = timeout
+        self.on_ready = on_ready
+        self.ready = Event()
+        self.ready_latency: Optional[float] = None
+        self.pings = 0
+        self.last_error: Optional[str] = None
+        self._stop = Event()
+        self._thread: Optional[Thread] = None
+
+    def start(self) -> 'ModelWarmer':
+        """Warm up and keep alive in a background thread; returns immediately"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = Thread(target=self._run, name=f"warmup-{self.model}", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """Block until the model is loaded; False on timeout"""
+        return self.ready.wait(timeout)
+
+    def ping(self) -> float:
+        """Load the model (or renew its keep_alive) and return the request latency"""
+        started = time.perf_counter()
+        response = requests.post(
+            f"{self.base_url}/api/generate",
+            json={'model': self.model, 'prompt': '', 'stream': False, 'keep_alive': f"{int(self.keep_alive)}s"},
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+        self.pings += 1
+        return time.perf_counter() - started
+
+    def _run(self) -> None:
+        while not self._stop.is_set() and not self.ready.is_set():
+            try:
+                self.ready_latency = self.ping()
+                self.ready.set()
+                if self.on_ready is not None:
+                    self.on_ready(self.model, self.ready_latency)
+            except requests.RequestException as e:
+                # Server not up yet: retry at a short interval
+                self.last_error = str(e)
+                self._stop.wait(min(5.0, self.ping_interval))
+        while not self._stop.wait(self.ping_interval):
+            try:
+                self.ping()
+            except requests.RequestException as e:
+                self.last_error = str(e)
@@ -1,19 +1,31 @@
-
 import argparse
 import sys
 from pathlib import Path
 project_root = str(Path(__file__).parent.parent)
 if project_root not in sys.path:
     sys.path.append(project_root)
-from src.agency import CryptoAgency
+from src.cli import add_commands, run_command
 
 def main():
     parser = argparse.ArgumentParser(description="AI Crypto Agency")
     parser.add_argument('-d', '--debug', action='store_true', help=argparse.SUPPRESS)
     parser.add_argument('-c', '--display_currency', type=str, default='usd', help='Display currency')
+    parser.add_argument('-r', '--price_refresh', type=float, default=30.0,
+                        help='Seconds between background price refreshes (interactive mode and daemon)')
+    parser.add_argument('-p', '--portfolio', action='store_true',
+                        help='Show the portfolio and exit (fast: no LLM or agents are loaded)')
+    add_commands(parser)
     config = parser.parse_args()    
+    if config.command:
+        sys.exit(run_command(config))
+    if config.portfolio:
+        from src.utils.portfolio_view import show_portfolio
+        show_portfolio(currency=config.display_currency)
+        return
+    # Imported here so the fast paths above don't load crewai
+    from src.agency import CryptoAgency
     agency = CryptoAgency(config)
     agency.start()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,13 +1,17 @@
 import json
+from typing import Dict, Optional
 from crewai import Task
 from src.agents.portfolio_manager import PortfolioManagerAgent
+from src.utils.portfolio_digest import get_portfolio_digest
 import agentops
 
-def AnalyzePortfolioTask(portfolio_manager: PortfolioManagerAgent) -> Task:
-        portfolio_data = portfolio_manager.update_portfolio()
+def AnalyzePortfolioTask(portfolio_manager: PortfolioManagerAgent, digest: Optional[Dict] = None) -> Task:
+        if digest is None:
+            digest = get_portfolio_digest(portfolio_manager.update_portfolio())
         description = f"""
-        Analyze the following portfolio data and provide insights:
-        {json.dumps(portfolio_data, indent=2)}
+        Analyze the following portfolio summary and provide insights
+        (per-asset aggregates, top movers and a sample of the most recent orders):
+        {json.dumps(digest, separators=(',', ':'))}
         """
         expected_output = f"""
         Consider the following:
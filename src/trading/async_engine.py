@@ -0,0 +1,184 @@
+import asyncio
+import inspect
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any, Callable, Dict, Optional
+from .clock import Clock, RealClock
+
+HOLD = 'HOLD'
+
+@dataclass
+class PairStats:
+    """Per-pair counters of the async trading engine"""
+    interval: float
+    iterations: int = 0
+    trades: int = 0
+    errors: int = 0
+    last_run: Optional[float] = None
+    last_duration: float = 0.0
+    last_error: Optional[str] = None
+
+class AsyncTradingEngine:
+    """
+    Multi-pair live trading loop on asyncio.
+
+    Every pair runs in its own task on its own cadence: fetch market data,
+    decide, execute. Steps may be coroutines or blocking functions (run in
+    worker threads), so a slow fetch or LLM call only delays its own pair.
+    Global semaphores cap concurrent LLM calls and exchange requests, and
+    pairs can be added or removed while the engine runs, from any thread
+    (changes are applied in the engine's loop). Cadence and timings follow
+    the clock, so the engine also runs on simulated time.
+    """
+
+    def __init__(self, fetch_market_data: Callable[[str], Any], decide: Callable[[Any], Dict[str, Any]],
+                 execute: Callable[[Dict[str, Any]], Any], interval: float = 60.0,
+                 llm_concurrency: int = 2, exchange_concurrency: int = 4,
+                 on_error: Optional[Callable[[str, Exception], None]] = None, clock: Optional[Clock] = None):
+        """
+        Args:
+            fetch_market_data: symbol -> market data.
+            decide: market data -> decision dict with 'action' (LLM call).
+            execute: decision -> trade result, skipped for HOLD.
+            interval: Default seconds between iterations of a pair.
+            llm_concurrency: Maximum concurrent decide calls across pairs.
+            exchange_concurrency: Maximum concurrent fetch/execute calls across pairs.
+            on_error: Called with (symbol, exception) when an iteration fails.
+            clock: Time source for pacing and timings (wall clock by default).
+        """
+        self.fetch_market_data = fetch_market_data
+        self.decide = decide
+        self.execute = execute
+        self.interval = interval
+        self.llm_concurrency = llm_concurrency
+        self.exchange_concurrency = exchange_concurrency
+        self.on_error = on_error
+        self.clock = clock or RealClock()
+        self.stats: Dict[str, PairStats] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_lock = Lock()      # Guards _loop against callers in other threads
+        self._stop_pending = False    # stop() called before run() got going
+        self._stopped: Optional[asyncio.Event] = None
+        self._llm: Optional[asyncio.Semaphore] = None
+        self._exchange: Optional[asyncio.Semaphore] = None
+
+    @property
+    def pairs(self) -> list:
+        return list(self.stats)
+
+    @property
+    def running(self) -> bool:
+        return self._loop is not None
+
+    def add_pair(self, symbol: str, interval: Optional[float] = None) -> None:
+        """Start trading symbol every interval seconds (default engine interval)"""
+        self._call_in_loop(self._add_pair, symbol, PairStats(interval or self.interval))
+
+    def remove_pair(self, symbol: str) -> None:
+        """Stop trading symbol; an in-flight iteration is cancelled"""
+        self._call_in_loop(self._remove_pair, symbol)
+
+    def stop(self) -> None:
+        """Stop all pairs and return from run(); before run(), it returns at once"""
+        with self._loop_lock:
+            self._stop_pending = True
+            if self._loop is None:
+                return
+        self._call_in_loop(self._stopped.set)
+
+    async def run(self) -> None:
+        """Run until stop() is called"""
+        with self._loop_lock:
+            self._loop = asyncio.get_running_loop()
+            self._stopped = asyncio.Event()
+            if self._stop_pending:
+                self._stopped.set()
+        self._llm = asyncio.Semaphore(self.llm_concurrency)
+        self._exchange = asyncio.Semaphore(self.exchange_concurrency)
+        for symbol in list(self.stats):
+            self._start_task(symbol)
+        try:
+            await self._stopped.wait()
+        finally:
+            tasks = list(self._tasks.values())
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self._tasks.clear()
+            with self._loop_lock:
+                self._loop = None
+                self._stop_pending = False
+
+    async def step(self, symbol: str) -> Any:
+        """One fetch/decide/execute iteration for symbol, returning the trade result (None for HOLD)"""
+        async with self._exchange:
+            market_data = await self._call(self.fetch_market_data, symbol)
+        async with self._llm:
+            decision = await self._call(self.decide, market_data)
+        if not decision or decision.get('action', HOLD) == HOLD:
+            return None
+        async with self._exchange:
+            return await self._call(self.execute, decision)
+
+    async def _pair_loop(self, symbol: str) -> None:
+        while symbol in self.stats:
+            stats = self.stats[symbol]
+            started = self.clock.time()
+            try:
+                result = await self.step(symbol)
+                if result is not None:
+                    stats.trades += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                stats.errors += 1
+                stats.last_error = str(e)
+                if self.on_error:
+                    self.on_error(symbol, e)
+            stats.iterations += 1
+            stats.last_run = self.clock.time()
+            stats.last_duration = stats.last_run - started
+            # Keep the cadence: the time spent in the iteration counts towards the interval
+            await self.clock.sleep_async(max(0.0, stats.interval - stats.last_duration))
+
+    @staticmethod
+    async def _call(fn: Callable, *args: Any) -> Any:
+        if inspect.iscoroutinefunction(fn):
+            return await fn(*args)
+        return await asyncio.to_thread(fn, *args)
+
+    def _start_task(self, symbol: str) -> None:
+        if symbol in self.stats and symbol not in self._tasks and self._loop is not None:
+            task = self._loop.create_task(self._pair_loop(symbol), name=f"trade-{symbol}")
+            task.add_done_callback(lambda _: self._tasks.pop(symbol, None) if self._tasks.get(symbol) is task else None)
+            self._tasks[symbol] = task
+
+    def _add_pair(self, symbol: str, stats: PairStats) -> None:
+        self.stats[symbol] = stats
+        self._start_task(symbol)
+
+    def _remove_pair(self, symbol: str) -> None:
+        self.stats.pop(symbol, None)
+        task = self._tasks.pop(symbol, None)
+        if task is not None:
+            task.cancel()
+
+    def _call_in_loop(self, fn: Callable, *args: Any) -> None:
+        """
+        Run fn in the engine's loop: directly from the loop thread, thread-safely
+        from others, and directly while the engine is not running.
+        """
+        with self._loop_lock:
+            loop = self._loop
+            if loop is None:
+                fn(*args)
+                return
+        try:
+            in_loop = asyncio.get_running_loop() is loop
+        except RuntimeError:
+            in_loop = False
+        if in_loop:
+            fn(*args)
+        else:
+            loop.call_soon_threadsafe(fn, *args)
@@ -0,0 +1,153 @@
+import asyncio
+import heapq
+import itertools
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Callable, List, Optional, Set, Tuple
+
+class Clock(ABC):
+    """Time source shared by trader agents: live trading and simulations differ only in their clock"""
+
+    @abstractmethod
+    def time(self) -> float:
+        """Current time in seconds since the epoch"""
+        pass
+
+    @abstractmethod
+    def sleep(self, seconds: float) -> None:
+        """Wait for seconds of clock time"""
+        pass
+
+    async def sleep_async(self, seconds: float) -> None:
+        """Wait for seconds of clock time without blocking the event loop"""
+        await asyncio.to_thread(self.sleep, seconds)
+
+class RealClock(Clock):
+    """Wall-clock time"""
+
+    def time(self) -> float:
+        return time.time()
+
+    def sleep(self, seconds: float) -> None:
+        if seconds > 0:
+            time.sleep(seconds)
+
+    async def sleep_async(self, seconds: float) -> None:
+        await asyncio.sleep(max(0.0, seconds))
+
+class SimulatedClock(Clock):
+    """Virtual time that only moves when slept or advanced, so waits return immediately"""
+
+    def __init__(self, start: Optional[float] = None):
+        self.now = time.time() if start is None else start
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        if seconds > 0:
+            self.now += seconds
+
+    async def sleep_async(self, seconds: float) -> None:
+        self.sleep(seconds)
+        await asyncio.sleep(0)  # Still let other tasks run
+
+    def advance_to(self, timestamp: float) -> None:
+        """Jump forward to timestamp (never backwards)"""
+        self.now = max(self.now, timestamp)
+
+class AcceleratedClock(Clock):
+    """Time running factor times faster than the wall clock, starting at start"""
+
+    def __init__(self, factor: float, start: Optional[float] = None):
+        if factor <= 0:
+            raise ValueError(f"Invalid clock factor: {factor}")
+        self.factor = factor
+        self.start = time.time() if start is None else start
+        self._origin = time.monotonic()
+
+    def time(self) -> float:
+        return self.start + (time.monotonic() - self._origin) * self.factor
+
+    def sleep(self, seconds: float) -> None:
+        if seconds > 0:
+            time.sleep(seconds / self.factor)
+
+    async def sleep_async(self, seconds: float) -> None:
+        await asyncio.sleep(max(0.0, seconds) / self.factor)
+
+class Scheduler:
+    """
+    Runs callbacks at clock times from a heap of pending events.
+
+    The scheduler sleeps on its clock until the next event is due, so with a
+    SimulatedClock it jumps straight from one event to the next and a day of
+    60s trading intervals runs in milliseconds. stop() (e.g. from another
+    thread) ends the run once the current wait or callback is over.
+    """
+
+    def __init__(self, clock: Clock):
+        self.clock = clock
+        self._events: List[Tuple[float, int, Optional[float], Callable, tuple]] = []
+        self._cancelled: Set[int] = set()
+        self._ids = itertools.count()
+        self._stopped = False
+
+    def __len__(self) -> int:
+        return len(self._events) - len(self._cancelled)
+
+    def schedule(self, delay: float, callback: Callable, *args: Any) -> int:
+        """Run callback(*args) once after delay seconds, returning the event id"""
+        return self._push(self.clock.time() + delay, None, callback, args)
+
+    def every(self, interval: float, callback: Callable, *args: Any, delay: float = 0.0) -> int:
+        """Run callback(*args) every interval seconds, first after delay, returning the event id"""
+        if interval <= 0:
+            raise ValueError(f"Invalid interval: {interval}")
+        return self._push(self.clock.time() + delay, interval, callback, args)
+
+    def cancel(self, event_id: int) -> None:
+        """Cancel a pending event (dropped lazily when it reaches the top of the heap)"""
+        if any(event[1] == event_id for event in self._events):
+            self._cancelled.add(event_id)
+
+    def next_time(self) -> Optional[float]:
+        """Clock time of the next pending event, or None"""
+        self._drop_cancelled()
+        return self._events[0][0] if self._events else None
+
+    def stop(self) -> None:
+        """Make run_until return without running further events"""
+        self._stopped = True
+
+    def run_until(self, end_time: float) -> int:
+        """Run all events due up to end_time, sleeping on the clock between them; returns events run"""
+        ran = 0
+        while not self._stopped:
+            due = self.next_time()
+            if due is None or due > end_time:
+                break
+            self.clock.sleep(due - self.clock.time())
+            if self._stopped:
+                break
+            due, event_id, interval, callback, args = heapq.heappop(self._events)
+            if interval is not None:
+                heapq.heappush(self._events, (due + interval, event_id, interval, callback, args))
+            callback(*args)
+            ran += 1
+        if not self._stopped:
+            self.clock.sleep(end_time - self.clock.time())
+        return ran
+
+    def run_for(self, duration: float) -> int:
+        """Run events for duration seconds of clock time"""
+        return self.run_until(self.clock.time() + duration)
+
+    def _push(self, due: float, interval: Optional[float], callback: Callable, args: tuple) -> int:
+        event_id = next(self._ids)
+        heapq.heappush(self._events, (due, event_id, interval, callback, args))
+        return event_id
+
+    def _drop_cancelled(self) -> None:
+        while self._events and self._events[0][1] in self._cancelled:
+            self._cancelled.discard(heapq.heappop(self._events)[1])
@@ -0,0 +1,193 @@
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Tuple
+import numpy as np
+
+EXIT_SCAN_CHUNK = 1024  # Initial number of bars scanned when searching for exits in a series
+EPSILON = 1e-12
+
+STOP_LOSS = 'STOP_LOSS'
+TRAILING_STOP = 'TRAILING_STOP'
+TAKE_PROFIT = 'TAKE_PROFIT'
+EXIT_SIGNAL = 'EXIT_SIGNAL'
+
+@dataclass
+class ExitRules:
+    """Exit rules of a trading profile, all thresholds in %"""
+    stop_loss: float
+    trailing: float
+    activation_threshold: float
+    take_profit: List[Tuple[float, float]] = field(default_factory=list)  # (target %, size), ascending targets
+
+    @classmethod
+    def from_profile(cls, profile: Dict[str, Any]) -> 'ExitRules':
+        stop_loss = profile['stop_loss']
+        tiers = sorted((tp['target'], tp['size']) for tp in profile['trading_params'].get('take_profit', []))
+        return cls(stop_loss['initial'], stop_loss['trailing'], stop_loss['activation_threshold'], tiers)
+
+    def tier_targets(self) -> np.ndarray:
+        return np.array([target for target, _ in self.take_profit], dtype=np.float64)
+
+    def tier_keep(self) -> np.ndarray:
+        """Fraction of the initial amount still open after each tier: keep[j] = prod(1 - size) over tiers < j"""
+        sizes = np.array([size for _, size in self.take_profit], dtype=np.float64)
+        return np.concatenate(([1.0], np.cumprod(1 - np.clip(sizes, 0, 1))))
+
+class ExitRuleEngine:
+    """
+    Stop-loss, trailing-stop and tiered take-profit checks for many open
+    positions at once.
+
+    Positions are stored as parallel NumPy arrays (entry price, amount,
+    running max price, next take-profit tier) and evaluated against the
+    latest prices in one vectorized pass.
+    """
+
+    def __init__(self, rules: ExitRules):
+        self.rules = rules
+        self.ids: List[str] = []
+        self.symbols: List[str] = []
+        self.entry = np.empty(0)
+        self.amount = np.empty(0)
+        self.max_price = np.empty(0)
+        self.tier = np.empty(0, dtype=np.int64)
+        self._targets = rules.tier_targets()
+        self._keep = rules.tier_keep()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def add_position(self, position_id: str, symbol: str, amount: float, entry_price: float) -> None:
+        """Track a new position, or average into an existing one with the same id"""
+        if position_id in self.ids:
+            i = self.ids.index(position_id)
+            total = self.amount[i] + amount
+            self.entry[i] = (self.entry[i] * self.amount[i] + entry_price * amount) / total
+            self.amount[i] = total
+            return
+        self.ids.append(position_id)
+        self.symbols.append(symbol)
+        self.entry = np.append(self.entry, entry_price)
+        self.amount = np.append(self.amount, amount)
+        self.max_price = np.append(self.max_price, entry_price)
+        self.tier = np.append(self.tier, 0)
+
+    def cap_position(self, position_id: str, held: float) -> None:
+        """Cap a tracked position at the amount actually held (after any sell), dropping it once closed"""
+        if position_id not in self.ids:
+            return
+        i = self.ids.index(position_id)
+        self.amount[i] = min(self.amount[i], max(0.0, held))
+        self._compact(self.amount > EPSILON)
+
+    def evaluate(self, prices: Dict[str, float]) -> List[Dict[str, Any]]:
+        """
+        Evaluate all positions against the latest prices (symbol -> price).
+
+        Returns:
+            List of SELL orders ({'position_id', 'symbol', 'side', 'amount', 'price', 'reason'}),
+            full closes for stops and partial closes for each crossed take-profit tier.
+        """
+        if not self.ids:
+            return []
+        price = np.array([prices.get(symbol, np.nan) for symbol in self.symbols], dtype=np.float64)
+        valid = ~np.isnan(price)
+        self.max_price = np.where(valid, np.fmax(self.max_price, price), self.max_price)
+
+        stop_hit = valid & (price <= self.entry * (1 - self.rules.stop_loss / 100))
+        trail_active = self.max_price >= self.entry * (1 + self.rules.activation_threshold / 100)
+        trail_hit = valid & trail_active & (price <= self.max_price * (1 - self.rules.trailing / 100))
+        full_exit = stop_hit | trail_hit
+
+        # Number of tiers whose target has been reached, versus tiers already taken
+        gain = np.where(valid, (price / self.entry - 1) * 100, -np.inf)
+        crossed = np.searchsorted(self._targets, gain, side='right')
+        tp_hit = ~full_exit & (crossed > self.tier)
+        # Share of the current amount kept after the newly crossed tiers
+        kept = np.divide(self._keep[crossed], self._keep[self.tier],
+                         out=np.zeros(len(self.ids)), where=self._keep[self.tier] > 0)
+        remaining = np.where(tp_hit, self.amount * kept, self.amount)
+        close = np.where(full_exit, self.amount, self.amount - remaining)
+
+        orders = []
+        for i in np.flatnonzero(close > EPSILON):
+            orders.append({
+                'position_id': self.ids[i],
+                'symbol': self.symbols[i],
+                'side': 'SELL',
+                'amount': float(close[i]),
+                'price': float(price[i]),
+                'reason': (STOP_LOSS if stop_hit[i] else TRAILING_STOP) if full_exit[i] else TAKE_PROFIT
+            })
+
+        self.amount = self.amount - close
+        self.tier = np.where(tp_hit, crossed, self.tier)
+        self._compact(self.amount > EPSILON)
+        return orders
+
+    def _compact(self, keep: np.ndarray) -> None:
+        if keep.all():
+            return
+        self.ids = [pid for pid, k in zip(self.ids, keep) if k]
+        self.symbols = [sym for sym, k in zip(self.symbols, keep) if k]
+        self.entry = self.entry[keep]
+        self.amount = self.amount[keep]
+        self.max_price = self.max_price[keep]
+        self.tier = self.tier[keep]
+
+def exit_schedule(prices: np.ndarray, entry: int, entry_price: float, rules: ExitRules,
+                  exit_signal: Optional[np.ndarray] = None) -> List[Tuple[int, float, str]]:
+    """
+    Exit bars of a position opened at bar entry, found with cumulative max and
+    argmax over the series instead of a bar-by-bar loop. Bars are scanned in
+    doubling chunks (the running max is carried over) so short trades don't
+    touch the rest of the series.
+
+    Returns:
+        List of (bar, fraction of the initial amount, reason): one partial close
+        per take-profit tier reached, then the full close of what remains on a
+        stop, trailing stop or exit signal. Empty remainder means still open.
+    """
+    stop_price = entry_price * (1 - rules.stop_loss / 100)
+    activation_price = entry_price * (1 + rules.activation_threshold / 100)
+    target_prices = entry_price * (1 + rules.tier_targets() / 100)
+    sizes = [size for _, size in rules.take_profit]
+
+    events: List[Tuple[int, float, str]] = []
+    remaining = 1.0
+    next_tier = 0
+    running_max = entry_price
+    start = entry + 1
+    chunk = EXIT_SCAN_CHUNK
+    n = len(prices)
+    while start < n:
+        end = min(start + chunk, n)
+        segment = prices[start:end]
+        segment_max = np.maximum(np.maximum.accumulate(segment), running_max)
+        stop_hit = segment <= stop_price
+        trail_hit = (segment_max >= activation_price) & (segment <= segment_max * (1 - rules.trailing / 100))
+        full = stop_hit | trail_hit
+        if exit_signal is not None:
+            full = full | exit_signal[start:end]
+        full_bar = int(np.argmax(full)) if full.any() else len(segment)
+
+        # Tiers have ascending targets, so each tier is reached no earlier than the previous one
+        while next_tier < len(sizes):
+            reached = segment[:full_bar] >= target_prices[next_tier]
+            if not reached.any():
+                break
+            fraction = remaining * min(max(sizes[next_tier], 0.0), 1.0)
+            remaining -= fraction
+            events.append((start + int(np.argmax(reached)), fraction, TAKE_PROFIT))
+            next_tier += 1
+            if remaining <= EPSILON:
+                return events
+
+        if full_bar < len(segment):
+            reason = STOP_LOSS if stop_hit[full_bar] else TRAILING_STOP if trail_hit[full_bar] else EXIT_SIGNAL
+            events.append((start + full_bar, remaining, reason))
+            return events
+
+        running_max = float(segment_max[-1])
+        start = end
+        chunk *= 2
+    return events
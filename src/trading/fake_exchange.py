@@ -0,0 +1,86 @@
+import itertools
+from typing import Dict, Any, List, Optional
+
+class FakeExchange:
+    """
+    In-memory stand-in for a ccxt-style exchange client, for tests and paper runs.
+
+    Market orders fill in fill_steps equal parts, one per status request, so
+    callers see open -> partially filled -> closed transitions. Limit orders
+    fill once the price set with set_price crosses their limit. Every API
+    call is counted in calls.
+    """
+
+    def __init__(self, prices: Optional[Dict[str, float]] = None, fill_steps: int = 1, fee_rate: float = 0.001):
+        self.prices: Dict[str, float] = dict(prices or {})
+        self.fill_steps = max(1, fill_steps)
+        self.fee_rate = fee_rate
+        self.orders: Dict[str, Dict[str, Any]] = {}
+        self.calls: Dict[str, int] = {}
+        self._ids = itertools.count(1)
+
+    def set_price(self, symbol: str, price: float) -> None:
+        self.prices[symbol] = price
+
+    def fetch_ticker(self, symbol: str) -> Dict[str, Any]:
+        self._count('fetch_ticker')
+        price = self.prices[symbol]
+        return {'symbol': symbol, 'last': price, 'high': price, 'low': price, 'percentage': 0.0, 'quoteVolume': 0.0}
+
+    def create_order(self, symbol: str, type: str, side: str, amount: float,
+                     price: Optional[float] = None, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        self._count('create_order')
+        params = params or {}
+        order = {
+            'id': f"fake-{next(self._ids)}",
+            'symbol': symbol,
+            'type': type.lower(),
+            'side': side.lower(),
+            'amount': float(amount),
+            'price': price if price is not None else params.get('price') or self.prices.get(symbol, 0.0),
+            'filled': 0.0,
+            'remaining': float(amount),
+            'cost': 0.0,
+            'status': 'open',
+            'fee': {'cost': 0.0}
+        }
+        self.orders[order['id']] = order
+        return dict(order)
+
+    def cancel_order(self, order_id: str, symbol: Optional[str] = None) -> Dict[str, Any]:
+        self._count('cancel_order')
+        order = self.orders[order_id]
+        if order['status'] == 'open':
+            order['status'] = 'canceled'
+        return dict(order)
+
+    def fetch_order(self, order_id: str, symbol: Optional[str] = None) -> Dict[str, Any]:
+        self._count('fetch_order')
+        return self._advance(self.orders[order_id])
+
+    def fetch_orders_by_ids(self, ids: List[str], symbol: Optional[str] = None) -> List[Dict[str, Any]]:
+        self._count('fetch_orders_by_ids')
+        return [self._advance(self.orders[order_id]) for order_id in ids if order_id in self.orders]
+
+    def _advance(self, order: Dict[str, Any]) -> Dict[str, Any]:
+        """Progress an open order by one fill step"""
+        if order['status'] == 'open':
+            market = self.prices.get(order['symbol'], order['price'])
+            if order['type'] == 'limit':
+                crossed = market <= order['price'] if order['side'] == 'buy' else market >= order['price']
+                step = order['remaining'] if crossed else 0.0
+            else:
+                step = min(order['remaining'], order['amount'] / self.fill_steps)
+                order['price'] = market
+            if step > 0:
+                order['filled'] += step
+                order['cost'] += step * order['price']
+                order['remaining'] = max(0.0, order['amount'] - order['filled'])
+                order['fee']['cost'] = order['cost'] * self.fee_rate
+                if order['remaining'] <= 1e-12:
+                    order['remaining'] = 0.0
+                    order['status'] = 'closed'
+        return dict(order, fee=dict(order['fee']))
+
+    def _count(self, method: str) -> None:
+        self.calls[method] = self.calls.get(method, 0) + 1
@@ -0,0 +1,205 @@
+import itertools
+import time
+from datetime import datetime
+from queue import Queue, Empty
+from threading import Event, Lock, Thread
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from src.config.models.portfolio import Action
+from .fills import FILLED, PARTIALLY_FILLED
+
+DEFAULT_MAX_BATCH = 200  # Fills booked per portfolio save
+DEFAULT_MAX_WAIT = 1.0   # Seconds a fill may wait for its batch to fill up
+
+class FillPipeline:
+    """
+    Books trader fills into PortfolioManagerAgent in micro-batches.
+
+    Fill events (trade results with 'status', 'symbol', 'side', 'filled',
+    'price', 'cost', 'fees') are queued with the exchange and account they
+    belong to. A batch is taken once max_batch fills are queued or the
+    oldest one has waited max_wait seconds. Consecutive fills on the same
+    side of one account and symbol are coalesced into a single transaction
+    at their volume-weighted price, and the whole batch is applied with one
+    portfolio save and no per-fill printing.
+
+    Without start(), batches are booked in the submitting thread when
+    max_batch is reached and on flush(). Pass the lock other writers of the
+    portfolio hold to have batches booked under it.
+
+    Failures are counted and reported to on_error (called with 'fill' or
+    'save' and the exception) without losing the batch: a malformed fill is
+    dropped on its own, and a batch whose save failed stays booked in the
+    portfolio while the save is retried every max_wait seconds and on stop().
+    """
+
+    def __init__(self, portfolio_manager: Any, max_batch: int = DEFAULT_MAX_BATCH,
+                 max_wait: float = DEFAULT_MAX_WAIT, lock: Optional[Lock] = None,
+                 on_error: Optional[Callable[[str, Exception], None]] = None):
+        if max_batch < 1:
+            raise ValueError(f"Invalid max_batch: {max_batch}")
+        self.portfolio_manager = portfolio_manager
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.fills = 0          # Fills booked
+        self.transactions = 0   # Transactions after coalescing
+        self.batches = 0        # Portfolio saves
+        self.errors = 0
+        self.last_error: Optional[str] = None
+        self.on_error = on_error
+        self._unsaved = False   # Booked batches whose save failed
+        self._queue: Queue = Queue()
+        self._ids = itertools.count(1)
+        self._book_lock = lock or Lock()
+        self._stop = Event()
+        self._thread: Optional[Thread] = None
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def submit(self, exchange: str, account_id: str, fill: Dict[str, Any]) -> None:
+        """Queue a fill event of exchange/account_id (non-fills are ignored)"""
+        if fill.get('status') not in (FILLED, PARTIALLY_FILLED) or not fill.get('filled'):
+            return
+        self._queue.put((exchange, account_id, fill, datetime.now()))
+        if not self.running and self._queue.qsize() >= self.max_batch:
+            self.flush()
+
+    def flush(self) -> int:
+        """Book everything queued now, in batches of max_batch; returns the number of fills booked"""
+        booked = 0
+        while True:
+            batch = self._take(self.max_batch)
+            if not batch:
+                return booked
+            self._book(batch)
+            booked += len(batch)
+
+    def start(self) -> None:
+        """Book batches in a background thread"""
+        if not self.running:
+            self._stop.clear()
+            self._thread = Thread(target=self._run, name="fill-pipeline", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the background thread and book whatever is still queued"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.flush()
+        if self._unsaved:
+            self._save()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                first = self._queue.get(timeout=self.max_wait)
+            except Empty:
+                if self._unsaved:
+                    self._save()
+                continue
+            batch = [first]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch and not self._stop.is_set():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except Empty:
+                    break
+            batch.extend(self._take(self.max_batch - len(batch)))
+            self._book(batch)
+
+    def _take(self, limit: int) -> List[Tuple]:
+        batch = []
+        while len(batch) < limit:
+            try:
+                batch.append(self._queue.get_nowait())
+            except Empty:
+                break
+        return batch
+
+    def _book(self, batch: List[Tuple]) -> None:
+        try:
+            transactions = self.coalesce(batch)
+        except Exception as e:
+            if len(batch) == 1:
+                # A malformed fill can't ever be booked
+                self._error('fill', e)
+                return
+            for fill in batch:
+                self._book([fill])
+            return
+        with self._book_lock:
+            try:
+                if self.portfolio_manager.add_transactions(transactions):
+                    self._unsaved = False
+            except Exception as e:
+                # Applied to the portfolio in memory: only the save is retried
+                self._unsaved = True
+                self._error('save', e)
+            self.fills += len(batch)
+            self.transactions += len(transactions)
+            self.batches += 1
+
+    def _save(self) -> None:
+        with self._book_lock:
+            try:
+                self.portfolio_manager.save_portfolio()
+                self._unsaved = False
+            except Exception as e:
+                self._error('save', e)
+
+    def _error(self, source: str, error: Exception) -> None:
+        self.errors += 1
+        self.last_error = str(error)
+        if self.on_error:
+            self.on_error(source, error)
+
+    def coalesce(self, batch: List[Tuple]) -> List[Dict[str, Any]]:
+        """
+        Merge runs of same-side fills per exchange, account and symbol into
+        add_transactions arguments. A side change starts a new transaction,
+        so each position still sees its buys and sells in order.
+        """
+        runs: Dict[Tuple[str, str, str], List[Dict[str, Any]]] = {}
+        for exchange, account_id, fill, received_at in batch:
+            key = (exchange, account_id, fill['symbol'])
+            side = fill['side'].upper()
+            amount = float(fill['filled'])
+            cost = float(fill.get('cost') or amount * float(fill['price']))
+            filled_at = datetime.fromtimestamp(fill['timestamp'] / 1000) if fill.get('timestamp') else received_at
+            sequence = runs.setdefault(key, [])
+            if sequence and sequence[-1]['side'] == side:
+                run = sequence[-1]
+                run['amount'] += amount
+                run['cost'] += cost
+                run['fees'] += float(fill.get('fees') or 0.0)
+                run['filled_at'] = filled_at
+            else:
+                sequence.append({'side': side, 'amount': amount, 'cost': cost,
+                                 'fees': float(fill.get('fees') or 0.0), 'filled_at': filled_at,
+                                 'id': fill.get('id') or side.lower()})
+
+        transactions = []
+        for (exchange, account_id, symbol), sequence in runs.items():
+            for run in sequence:
+                transactions.append({
+                    'exchange': exchange,
+                    'account_id': account_id,
+                    'symbol': symbol,
+                    'amount': run['amount'],
+                    'price': run['cost'] / run['amount'],
+                    'action': Action(run['side']),
+                    'fee_rate': run['fees'] / run['cost'] * 100 if run['cost'] else 0.0,
+                    'order_id': f"{run['id']}-{next(self._ids)}",
+                    'filled_at': run['filled_at']
+                })
+        return transactions
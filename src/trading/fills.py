@@ -0,0 +1,120 @@
+from typing import Dict, Any, Optional, Tuple
+import numpy as np
+
+FILLED = 'FILLED'
+PARTIALLY_FILLED = 'PARTIALLY_FILLED'
+CANCELED = 'CANCELED'
+
+Fills = Tuple[np.ndarray, np.ndarray, np.ndarray]  # (fill prices, filled amounts, fees)
+
+def fill_status(requested: float, filled: float) -> str:
+    """FILLED, PARTIALLY_FILLED or CANCELED (nothing filled) for an order of requested amount"""
+    if filled <= 0:
+        return CANCELED
+    if filled < requested * (1 - 1e-9):
+        return PARTIALLY_FILLED
+    return FILLED
+
+class FillModel:
+    """
+    Naive fill model: the full amount at the quoted price with a flat fee.
+
+    Fill models work on whole order batches (arrays of sides, amounts,
+    quoted prices and available volumes) so backtests pay one vectorized
+    call per batch whatever the model.
+    """
+
+    latency_ms = 0         # Delay between the quote and the fill
+    partial_fills = False  # Whether filled amounts can be smaller than requested
+
+    def __init__(self, fee_rate: float = 0.001):
+        self.fee_rate = fee_rate
+
+    def fill(self, sides: np.ndarray, amounts: np.ndarray, prices: np.ndarray,
+             volumes: Optional[np.ndarray] = None) -> Fills:
+        """
+        Fill a batch of orders.
+
+        Args:
+            sides: +1 for BUY, -1 for SELL.
+            amounts: Requested amounts in base asset.
+            prices: Quoted prices (already latency-shifted when a price path is known).
+            volumes: Traded volume in quote currency (e.g. volume_24h / total_volumes), 0 when unknown.
+
+        Returns:
+            Tuple of (fill prices, filled amounts, fees) arrays.
+        """
+        amounts = np.asarray(amounts, dtype=np.float64)
+        prices = np.asarray(prices, dtype=np.float64)
+        return prices, amounts, amounts * prices * self.fee_rate
+
+    def fill_order(self, order: Dict[str, Any], price: Optional[float] = None,
+                   volume: float = 0.0) -> Dict[str, Any]:
+        """
+        Fill a single order as produced by TraderAgent.format_order.
+
+        Returns:
+            Dict: status (FILLED, PARTIALLY_FILLED or CANCELED), symbol, side,
+            filled, remaining, price, cost and fees.
+        """
+        price = order['params']['price'] if price is None else price
+        side = 1 if order['side'] == 'BUY' else -1
+        fill_prices, filled, fees = self.fill(np.array([side]), np.array([order['amount']], dtype=np.float64),
+                                              np.array([price], dtype=np.float64), np.array([volume], dtype=np.float64))
+        fill_price, amount, fee = float(fill_prices[0]), float(filled[0]), float(fees[0])
+        return {
+            'status': fill_status(order['amount'], amount),
+            'symbol': order['symbol'],
+            'side': order['side'],
+            'filled': amount,
+            'remaining': max(0.0, order['amount'] - amount),
+            'price': fill_price,
+            'cost': amount * fill_price,
+            'fees': fee
+        }
+
+class SlippageFillModel(FillModel):
+    """
+    Fill model with bid-ask spread, volume-proportional market impact,
+    partial fills and fill latency.
+
+    Buys fill above and sells below the quoted price by half the spread
+    plus impact * (order notional / volume). Orders are capped at
+    max_participation of the available volume; the rest is left unfilled.
+    Orders without volume data only pay the spread.
+    """
+
+    partial_fills = True
+
+    def __init__(self, fee_rate: float = 0.001, spread: float = 0.1, impact: float = 1.0,
+                 max_participation: float = 0.1, latency_ms: int = 0):
+        """
+        Args:
+            fee_rate: Fee as a fraction of the fill cost.
+            spread: Bid-ask spread in % of the price.
+            impact: Price impact in % per 1% of volume taken.
+            max_participation: Largest fraction of the volume a single order can take.
+            latency_ms: Delay between the quote and the fill, used to pick later prices in backtests.
+        """
+        super().__init__(fee_rate)
+        self.spread = spread
+        self.impact = impact
+        self.max_participation = max_participation
+        self.latency_ms = latency_ms
+
+    def fill(self, sides: np.ndarray, amounts: np.ndarray, prices: np.ndarray,
+             volumes: Optional[np.ndarray] = None) -> Fills:
+        amounts = np.asarray(amounts, dtype=np.float64)
+        prices = np.asarray(prices, dtype=np.float64)
+        direction = np.where(np.asarray(sides) > 0, 1.0, -1.0)
+        volumes = np.zeros_like(prices) if volumes is None else np.asarray(volumes, dtype=np.float64)
+        known = volumes > 0
+
+        # Cap each order at its share of the volume
+        capacity = np.where(known, self.max_participation * volumes / np.where(prices > 0, prices, 1.0), np.inf)
+        filled = np.minimum(amounts, capacity)
+
+        participation = np.divide(filled * prices, volumes, out=np.zeros_like(prices), where=known)
+        slippage = (self.spread / 2 + self.impact * participation * 100) / 100
+        fill_prices = prices * (1 + direction * slippage)
+        return fill_prices, filled, filled * fill_prices * self.fee_rate
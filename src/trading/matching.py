@@ -0,0 +1,255 @@
+import heapq
+import itertools
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import numpy as np
+from .fills import FillModel, FILLED, PARTIALLY_FILLED, CANCELED
+
+OPEN = 'OPEN'
+
+MARKET = 'MARKET'
+LIMIT = 'LIMIT'
+STOP = 'STOP'
+
+GTC = 'GTC'  # Good till cancelled: rest until filled
+IOC = 'IOC'  # Immediate or cancel: fill what crosses now, cancel the rest
+FOK = 'FOK'  # Fill or kill: fill everything now or nothing
+
+Entry = Tuple[float, int, str]  # (heap key, sequence, order id)
+
+COMPACT_SHARE = 0.5  # Share of cancelled entries in a book that triggers a rebuild of its heaps
+
+class OrderBook:
+    """
+    Resting orders of one symbol in four heaps keyed so the most crossable
+    order is always on top: buy limits by highest price, sell limits by
+    lowest price, buy stops by lowest trigger, sell stops by highest trigger.
+    Cancelled orders stay in the heaps and are skipped when they surface,
+    until they pass COMPACT_SHARE of the entries and the heaps are rebuilt.
+    """
+
+    def __init__(self):
+        self.buy_limits: List[Entry] = []
+        self.sell_limits: List[Entry] = []
+        self.buy_stops: List[Entry] = []
+        self.sell_stops: List[Entry] = []
+        self.dead = 0  # Entries of cancelled orders still in the heaps
+
+    def __len__(self) -> int:
+        return len(self.buy_limits) + len(self.sell_limits) + len(self.buy_stops) + len(self.sell_stops)
+
+    def compact(self, live: Callable[[str], bool]) -> None:
+        """Rebuild the heaps with only the entries of live order ids"""
+        for heap in (self.buy_limits, self.sell_limits, self.buy_stops, self.sell_stops):
+            heap[:] = [entry for entry in heap if live(entry[2])]
+            heapq.heapify(heap)
+        self.dead = 0
+
+    def heap_for(self, order: Dict[str, Any]) -> Tuple[List[Entry], float]:
+        """Heap and key of an order (keys are negated for max-heaps)"""
+        if order['type'] == LIMIT:
+            return (self.buy_limits, -order['price']) if order['side'] == 'BUY' else (self.sell_limits, order['price'])
+        return (self.buy_stops, order['stop_price']) if order['side'] == 'BUY' else (self.sell_stops, -order['stop_price'])
+
+    def crossable(self, price: float) -> List[Tuple[List[Entry], Callable[[float], bool]]]:
+        """Heaps with the condition their top key must meet to cross at price"""
+        return [
+            (self.buy_limits, lambda key: -key >= price),
+            (self.sell_limits, lambda key: key <= price),
+            (self.buy_stops, lambda key: key <= price),
+            (self.sell_stops, lambda key: -key >= price),
+        ]
+
+class MatchingEngine:
+    """
+    In-process matching engine for paper trading.
+
+    Limit and stop orders rest in per-symbol price-sorted heaps (O(log n)
+    insertion, amortized O(1) cancel by id with lazy removal). Only open orders are
+    kept in orders; filled and cancelled ones are dropped. Each price tick pops
+    every crossable order in one pass and fills the batch through the fill
+    model. Limit orders fill at their limit price, stops at the tick price.
+    Orders carry an account id, and fill events are published to the
+    subscribers of that account.
+    """
+
+    def __init__(self, fill_model: Optional[FillModel] = None):
+        self.fill_model = fill_model or FillModel()
+        self.books: Dict[str, OrderBook] = {}
+        self.orders: Dict[str, Dict[str, Any]] = {}
+        self.last_prices: Dict[str, float] = {}
+        self._subscribers: Dict[str, List[Callable[[Dict[str, Any]], None]]] = {}
+        self._seq = itertools.count()
+
+    def subscribe(self, account: str, callback: Callable[[Dict[str, Any]], None]) -> None:
+        """Call callback(event) for every fill or cancel of the account's orders"""
+        self._subscribers.setdefault(account, []).append(callback)
+
+    def submit(self, order: Dict[str, Any], account: str = 'default') -> Dict[str, Any]:
+        """
+        Submit an order as produced by TraderAgent.format_order (MARKET, LIMIT or STOP,
+        params.timeInForce GTC/IOC/FOK, limit in 'price', trigger in params.stopPrice).
+
+        Returns:
+            Dict: The order's first event: a fill for marketable orders, CANCELED for
+            IOC/FOK orders that can't fill, OPEN for orders resting in the book.
+        """
+        params = order.get('params') or {}
+        order_type = order.get('type', MARKET).upper()
+        tif = (params.get('timeInForce') or GTC).upper()
+        if order_type not in (MARKET, LIMIT, STOP):
+            raise ValueError(f"Invalid order type: {order_type}")
+        if tif not in (GTC, IOC, FOK):
+            raise ValueError(f"Invalid time in force: {tif}")
+
+        symbol = order['symbol']
+        record = {
+            'id': f"paper-{next(self._seq)}",
+            'account': account,
+            'symbol': symbol,
+            'side': order['side'],
+            'type': order_type,
+            'amount': float(order['amount']),
+            'filled': 0.0,
+            'price': float(order.get('price') or params.get('price') or 0.0),
+            'stop_price': float(params.get('stopPrice') or 0.0),
+            'time_in_force': tif,
+            'status': OPEN
+        }
+        if order_type == LIMIT and record['price'] <= 0:
+            raise ValueError("Limit orders need a price")
+        if order_type == STOP and record['stop_price'] <= 0:
+            raise ValueError("Stop orders need params.stopPrice")
+        self.orders[record['id']] = record
+
+        last = self.last_prices.get(symbol)
+        if last is None and order_type == MARKET and record['price'] > 0:
+            last = record['price']
+        if last is None or not (order_type == MARKET or self._crosses(record, last)):
+            if order_type == MARKET or tif != GTC:
+                return self._cancel(record)
+            self._rest(record)
+            return self._event(record, OPEN, 0.0, 0.0, 0.0)
+
+        # Marketable on arrival: fill at the last price, then rest or cancel the remainder
+        events = self._fill([record], np.array([last]))
+        if record['status'] == OPEN:
+            if order_type == LIMIT and tif == GTC:
+                self._rest(record)
+                events = events or [self._event(record, OPEN, 0.0, 0.0, 0.0)]
+            else:
+                events.append(self._cancel(record))
+        return events[0]
+
+    def cancel(self, order_id: str) -> Optional[Dict[str, Any]]:
+        """Cancel a resting order by id (removed lazily from its book)"""
+        record = self.orders.get(order_id)
+        return self._cancel(record) if record is not None else None
+
+    def cancel_all(self, account: str, symbol: Optional[str] = None) -> int:
+        """Cancel every resting order of an account (optionally for one symbol)"""
+        cancelled = 0
+        for record in list(self.orders.values()):
+            if record['account'] == account and record['status'] == OPEN and symbol in (None, record['symbol']):
+                self._cancel(record)
+                cancelled += 1
+        return cancelled
+
+    def open_orders(self, account: Optional[str] = None, symbol: Optional[str] = None) -> List[Dict[str, Any]]:
+        return [
+            dict(record) for record in self.orders.values()
+            if record['status'] == OPEN and account in (None, record['account']) and symbol in (None, record['symbol'])
+        ]
+
+    def on_tick(self, symbol: str, price: float, volume: float = 0.0) -> List[Dict[str, Any]]:
+        """Match all resting orders of symbol that cross price, returning the fill events"""
+        self.last_prices[symbol] = price
+        book = self.books.get(symbol)
+        if book is None:
+            return []
+
+        crossed: List[Dict[str, Any]] = []
+        for heap, crosses in book.crossable(price):
+            while heap and crosses(heap[0][0]):
+                record = self.orders.get(heapq.heappop(heap)[2])
+                if record is None:
+                    book.dead = max(0, book.dead - 1)
+                else:
+                    record['resting'] = False
+                    crossed.append(record)
+        if not crossed:
+            return []
+
+        fill_prices = np.array([r['price'] if r['type'] == LIMIT else price for r in crossed])
+        events = self._fill(crossed, fill_prices, volume)
+        for record in crossed:
+            if record['status'] == OPEN:
+                # Partially filled by a volume-aware fill model: rest the remainder
+                self._rest(record)
+        return events
+
+    def _crosses(self, record: Dict[str, Any], price: float) -> bool:
+        if record['type'] == LIMIT:
+            return price <= record['price'] if record['side'] == 'BUY' else price >= record['price']
+        return price >= record['stop_price'] if record['side'] == 'BUY' else price <= record['stop_price']
+
+    def _fill(self, records: List[Dict[str, Any]], prices: np.ndarray, volume: float = 0.0) -> List[Dict[str, Any]]:
+        """Fill a batch of orders in one fill-model call and publish the events"""
+        sides = np.array([1 if r['side'] == 'BUY' else -1 for r in records])
+        remaining = np.array([r['amount'] - r['filled'] for r in records])
+        volumes = np.full(len(records), volume, dtype=np.float64)
+        fill_prices, filled, fees = self.fill_model.fill(sides, remaining, prices, volumes)
+
+        events = []
+        for record, amount, fill_price, fee, wanted in zip(records, filled.tolist(), fill_prices.tolist(),
+                                                           fees.tolist(), remaining.tolist()):
+            if record['time_in_force'] == FOK and amount < wanted * (1 - 1e-9):
+                events.append(self._cancel(record))
+                continue
+            if amount <= 0:
+                continue
+            record['filled'] += amount
+            done = record['filled'] >= record['amount'] * (1 - 1e-9)
+            if done:
+                record['status'] = FILLED
+                del self.orders[record['id']]
+            events.append(self._event(record, FILLED if done else PARTIALLY_FILLED, amount, fill_price, fee))
+            self._publish(events[-1])
+        return events
+
+    def _rest(self, record: Dict[str, Any]) -> None:
+        book = self.books.setdefault(record['symbol'], OrderBook())
+        heap, key = book.heap_for(record)
+        heapq.heappush(heap, (key, next(self._seq), record['id']))
+        record['resting'] = True
+
+    def _cancel(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        record['status'] = CANCELED
+        self.orders.pop(record['id'], None)
+        if record.pop('resting', False):
+            # Its heap entry becomes a tombstone; rebuild once they dominate the book
+            book = self.books[record['symbol']]
+            book.dead += 1
+            if book.dead > len(book) * COMPACT_SHARE:
+                book.compact(lambda order_id: order_id in self.orders)
+        event = self._event(record, CANCELED, 0.0, record['price'], 0.0)
+        self._publish(event)
+        return event
+
+    def _event(self, record: Dict[str, Any], status: str, amount: float, price: float, fee: float) -> Dict[str, Any]:
+        return {
+            'id': record['id'],
+            'account': record['account'],
+            'symbol': record['symbol'],
+            'type': record['type'],
+            'side': record['side'],
+            'status': status,
+            'filled': amount,
+            'remaining': record['amount'] - record['filled'],
+            'price': price,
+            'cost': amount * price,
+            'fees': fee
+        }
+
+    def _publish(self, event: Dict[str, Any]) -> None:
+        for callback in self._subscribers.get(event['account'], ()):
+            callback(event)
@@ -0,0 +1,195 @@
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+import numpy as np
+from src.backtest.engine import HistoricalSeries
+from src.backtest.stream import ProfileStreamingStrategy, apply_fill, candle_events, iter_file_chunks, \
+    iter_series_chunks, DEFAULT_CHUNK_SIZE
+from src.config.models.portfolio import Action
+
+DEFAULT_FLUSH_SIZE = 500  # Fills buffered before a portfolio write
+
+class RollingFeatures:
+    """
+    Change and volatility (%) over a rolling lookback, updated in amortized
+    O(1) per candle with monotonic max/min queues. Same values as
+    backtest.stream.window_features.
+    """
+
+    def __init__(self, lookback: int):
+        self.lookback = lookback
+        self.prices: deque = deque(maxlen=lookback + 1)
+        self._max: deque = deque()  # (bar, price), decreasing prices
+        self._min: deque = deque()  # (bar, price), increasing prices
+        self._bar = 0
+
+    def update(self, price: float) -> Optional[Tuple[float, float]]:
+        """Add the current price; returns (change, volatility) once lookback + 1 prices are known"""
+        bar = self._bar
+        self._bar += 1
+        self.prices.append(price)
+        while self._max and self._max[-1][1] <= price:
+            self._max.pop()
+        self._max.append((bar, price))
+        while self._min and self._min[-1][1] >= price:
+            self._min.pop()
+        self._min.append((bar, price))
+        oldest = bar - self.lookback
+        if self._max[0][0] < oldest:
+            self._max.popleft()
+        if self._min[0][0] < oldest:
+            self._min.popleft()
+        if bar < self.lookback:
+            return None
+        return (price / self.prices[0] - 1) * 100, (self._max[0][1] - self._min[0][1]) / price * 100
+
+class StrategyAccount:
+    """Virtual account of one strategy instance: cash, per-symbol positions and running stats"""
+
+    def __init__(self, name: str, strategy: ProfileStreamingStrategy, initial_balance: float, fee_rate: float):
+        self.name = name
+        self.account_id = f"virtual-{name}"
+        self.strategy = strategy
+        self.initial_balance = initial_balance
+        self.fee_rate = fee_rate
+        self.cash = initial_balance
+        self.states: Dict[str, Dict[str, Any]] = {}
+        self.trades = 0
+        self.total_fees = 0.0
+        self.peak = initial_balance
+        self.max_drawdown = 0.0
+
+    def state(self, symbol: str) -> Dict[str, Any]:
+        if symbol not in self.states:
+            self.states[symbol] = {'cash': self.cash, 'position': 0.0, 'entry_price': 0.0,
+                                   'max_price': 0.0, 'tier': 0, 'fee_rate': self.fee_rate}
+        return self.states[symbol]
+
+    def equity(self, prices: Dict[str, float]) -> float:
+        return self.cash + sum(state['position'] * prices.get(symbol, 0.0) for symbol, state in self.states.items())
+
+class MultiStrategyRunner:
+    """
+    Paper-trades many strategy instances over one shared market feed.
+
+    Each candle updates one set of rolling features per symbol and distinct
+    lookback, handed to every strategy using that lookback, so adding
+    strategies doesn't add feature work. Every strategy trades its own
+    virtual account. Fills are buffered and booked into the portfolio in
+    batches (one save per batch) when a portfolio manager is given.
+    """
+
+    def __init__(self, strategies: Dict[str, ProfileStreamingStrategy], portfolio_manager: Any = None,
+                 initial_balance: float = 10000.0, fee_rate: float = 0.001,
+                 flush_size: int = DEFAULT_FLUSH_SIZE):
+        self.accounts = [StrategyAccount(name, strategy, initial_balance, fee_rate)
+                         for name, strategy in strategies.items()]
+        self.portfolio_manager = portfolio_manager
+        self.fee_rate = fee_rate
+        self.flush_size = flush_size
+        self.lookbacks = sorted({account.strategy.lookback for account in self.accounts})
+        self.features: Dict[str, Dict[int, RollingFeatures]] = {}
+        self.prices: Dict[str, float] = {}
+        self.pending: List[Dict[str, Any]] = []
+        self._fill_ids = 0
+        if portfolio_manager is not None:
+            portfolio_manager.create_virtual_accounts({a.account_id: f"Strategy {a.name}" for a in self.accounts})
+
+    @classmethod
+    def from_profiles(cls, profiles: Dict[str, Dict[str, Any]], lookbacks: Iterable[int] = (),
+                      **kwargs) -> 'MultiStrategyRunner':
+        """One strategy per profile (name -> profile), or per profile and lookback when lookbacks are given"""
+        strategies = {}
+        for name, profile in profiles.items():
+            if lookbacks:
+                for lookback in lookbacks:
+                    strategies[f"{name}-{lookback}"] = ProfileStreamingStrategy(profile, lookback)
+            else:
+                strategies[name] = ProfileStreamingStrategy(profile)
+        return cls(strategies, **kwargs)
+
+    def on_candle(self, symbol: str, timestamp: int, price: float, volume: float = 0.0) -> List[Dict[str, Any]]:
+        """Fan one candle out to all strategies, returning the fills it produced"""
+        rolling = self.features.get(symbol)
+        if rolling is None:
+            rolling = self.features[symbol] = {lookback: RollingFeatures(lookback) for lookback in self.lookbacks}
+        self.prices[symbol] = price
+
+        # Shared features, computed once per lookback for all strategies
+        features = {lookback: feature.update(price) for lookback, feature in rolling.items()}
+        fills = []
+        for account in self.accounts:
+            if features[account.strategy.lookback] is None:
+                continue
+            change, volatility = features[account.strategy.lookback]
+            state = account.state(symbol)
+            state['cash'] = account.cash
+            for order in account.strategy.decide(price, change, volatility, state) or ():
+                fill = apply_fill(order, price, state, self.fee_rate)
+                if fill:
+                    fill.update(account=account.name, symbol=symbol, timestamp=timestamp)
+                    account.trades += 1
+                    account.total_fees += fill['fees']
+                    fills.append(fill)
+            account.cash = state['cash']
+            equity = account.equity(self.prices)
+            account.peak = max(account.peak, equity)
+            account.max_drawdown = min(account.max_drawdown, (equity - account.peak) / account.peak)
+
+        if fills and self.portfolio_manager is not None:
+            self.pending.extend(fills)
+            if len(self.pending) >= self.flush_size:
+                self.flush()
+        return fills
+
+    def run(self, source: Union[str, HistoricalSeries, Iterable[np.ndarray]], symbol: str,
+            chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[Dict[str, Any]]:
+        """Stream a .npy candle file, series or chunk iterable for symbol through all strategies"""
+        if isinstance(source, str):
+            chunks = iter_file_chunks(source, chunk_size)
+        elif isinstance(source, HistoricalSeries):
+            chunks = iter_series_chunks(source, chunk_size)
+        else:
+            chunks = source
+        for timestamp, price, volume in candle_events(chunks):
+            self.on_candle(symbol, timestamp, price, volume)
+        self.flush()
+        return self.leaderboard()
+
+    def flush(self) -> int:
+        """Book buffered fills into the strategies' virtual accounts with one portfolio save"""
+        if not self.pending or self.portfolio_manager is None:
+            return 0
+        transactions = []
+        for fill in self.pending:
+            self._fill_ids += 1
+            transactions.append({
+                'exchange': 'virtual',
+                'account_id': f"virtual-{fill['account']}",
+                'symbol': fill['symbol'],
+                'amount': fill['filled'],
+                'price': fill['price'],
+                'action': Action(fill['side']),
+                'fee_rate': self.fee_rate * 100,
+                'order_id': f"{fill['side'].lower()}-{fill['account']}-{fill['timestamp']}-{self._fill_ids}",
+                'filled_at': datetime.fromtimestamp(fill['timestamp'] / 1000)
+            })
+        self.pending = []
+        return self.portfolio_manager.add_transactions(transactions)
+
+    def leaderboard(self) -> List[Dict[str, Any]]:
+        """Accounts ranked by total return at the latest prices"""
+        rows = []
+        for account in self.accounts:
+            equity = account.equity(self.prices)
+            rows.append({
+                'strategy': account.name,
+                'account_id': account.account_id,
+                'equity': equity,
+                'total_return': (equity - account.initial_balance) / account.initial_balance * 100,
+                'max_drawdown': account.max_drawdown * 100,
+                'trades': account.trades,
+                'total_fees': account.total_fees,
+                'open_positions': sum(1 for state in account.states.values() if state['position'] > 0)
+            })
+        return sorted(rows, key=lambda row: -row['total_return'])
@@ -0,0 +1,177 @@
+from threading import Event, Lock, Thread
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from .fills import FILLED, PARTIALLY_FILLED, CANCELED
+
+DEFAULT_BATCH_SIZE = 50  # Orders per status request
+
+Subscriber = Callable[[Dict[str, Any]], None]
+
+class OrderTracker:
+    """
+    Tracks open exchange orders and turns status changes into fill events.
+
+    All open orders are polled together, in batches (fetch_orders_by_ids when
+    the exchange supports it, fetch_order otherwise). The poll interval
+    drops to min_interval whenever something changed and backs off towards
+    max_interval while nothing does. Each change is published to subscribers
+    as an event shaped like a trade result ('status', 'symbol', 'side',
+    'filled' since the last event, 'price', ...), so TraderAgent.update_position
+    can subscribe directly.
+
+    A failed poll or subscriber is counted and reported to on_error (called
+    with 'poll' or 'subscriber' and the exception) without stopping the
+    polling thread; a failed poll backs off like an unchanged one.
+
+    Intervals are wall-clock seconds whatever the traders' clock: they pace
+    requests to a real exchange, and a simulated clock would spin the thread.
+    """
+
+    def __init__(self, exchange: Any, min_interval: float = 0.5, max_interval: float = 10.0,
+                 backoff: float = 2.0, batch_size: int = DEFAULT_BATCH_SIZE,
+                 on_error: Optional[Callable[[str, Exception], None]] = None):
+        self.exchange = exchange
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.batch_size = batch_size
+        self.on_error = on_error
+        self.interval = min_interval
+        self.errors = 0
+        self.last_error: Optional[str] = None
+        self._open: Dict[str, Dict[str, Any]] = {}
+        self._subscribers: List[tuple] = []
+        self._lock = Lock()
+        self._stop = Event()
+        self._thread: Optional[Thread] = None
+
+    @property
+    def open_orders(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [dict(order) for order in self._open.values()]
+
+    def track(self, order: Dict[str, Any]) -> str:
+        """Start tracking an order as returned by exchange.create_order"""
+        with self._lock:
+            self._open[order['id']] = {
+                'id': order['id'],
+                'symbol': order['symbol'],
+                'side': order['side'].upper(),
+                'amount': float(order['amount']),
+                'filled': 0.0,
+                'cost': 0.0,
+                'fees': 0.0
+            }
+        # New orders are likely to change soon
+        self.interval = self.min_interval
+        return order['id']
+
+    def subscribe(self, callback: Subscriber, statuses: Optional[Iterable[str]] = None) -> Callable[[], None]:
+        """
+        Call callback(event) for every event (or only the given statuses:
+        FILLED, PARTIALLY_FILLED, CANCELED). Returns an unsubscribe function.
+        """
+        entry = (callback, set(statuses) if statuses else None)
+        self._subscribers.append(entry)
+        return lambda: self._subscribers.remove(entry) if entry in self._subscribers else None
+
+    def poll(self) -> List[Dict[str, Any]]:
+        """Fetch the status of all open orders once, publish and return the resulting events"""
+        with self._lock:
+            tracked = list(self._open.values())
+        events = []
+        for start in range(0, len(tracked), self.batch_size):
+            for status in self._fetch([order['id'] for order in tracked[start:start + self.batch_size]]):
+                events.extend(self._update(status))
+
+        for event in events:
+            self._publish(event)
+        if events:
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.max_interval, self.interval * self.backoff)
+        return events
+
+    def run(self, stop_event: Optional[Event] = None) -> None:
+        """Poll until stop_event (or stop()) is set, waiting the adaptive interval in between"""
+        stop_event = stop_event or self._stop
+        while not stop_event.is_set() and not self._stop.is_set():
+            if self._open:
+                try:
+                    self.poll()
+                except Exception as e:
+                    self._error('poll', e)
+                    self.interval = min(self.max_interval, self.interval * self.backoff)
+            else:
+                self.interval = self.min_interval
+            stop_event.wait(self.interval)
+
+    def start(self) -> None:
+        """Poll in a background thread"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = Thread(target=self.run, name="order-tracker", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _fetch(self, ids: List[str]) -> List[Dict[str, Any]]:
+        if hasattr(self.exchange, 'fetch_orders_by_ids'):
+            return self.exchange.fetch_orders_by_ids(ids)
+        with self._lock:
+            symbols = {order_id: self._open[order_id]['symbol'] for order_id in ids if order_id in self._open}
+        return [self.exchange.fetch_order(order_id, symbol) for order_id, symbol in symbols.items()]
+
+    def _update(self, status: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Diff an exchange status against the tracked order, returning events for what changed"""
+        with self._lock:
+            order = self._open.get(status['id'])
+            if order is None:
+                return []
+            filled = float(status.get('filled') or 0.0)
+            cost = float(status.get('cost') or filled * float(status.get('price') or 0.0))
+            fees = float((status.get('fee') or {}).get('cost') or 0.0)
+            delta = filled - order['filled']
+            done = status.get('status') in ('closed', 'canceled', 'cancelled', 'expired', 'rejected')
+            if delta <= 1e-12 and not done:
+                return []
+
+            event = {
+                'id': order['id'],
+                'symbol': order['symbol'],
+                'side': order['side'],
+                'filled': max(0.0, delta),
+                'total_filled': filled,
+                'remaining': max(0.0, order['amount'] - filled),
+                'price': (cost - order['cost']) / delta if delta > 1e-12 else float(status.get('price') or 0.0),
+                'cost': cost - order['cost'],
+                'fees': fees - order['fees']
+            }
+            order['filled'], order['cost'], order['fees'] = filled, cost, fees
+            if done:
+                del self._open[order['id']]
+
+        if status.get('status') == 'closed':
+            return [dict(event, status=FILLED)]
+        if not done:
+            return [dict(event, status=PARTIALLY_FILLED)]
+        # Cancelled after a partial fill: publish the last fill, then the cancel
+        events = [dict(event, status=PARTIALLY_FILLED)] if delta > 1e-12 else []
+        return events + [dict(event, status=CANCELED, filled=0.0, cost=0.0, fees=0.0)]
+
+    def _publish(self, event: Dict[str, Any]) -> None:
+        for callback, statuses in list(self._subscribers):
+            if statuses is None or event['status'] in statuses:
+                try:
+                    callback(event)
+                except Exception as e:
+                    self._error('subscriber', e)
+
+    def _error(self, source: str, error: Exception) -> None:
+        self.errors += 1
+        self.last_error = str(error)
+        if self.on_error:
+            self.on_error(source, error)
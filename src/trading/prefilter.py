@@ -0,0 +1,142 @@
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+from .exits import ExitRules, ExitRuleEngine
+
+@dataclass
+class GateMetrics:
+    """Counters of the decision gate: how many decisions skipped the LLM and what that saved"""
+    evaluated: int = 0
+    skipped: int = 0          # Decided by the gate (HOLD or forced exit)
+    forced_exits: int = 0
+    llm_calls: int = 0
+    gate_seconds: float = 0.0
+    llm_seconds: float = 0.0
+
+    @property
+    def skip_ratio(self) -> float:
+        return self.skipped / self.evaluated if self.evaluated else 0.0
+
+    @property
+    def mean_llm_latency(self) -> float:
+        return self.llm_seconds / self.llm_calls if self.llm_calls else 0.0
+
+    @property
+    def latency_saved(self) -> float:
+        """Estimated seconds saved: skipped decisions at the mean observed LLM latency, less gate time"""
+        return max(0.0, self.skipped * self.mean_llm_latency - self.gate_seconds)
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            'evaluated': self.evaluated,
+            'skipped': self.skipped,
+            'forced_exits': self.forced_exits,
+            'llm_calls': self.llm_calls,
+            'skip_ratio': self.skip_ratio,
+            'mean_llm_latency': self.mean_llm_latency,
+            'latency_saved': self.latency_saved
+        }
+
+class DecisionGate:
+    """
+    Rule-based gate in front of the LLM.
+
+    Open positions are checked first against the profile's stop-loss,
+    trailing-stop and take-profit rules; a triggered rule is returned as a
+    forced SELL. Otherwise the market change is compared with the
+    volatility-adjusted required change (same formula as
+    backtest.strategy.required_change): without a position only a rise
+    above it can lead to a BUY, with one any move inside it is a HOLD.
+    Only decisions the rules can't settle return None and go to the LLM.
+    """
+
+    def __init__(self, profile: Dict[str, Any], exit_engine: Optional[ExitRuleEngine] = None):
+        threshold = profile['price_change_threshold']
+        self.base = threshold['base']
+        self.multiplier = threshold['volatility_multiplier']
+        self.min_threshold = threshold['min_threshold']
+        self.max_threshold = threshold['max_threshold']
+        # Positions are tracked here unless the trader keeps its own exit engine up to date
+        self.exit_engine = exit_engine or ExitRuleEngine(ExitRules.from_profile(profile))
+        self._owns_engine = exit_engine is None
+        self.metrics = GateMetrics()
+
+    def required_change(self, volatility: float) -> float:
+        """Volatility-adjusted required price change (%)"""
+        return min(max(self.base * (1 + self.multiplier * volatility), self.min_threshold), self.max_threshold)
+
+    def evaluate(self, market_data: Dict[str, Any], position: float = 0.0,
+                 entry_price: float = 0.0) -> Optional[Dict[str, Any]]:
+        """
+        Decide without the LLM when the rules allow it.
+
+        Args:
+            market_data: Dict with 'symbol', 'price', 'change_24h' (%) and 'high_low_range' (%).
+            position: Amount currently held.
+            entry_price: Average entry price of the position.
+
+        Returns:
+            Dict: A HOLD or forced SELL decision, or None when the LLM has to decide.
+        """
+        self.metrics.evaluated += 1
+        symbol = market_data.get('symbol')
+        price = float(market_data['price'])
+        change = float(market_data.get('change_24h', 0.0))
+        required = self.required_change(float(market_data.get('high_low_range', 0.0)))
+
+        if position > 0 and symbol:
+            exit_order = self._check_exits(symbol, price, position, entry_price)
+            if exit_order is not None:
+                self.metrics.skipped += 1
+                self.metrics.forced_exits += 1
+                return self._decision(symbol, 'SELL', min(exit_order['amount'], position), price, required,
+                                      f"{exit_order['reason']} triggered at ${price:,.2f}", exit_order['reason'])
+        elif self._owns_engine and symbol:
+            self.exit_engine.cap_position(symbol, 0.0)
+
+        if change > required or (position > 0 and change < -required):
+            return None
+        self.metrics.skipped += 1
+        return self._decision(symbol, 'HOLD', 0.0, price, required,
+                              f"Change {change:+.4f}% within required {required:.4f}%")
+
+    def record_gate_time(self, seconds: float) -> None:
+        self.metrics.gate_seconds += seconds
+
+    def record_llm_call(self, seconds: float) -> None:
+        self.metrics.llm_calls += 1
+        self.metrics.llm_seconds += seconds
+
+    def _check_exits(self, symbol: str, price: float, position: float,
+                     entry_price: float) -> Optional[Dict[str, Any]]:
+        engine = self.exit_engine
+        if self._owns_engine and entry_price > 0:
+            # Re-sync the tracked position when it was opened, averaged into or reduced elsewhere
+            i = engine.ids.index(symbol) if symbol in engine.ids else None
+            if i is not None and abs(engine.entry[i] - entry_price) > 1e-12 * entry_price:
+                engine.cap_position(symbol, 0.0)
+                i = None
+            if i is None:
+                engine.add_position(symbol, symbol, position, entry_price)
+            else:
+                engine.cap_position(symbol, position)
+        for order in engine.evaluate({symbol: price}):
+            if order['symbol'] == symbol:
+                return order
+        return None
+
+    @staticmethod
+    def _decision(symbol: Optional[str], action: str, amount: float, price: float, required: float,
+                  reasoning: str, reason: Optional[str] = None) -> Dict[str, Any]:
+        decision = {
+            'symbol': symbol,
+            'action': action,
+            'amount': amount,
+            'price': price,
+            'confidence': 100.0,
+            'required_change': required,
+            'reasoning': reasoning,
+            'source': 'rules'
+        }
+        if reason:
+            decision['reason'] = reason
+        return decision
@@ -2,13 +2,15 @@ from rich.console import Console
 from rich.theme import Theme
 from rich.table import Table
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 # Define shared theme
 SHARED_THEME = Theme({
     "info": "cyan",
     "warning": "yellow",
     "error": "red",
     "success": "green",
+    "profit": "green",
+    "loss": "red",
     "aggressive": "red",
     "conservative": "blue",
     "default": "white"
@@ -108,6 +110,32 @@ def print_backtest_results(results: Dict):
     total_return = ((results['final_balance'] - results['initial_balance']) / results['initial_balance']) * 100
     return_str = f"Total Return: {total_return:+.2f}%"
     console.print(return_str, style="profit" if total_return > 0 else "loss") 
+    if 'trades' in results:
+        console.print(f"Trades: {results['trades']} | Fees: ${results.get('total_fees', 0):,.2f} | "
+                      f"Max Drawdown: {results.get('max_drawdown', 0):.2f}%")
+    if 'events_per_second' in results:
+        console.print(f"Events: {results['events']:,} in {results['elapsed']:.2f}s "
+                      f"({results['events_per_second']:,.0f} events/s)")
+
+def print_backtest_progress(message: str):
+    """Print backtest progress message"""
+    console.print(f"[dim]{message}[/]")
+
+def print_backtest_error(message: str):
+    """Print backtest error message"""
+    console.print(f"[error]{message}[/]")
+
+def print_trading_error(message: str):
+    """Print trading error message"""
+    console.print(f"[error]{message}[/]")
+
+def print_trading_reasoning(symbol: str, reasoning: str):
+    """Print the reasoning of a decision that was acted on before its completion finished"""
+    console.print(f"[dim]Agent Reasoning ({symbol}):[/] {reasoning}")
+
+def print_model_ready(model: str, seconds: float):
+    """Print how long the LLM took to load during warm-up"""
+    console.print(f"[dim]Model {model} ready in {seconds:.2f}s[/]")
 
 def print_market_config(exchange: str, symbol: str, timeframe: str, candles: int = None, 
                        start_date: datetime = None, end_date: datetime = None):
@@ -294,3 +322,117 @@ def print_risk_analysis(trade: Dict[str, Any], market_data: Dict[str, Any]):
     console.print(table)
 
 
+
+def print_sweep_results(results: List[Dict[str, Any]], top: int = 10):
+    """Print ranked parameter sweep results"""
+    console.print("\n[dim]─── Parameter Sweep ───[/]")
+    table = Table(show_edge=False, box=None, padding=(0, 1))
+    table.add_column("#", style="dim")
+    table.add_column("Profile", style="dim")
+    table.add_column("Return", justify="right")
+    table.add_column("Max DD", justify="right", style="dim")
+    table.add_column("Trades", justify="right", style="dim")
+    table.add_column("Fees", justify="right", style="dim")
+    table.add_column("Parameters", style="dim")
+
+    for rank, result in enumerate(results[:top], start=1):
+        return_style = "green" if result['total_return'] >= 0 else "red"
+        table.add_row(
+            str(rank),
+            str(result.get('profile', 'N/A')),
+            f"[{return_style}]{result['total_return']:+.2f}%[/]",
+            f"{result['max_drawdown']:.2f}%",
+            str(result['trades']),
+            f"${result['total_fees']:,.2f}",
+            ", ".join(f"{k}={v:.4g}" if isinstance(v, float) else f"{k}={v}" for k, v in result.get('params', {}).items())
+        )
+    console.print(table)
+
+def print_walk_forward_results(results: Dict[str, Any]):
+    """Print per-window and aggregate walk-forward results"""
+    console.print("\n[dim]─── Walk-Forward Analysis ───[/]")
+    table = Table(show_edge=False, box=None, padding=(0, 1))
+    table.add_column("Window", style="dim")
+    table.add_column("Out-of-sample", style="dim")
+    table.add_column("IS Return", justify="right", style="dim")
+    table.add_column("OOS Return", justify="right")
+    table.add_column("OOS Max DD", justify="right", style="dim")
+    table.add_column("Trades", justify="right", style="dim")
+    table.add_column("Parameters", style="dim")
+
+    for window in results['windows']:
+        oos_style = "green" if window['oos_return'] >= 0 else "red"
+        start = datetime.fromtimestamp(window['oos_start'] / 1000).strftime('%Y-%m-%d')
+        end = datetime.fromtimestamp(window['oos_end'] / 1000).strftime('%Y-%m-%d')
+        table.add_row(
+            str(window['window']),
+            f"{start} to {end}",
+            f"{window['is_return']:+.2f}%",
+            f"[{oos_style}]{window['oos_return']:+.2f}%[/]",
+            f"{window['oos_max_drawdown']:.2f}%",
+            str(window['oos_trades']),
+            ", ".join(f"{k}={v:.4g}" if isinstance(v, float) else f"{k}={v}" for k, v in window['params'].items())
+        )
+    console.print(table)
+
+    aggregate = results['aggregate']
+    console.print(
+        f"Windows: {aggregate['windows']} | "
+        f"OOS Mean: {aggregate['mean_oos_return']:+.2f}% | "
+        f"OOS Compounded: {aggregate['compounded_oos_return']:+.2f}% | "
+        f"Positive: {aggregate['positive_windows']:.0f}% | "
+        f"Efficiency: {aggregate['efficiency']:.2f} | "
+        f"Worst DD: {aggregate['worst_drawdown']:.2f}%"
+    )
+
+def print_leaderboard(rows: List[Dict[str, Any]], top: int = 20):
+    """Print strategy accounts ranked by return"""
+    console.print("\n[dim]─── Strategy Leaderboard ───[/]")
+    table = Table(show_edge=False, box=None, padding=(0, 1))
+    table.add_column("#", style="dim")
+    table.add_column("Strategy", style="dim")
+    table.add_column("Equity", justify="right")
+    table.add_column("Return", justify="right")
+    table.add_column("Max DD", justify="right", style="dim")
+    table.add_column("Trades", justify="right", style="dim")
+    table.add_column("Fees", justify="right", style="dim")
+    table.add_column("Open", justify="right", style="dim")
+
+    for rank, row in enumerate(rows[:top], start=1):
+        return_style = "green" if row['total_return'] >= 0 else "red"
+        table.add_row(
+            str(rank),
+            row['strategy'],
+            f"${row['equity']:,.2f}",
+            f"[{return_style}]{row['total_return']:+.2f}%[/]",
+            f"{row['max_drawdown']:.2f}%",
+            str(row['trades']),
+            f"${row['total_fees']:,.2f}",
+            str(row['open_positions'])
+        )
+    console.print(table)
+
+def print_gate_metrics(metrics: Dict[str, Any], cache_stats: Optional[Dict[str, Any]] = None):
+    """Print how many trading decisions the rule-based gate (and decision cache) settled without the LLM"""
+    console.print("\n[dim]─── Decision Gate ───[/]")
+    table = Table(show_edge=False, box=None, padding=(0, 1))
+    table.add_column("Decisions", justify="right", style="dim")
+    table.add_column("Skipped", justify="right")
+    table.add_column("Forced Exits", justify="right", style="dim")
+    table.add_column("LLM Calls", justify="right", style="dim")
+    table.add_column("LLM Latency", justify="right", style="dim")
+    table.add_column("Time Saved", justify="right")
+    table.add_row(
+        str(metrics['evaluated']),
+        f"{metrics['skipped']} ({metrics['skip_ratio'] * 100:.1f}%)",
+        str(metrics['forced_exits']),
+        str(metrics['llm_calls']),
+        f"{metrics['mean_llm_latency']:.2f}s",
+        f"{metrics['latency_saved']:.1f}s"
+    )
+    console.print(table)
+    if cache_stats is not None:
+        console.print(
+            f"Decision cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses "
+            f"({cache_stats['hit_rate'] * 100:.1f}%), {cache_stats['entries']} entries"
+        )
@@ -0,0 +1,108 @@
+import gzip
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Iterator
+
+ORDER_DATE_FORMATS = ('%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S')
+
+def parse_order_date(value: str) -> Optional[datetime]:
+    """Parse an order's last_filled date, accepting both formats used in the portfolio"""
+    for fmt in ORDER_DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt)
+        except (TypeError, ValueError):
+            continue
+    return None
+
+class OrderArchive:
+    """
+    Append-only, gzip-compressed cold store for portfolio orders.
+
+    Each append writes a new gzip member of JSON lines, so the file is never
+    rewritten. Records are kept exactly as appended: order ids only resolve
+    to the second, so they aren't unique. Deletions are recorded as tombstone
+    lines, each removing one earlier record of its exchange, account, symbol
+    and order id; purging a closed position removes all its earlier records.
+    Records are only read back (and cached) when archived orders are
+    actually requested.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self._records: Optional[List[Dict[str, Any]]] = None
+
+    def append(self, exchange: str, account_id: str, symbol: str, orders: List[Dict[str, Any]]) -> None:
+        """Append orders of one position to the archive"""
+        if not orders:
+            return
+        lines = [
+            json.dumps({'exchange': exchange, 'account': account_id, 'symbol': symbol, 'order': order})
+            for order in orders
+        ]
+        self._write(lines)
+        self._records = None
+
+    def delete(self, exchange: str, account_id: str, symbol: str, order_id: str) -> None:
+        """Record a tombstone for an archived order"""
+        self._write([json.dumps({'exchange': exchange, 'account': account_id,
+                                 'symbol': symbol, 'deleted': order_id})])
+        self._records = None
+
+    def purge(self, exchange: str, account_id: str, symbol: str) -> None:
+        """Record a tombstone for all archived orders of a position, e.g. once it is closed"""
+        self._write([json.dumps({'exchange': exchange, 'account': account_id,
+                                 'symbol': symbol, 'purged': True})])
+        self._records = None
+
+    def orders(self, exchange: Optional[str] = None, account_id: Optional[str] = None,
+               symbol: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Return archived orders (oldest first), optionally filtered by exchange/account/symbol"""
+        return [
+            record['order'] for record in self._load()
+            if (exchange is None or record['exchange'] == exchange)
+            and (account_id is None or record['account'] == account_id)
+            and (symbol is None or record['symbol'] == symbol)
+        ]
+
+    def find(self, exchange: str, account_id: str, order_id: str) -> Optional[Dict[str, Any]]:
+        """Find an archived order by id, returning its record (with symbol) or None"""
+        for record in self._load():
+            if record['exchange'] == exchange and record['account'] == account_id \
+                    and record['order']['order_id'] == order_id:
+                return record
+        return None
+
+    def _write(self, lines: List[str]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with gzip.open(self.path, 'at', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+
+    def _iter_lines(self) -> Iterator[Dict[str, Any]]:
+        if not self.path.exists():
+            return
+        with gzip.open(self.path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    def _load(self) -> List[Dict[str, Any]]:
+        if self._records is None:
+            records: List[Dict[str, Any]] = []
+            for record in self._iter_lines():
+                position = (record['exchange'], record['account'], record['symbol'])
+                if 'purged' in record:
+                    records = [kept for kept in records
+                               if (kept['exchange'], kept['account'], kept['symbol']) != position]
+                    continue
+                if 'deleted' not in record:
+                    records.append(record)
+                    continue
+                # A tombstone removes the first matching record, the one find() returned
+                for i, kept in enumerate(records):
+                    if (kept['exchange'], kept['account'], kept['symbol']) == position \
+                            and kept['order']['order_id'] == record['deleted']:
+                        del records[i]
+                        break
+            self._records = records
+        return self._records
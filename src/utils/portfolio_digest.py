@@ -0,0 +1,139 @@
+import hashlib
+import json
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional
+
+DIGEST_MAX_ASSETS = 20
+DIGEST_TOP_MOVERS = 3
+DIGEST_RECENT_ORDERS = 5
+CACHE_MAX_ENTRIES = 32
+
+_digest_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_analysis_cache: "OrderedDict[str, Any]" = OrderedDict()
+
+def _cache_put(cache: OrderedDict, key: str, value: Any) -> None:
+    """Insert into a bounded cache, evicting the oldest entry"""
+    cache[key] = value
+    cache.move_to_end(key)
+    while len(cache) > CACHE_MAX_ENTRIES:
+        cache.popitem(last=False)
+
+def portfolio_state_hash(portfolio: Dict[str, Any], price_precision: int = 2) -> str:
+    """
+    Content hash of an updated portfolio (as returned by update_portfolio).
+
+    Only the fields that change the digest are hashed: position aggregates,
+    order count / last order id and current prices rounded to price_precision.
+    Full order lists are never serialized.
+    """
+    state = []
+    for exchange_name, exchange in sorted(portfolio.get('exchanges', {}).items()):
+        for account_id, account in sorted(exchange.get('accounts', {}).items()):
+            for symbol, pos in sorted(account.get('positions', {}).items()):
+                orders = pos.get('orders', [])
+                state.append([
+                    exchange_name, account_id, symbol,
+                    pos.get('amount', 0.0),
+                    pos.get('mean_price', 0.0),
+                    pos.get('total_fees', 0.0),
+                    len(orders) + pos.get('archived_orders', 0),
+                    orders[-1]['order_id'] if orders else None,
+                    round(pos.get('current_price', pos.get('mean_price', 0.0)), price_precision)
+                ])
+    state.append(portfolio.get('display_currency', '$'))
+    payload = json.dumps(state, separators=(',', ':'), default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+def build_portfolio_digest(portfolio: Dict[str, Any], max_assets: int = DIGEST_MAX_ASSETS,
+                           top_movers: int = DIGEST_TOP_MOVERS,
+                           recent_orders: int = DIGEST_RECENT_ORDERS) -> Dict[str, Any]:
+    """
+    Build a bounded-size summary of an updated portfolio for LLM prompts.
+
+    Args:
+        portfolio: Updated portfolio data (see PortfolioManagerAgent.update_portfolio).
+        max_assets: Maximum number of per-asset aggregates kept (largest by value).
+        top_movers: Number of best and worst performers listed.
+        recent_orders: Number of most recent orders sampled across all positions.
+
+    Returns:
+        Dict with totals, per-asset aggregates, top movers and a recent-order sample.
+    """
+    assets: Dict[str, Dict[str, float]] = {}
+    orders: List[Dict[str, Any]] = []
+    order_count = 0
+
+    for exchange_name, exchange in portfolio.get('exchanges', {}).items():
+        for account_id, account in exchange.get('accounts', {}).items():
+            for symbol, pos in account.get('positions', {}).items():
+                amount = pos.get('amount', 0.0)
+                cost = amount * pos.get('mean_price', 0.0)
+                value = pos.get('total_value', cost)
+                asset = assets.setdefault(symbol, {'amount': 0.0, 'cost': 0.0, 'value': 0.0, 'fees': 0.0})
+                asset['amount'] += amount
+                asset['cost'] += cost
+                asset['value'] += value
+                asset['fees'] += pos.get('total_fees', 0.0)
+                asset['price'] = pos.get('current_price', pos.get('mean_price', 0.0))
+
+                pos_orders = pos.get('orders', [])
+                order_count += len(pos_orders) + pos.get('archived_orders', 0)
+                # Orders are appended chronologically, so the tail holds the recent ones
+                for order in pos_orders[-recent_orders:]:
+                    orders.append({
+                        'account': f"{exchange_name}/{account_id}",
+                        'pair': order['pair'],
+                        'type': order['order_type'],
+                        'date': order['last_filled'],
+                        'amount': order['amount'],
+                        'price': order['execution_price']
+                    })
+
+    for asset in assets.values():
+        asset['pnl'] = asset['value'] - asset['cost']
+        asset['pnl_percentage'] = (asset['pnl'] / asset['cost'] * 100) if asset['cost'] else 0.0
+        for key, value in asset.items():
+            asset[key] = round(value, 6 if key in ('amount', 'price') else 2)
+
+    total_value = sum(a['value'] for a in assets.values())
+    total_cost = sum(a['cost'] for a in assets.values())
+    ranked = sorted(assets.items(), key=lambda item: item[1]['value'], reverse=True)
+    by_pnl = sorted(assets, key=lambda symbol: assets[symbol]['pnl_percentage'], reverse=True)
+    orders.sort(key=lambda order: order['date'], reverse=True)
+
+    return {
+        'display_currency': portfolio.get('display_currency', '$'),
+        'totals': {
+            'value': round(total_value, 2),
+            'cost': round(total_cost, 2),
+            'pnl': round(total_value - total_cost, 2),
+            'pnl_percentage': round((total_value - total_cost) / total_cost * 100, 2) if total_cost else 0.0,
+            'assets': len(assets),
+            'orders': order_count
+        },
+        'assets': {
+            symbol: dict(asset, allocation=round(asset['value'] / total_value * 100, 2) if total_value else 0.0)
+            for symbol, asset in ranked[:max_assets]
+        },
+        'omitted_assets': max(0, len(ranked) - max_assets),
+        'top_gainers': by_pnl[:top_movers],
+        'top_losers': by_pnl[::-1][:top_movers],
+        'recent_orders': orders[:recent_orders]
+    }
+
+def get_portfolio_digest(portfolio: Dict[str, Any], state_hash: Optional[str] = None) -> Dict[str, Any]:
+    """Return the digest for a portfolio, reusing the cached one if the state is unchanged"""
+    state_hash = state_hash or portfolio_state_hash(portfolio)
+    digest = _digest_cache.get(state_hash)
+    if digest is None:
+        digest = build_portfolio_digest(portfolio)
+        _cache_put(_digest_cache, state_hash, digest)
+    return digest
+
+def get_cached_analysis(state_hash: str) -> Optional[Any]:
+    """Return the cached LLM analysis for a portfolio state, if any"""
+    return _analysis_cache.get(state_hash)
+
+def cache_analysis(state_hash: str, result: Any) -> None:
+    """Store the LLM analysis result for a portfolio state"""
+    _cache_put(_analysis_cache, state_hash, result)
@@ -0,0 +1,253 @@
+import json
+from pathlib import Path
+from typing import Dict, List, Optional
+from rich.console import Console
+from rich.table import Table, box
+from src.config.models.portfolio import Portfolio, Action
+from src.utils.coingecko import BTC, ETH, coingecko_get_price
+
+PORTFOLIO_PATH = Path(__file__).parent.parent / 'config' / 'data' / 'portfolio.json'
+
+# Mapping from portfolio symbols to CoinGecko IDs
+SYMBOL_TO_COINGECKO: Dict[str, str] = {
+    "BTC": "bitcoin",
+    "ETH": "ethereum",
+    "SOL": "solana",
+    "XRP": "xrp",
+    "DOGE": "dogecoin",
+    "USDT": "tether",
+    "USDC": "usd-coin",
+    "BTC/USDT": "bitcoin",
+    "ETH/USDT": "ethereum",
+    "SOL/USDT": "solana",
+    "XRP/USDT": "xrp",
+    "DOGE/USDT": "dogecoin",
+}
+
+class PortfolioPrinter:
+    def __init__(self, console: Console):
+        self.console = console
+
+    def print_transaction_added(self, action: Action, amount: float, symbol: str, 
+                              price: float, exchange: str, account: str):
+        self.console.print(
+            f"\n[green]{action.value}[/] {amount} {symbol} @ {price:,.2f} "
+            f"on {exchange} ({account})"
+        )
+
+    def print_transaction_deleted(self, order_id: str, exchange: str, account: str):
+        self.console.print(f"\n[red]Deleted[/] order {order_id} on {exchange} ({account})")
+
+    def get_portfolio(self, portfolio: Dict, coingecko_prices: Dict):
+        self.console.print("\n[dim]─── Portfolio Overview ───[/]")
+
+    def print_portfolio(self, portfolio: Dict):
+        """
+        Print the portfolio overview using rich.
+        
+        Args:
+            portfolio (Dict): Updated portfolio data.
+        """
+        self.console.print("\n[dim]─── Portfolio Overview ───[/]")
+        
+        currency = portfolio.get('display_currency', '$')
+        total_portfolio_value = 0
+        total_cost = 0
+        total_pnl = 0
+
+        for exchange_name, exchange in portfolio['exchanges'].items():
+            self.console.print(f"[bold]{exchange_name}[/]")
+            
+            if not exchange['accounts']:
+                print("Empty portfolio...continue")
+                continue
+
+            for account_id, account in exchange['accounts'].items():
+                account_value = 0
+                account_cost = 0
+                account_pnl = 0
+
+                table = Table(show_header=True, header_style="bold magenta", box=box.ROUNDED)
+                table.add_column(f"{account['name']}", style="dim", justify="left")
+                table.add_column("Amount", justify="right", style="cyan")
+                table.add_column("Cost", justify="right", style="cyan")
+                table.add_column("Value", justify="right", style="cyan")
+                table.add_column("PNL", justify="right", style="cyan")
+                table.add_column("PNL %", justify="right", style="cyan")
+
+                for symbol, pos in account['positions'].items():
+                    table.add_row(
+                        symbol,
+                        f"{pos['amount']:.4f}",
+                        f"{currency}{pos['mean_price']:,.2f}",
+                        f"{currency}{pos['total_value']:,.2f}",
+                        f"[green]{currency}{pos['pnl']:,.2f}[/]" if pos['pnl'] >= 0 else f"[red]{currency}{pos['pnl']:,.2f}[/]",
+                        f"[green]{pos['pnl_percentage']:+.2f}%[/]" if pos['pnl'] >= 0 else f"[red]{pos['pnl_percentage']:+.2f}%[/]"
+                    )
+
+                    account_value += pos['total_value']
+                    account_cost += pos['amount'] * pos['mean_price']
+                    account_pnl += pos['pnl']
+
+                total_portfolio_value += account_value
+                total_cost += account_cost
+                total_pnl += account_pnl
+                account_pnl_percentage = account_pnl / account_cost * 100 if account_cost else 0.0
+
+                table.add_row(
+                    "[bold]Total[/]", "", "",
+                    f"[bold]{currency}{account_value:,.2f}[/]",
+                    f"[green]{currency}{account_pnl:,.2f}[/]" if account_pnl >= 0 else f"[red]{currency}{account_pnl:,.2f}[/]",
+                    f"[green]{account_pnl_percentage:+.2f}%[/]" if account_pnl >= 0 else f"[red]{account_pnl_percentage:+.2f}%[/]"
+                )
+                self.console.print(table)
+
+    def print_prices_age(self, age: float):
+        """Staleness of the prices the overview was valued with"""
+        self.console.print(f"[dim]Prices updated {age:.0f}s ago[/]")
+
+    def print_orders(self, portfolio: Dict, exchange: Optional[str] = None, 
+                    account: Optional[str] = None, order_id: Optional[str] = None):
+        table = Table(show_edge=True, box=None)
+        table.add_column("Exchange", style="dim")
+        table.add_column("Account", style="dim")
+        table.add_column("Market", style="dim")
+        table.add_column("Type", style="dim")
+        table.add_column("Date", style="dim")
+        table.add_column("Amount", justify="right", style="dim")
+        table.add_column("Price", justify="right", style="dim")
+        table.add_column("Subtotal", justify="right", style="dim")
+        table.add_column("Fee", justify="right", style="dim")
+        table.add_column("Total", justify="right", style="dim")
+        
+        currency = portfolio.get('display_currency', '$')
+        all_orders = []  # New list to collect all orders
+        
+        for exch_name, exch_data in portfolio['exchanges'].items():
+            if exchange and exchange != exch_name:
+                continue
+                
+            for acc_id, acc_data in exch_data['accounts'].items():
+                if account and account != acc_id:
+                    continue
+                    
+                for symbol, pos in acc_data['positions'].items():
+                    for order in pos['orders']:
+                        if order_id and order['order_id'] != order_id:
+                            continue
+                        # Collect order info with exchange and account details
+                        all_orders.append({
+                            'exchange': exch_name,
+                            'account': acc_data['name'],
+                            'order': order
+                        })
+        
+        # Sort orders by date (newest first)
+        all_orders.sort(key=lambda x: x['order']['last_filled'], reverse=True)
+        
+        # Add sorted orders to table
+        for order_info in all_orders:
+            order = order_info['order']
+            order_style = "green" if "Buy" in order['order_type'] else "red"
+            
+            table.add_row(
+                order_info['exchange'],
+                order_info['account'],
+                order['pair'],
+                f"[{order_style}]{order['order_type']}[/]",
+                order['last_filled'],
+                f"x{order['amount']:.6f}",
+                f"{currency}{order['execution_price']:,.2f}",
+                f"{currency}{order['subtotal']:,.2f}",
+                f"{currency}{order['fee']:,.2f}",
+                f"{currency}{order['total']:,.2f}"
+            )
+        
+        self.console.print("\n[dim]─── Orders Overview ───[/]")
+        self.console.print(table)
+
+def load_portfolio(path: str = str(PORTFOLIO_PATH), console: Optional[Console] = None,
+                   strict: bool = False) -> Portfolio:
+    """
+    Load a portfolio file without the portfolio manager agent, handling empty or invalid files.
+
+    Args:
+        path: Portfolio JSON file.
+        console: Where to report the outcome (silent if None).
+        strict: Raise instead of falling back to a fresh portfolio (OSError when the
+            file can't be read, ValueError when it isn't a valid portfolio).
+
+    Returns:
+        Portfolio: The parsed portfolio, or a fresh one if loading fails.
+    """
+    report = console.print if console is not None else (lambda *args, **kwargs: None)
+    try:
+        with open(path, 'r') as f:
+            data = json.load(f)
+
+        # Check if file is empty or missing required structure
+        if not data or 'exchanges' not in data:
+            if strict:
+                raise ValueError(f"Portfolio file {path} is empty or invalid")
+            report("[yellow]Portfolio file is empty or invalid. Initializing a fresh portfolio.[/]")
+            return Portfolio()
+
+        portfolio = Portfolio.parse_obj(data)
+        report("[green]Portfolio loaded successfully![/]")
+        return portfolio
+
+    except (FileNotFoundError, json.JSONDecodeError) as e:
+        if strict:
+            raise
+        # Handle both missing file and invalid JSON
+        report(f"[yellow]Error loading portfolio: {e}. Initializing a fresh portfolio.[/]")
+    except Exception as e:
+        if strict:
+            if isinstance(e, (OSError, ValueError)):
+                raise
+            raise ValueError(f"Invalid portfolio file {path}: {e}")
+        report(f"[red]Unexpected error loading portfolio: {e}[/]")
+    return Portfolio()
+
+def portfolio_coins(portfolio_dict: Dict) -> List[str]:
+    """CoinGecko ids of the portfolio positions that have a known id (BTC and ETH always included)"""
+    coins = {BTC, ETH}
+    for exchange in portfolio_dict['exchanges'].values():
+        for account in exchange['accounts'].values():
+            coins.update(SYMBOL_TO_COINGECKO[symbol] for symbol in account['positions'] if symbol in SYMBOL_TO_COINGECKO)
+    return sorted(coins)
+
+def price_portfolio(portfolio_dict: Dict, currency: str = "usd", prices: Optional[Dict] = None) -> Dict:
+    """
+    Update a portfolio dict with the latest CoinGecko prices and recalculate metrics.
+
+    Args:
+        portfolio_dict: Portfolio as a dict (updated in place).
+        currency: Quote currency of the prices.
+        prices: Already fetched prices by CoinGecko id (e.g. from a PriceRefresher);
+            fetched from CoinGecko when None. Positions without a price keep
+            their mean price as current price and get priced=False.
+    """
+    coingecko_prices = prices if prices is not None else \
+        coingecko_get_price(crypto_ids=portfolio_coins(portfolio_dict), currency=currency) or {}
+    for exchange in portfolio_dict['exchanges'].values():
+        for account in exchange['accounts'].values():
+            for symbol, position in account['positions'].items():
+                coingecko_id = SYMBOL_TO_COINGECKO.get(symbol, symbol.lower())
+                price = coingecko_prices.get(coingecko_id, {}).get('price')
+                current_price = price if price is not None else position['mean_price']
+
+                # Update position with current price
+                position['priced'] = price is not None
+                position['current_price'] = current_price
+                position['total_value'] = position['amount'] * current_price
+                position['pnl'] = position['total_value'] - (position['amount'] * position['mean_price'])
+                cost = position['amount'] * position['mean_price']
+                position['pnl_percentage'] = position['pnl'] / cost * 100 if cost else 0.0
+    return portfolio_dict
+
+def show_portfolio(path: str = str(PORTFOLIO_PATH), currency: str = "usd") -> Dict:
+    """Print the priced portfolio straight from its file (no agents, no LLM)"""
+    portfolio_dict = price_portfolio(load_portfolio(path).dict(), currency)
+    PortfolioPrinter(Console()).print_portfolio(portfolio_dict)
+    return portfolio_dict
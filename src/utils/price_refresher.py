@@ -0,0 +1,88 @@
+import time
+from threading import Event, Lock, Thread
+from typing import Any, Callable, Dict, List, Optional, Union
+from src.utils.coingecko import coingecko_get_price
+
+DEFAULT_REFRESH_INTERVAL = 30.0  # Seconds between CoinGecko price refreshes
+
+class PriceRefresher:
+    """
+    Keeps CoinGecko prices warm in a background thread.
+
+    Prices of coins (a list of CoinGecko ids, or a callable returning it,
+    re-evaluated on every refresh) are fetched every interval seconds.
+    Readers get the last successful snapshot at once, with its age; a failed
+    refresh keeps the previous prices.
+    """
+
+    def __init__(self, coins: Union[List[str], Callable[[], List[str]]], currency: str = "usd",
+                 interval: float = DEFAULT_REFRESH_INTERVAL,
+                 fetch: Callable[[List[str], str], Optional[Dict[str, Any]]] = coingecko_get_price,
+                 on_refresh: Optional[Callable[[Dict[str, Any]], None]] = None):
+        if interval <= 0:
+            raise ValueError(f"Invalid refresh interval: {interval}")
+        self.coins = coins
+        self.currency = currency
+        self.interval = interval
+        self.fetch = fetch
+        self.on_refresh = on_refresh
+        self.ready = Event()
+        self.updated_at: Optional[float] = None
+        self.refreshes = 0
+        self.errors = 0
+        self._prices: Dict[str, Any] = {}
+        self._lock = Lock()
+        self._stop = Event()
+        self._thread: Optional[Thread] = None
+
+    @property
+    def prices(self) -> Dict[str, Any]:
+        """Last fetched prices by CoinGecko id"""
+        with self._lock:
+            return dict(self._prices)
+
+    @property
+    def age(self) -> Optional[float]:
+        """Seconds since the last successful refresh (None before the first one)"""
+        return time.time() - self.updated_at if self.updated_at is not None else None
+
+    def refresh(self) -> bool:
+        """Fetch prices now; returns False if the fetch failed"""
+        coins = self.coins() if callable(self.coins) else self.coins
+        prices = self.fetch(list(coins), self.currency) if coins else {}
+        if prices is None:
+            self.errors += 1
+            return False
+        with self._lock:
+            self._prices.update(prices)
+            self.updated_at = time.time()
+        self.refreshes += 1
+        self.ready.set()
+        if self.on_refresh is not None:
+            self.on_refresh(self.prices)
+        return True
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """Block until the first prices arrived; False on timeout"""
+        return self.ready.wait(timeout)
+
+    def start(self) -> 'PriceRefresher':
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = Thread(target=self._run, name="price-refresher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+            except Exception:
+                self.errors += 1
+            self._stop.wait(self.interval)
@@ -0,0 +1,33 @@
+import math
+import numpy as np
+from src.backtest.engine import BacktestEngine, HistoricalSeries, PriceMode
+from src.trading.fills import SlippageFillModel
+
+def series():
+    return HistoricalSeries(np.array([1000, 2000, 3000]), np.array([10.0, 20.0, 30.0]), np.zeros(3))
+
+def test_index_at_within_the_series():
+    assert series().index_at([1000, 1500, 3000], PriceMode.PREVIOUS).tolist() == [0, 0, 2]
+    assert series().index_at([1000, 1500, 3000], PriceMode.NEXT).tolist() == [0, 1, 2]
+    assert series().index_at([0, 1400, 1600, 9000], PriceMode.NEAREST).tolist() == [0, 0, 1, 2]
+
+def test_index_at_out_of_range():
+    assert series().index_at([999, 5000], PriceMode.PREVIOUS).tolist() == [-1, 2]
+    assert series().index_at([500, 3001], PriceMode.NEXT).tolist() == [0, -1]
+    prices = series().price_at([999, 1000], PriceMode.PREVIOUS)
+    assert math.isnan(prices[0]) and prices[1] == 10.0
+
+def test_engine_skips_orders_without_a_bar():
+    engine = BacktestEngine(series(), initial_balance=1000.0, fee_rate=0.0, price_mode=PriceMode.PREVIOUS)
+    results = engine.run_arrays(np.array([500, 1500, 2500]), np.array([1, 1, -1]), np.array([1.0, 1.0, 1.0]))
+
+    assert results['skipped'] == 1
+    assert [(trade['timestamp'], trade['price']) for trade in results['trade_log']] == [(1500, 10.0), (2500, 20.0)]
+
+def test_engine_skips_delayed_fills_past_the_series():
+    engine = BacktestEngine(series(), initial_balance=1000.0, fill_model=SlippageFillModel(0.0, spread=0.0, latency_ms=500))
+    results = engine.run_arrays(np.array([1500, 2900]), np.array([1, 1]), np.array([1.0, 1.0]))
+
+    assert results['skipped'] == 1
+    assert [trade['price'] for trade in results['trade_log']] == [20.0]
+    assert results['final_position'] == 1.0
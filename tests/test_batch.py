@@ -0,0 +1,35 @@
+from concurrent.futures import ThreadPoolExecutor
+from threading import Thread
+from src.llm.batch import BatchDecider
+
+def decide_batch(batch):
+    return [{'action': 'HOLD', 'symbol': market_data['symbol']} for market_data in batch]
+
+def test_batches_concurrent_requests():
+    decider = BatchDecider(decide_batch, batch_size=4, max_wait=1.0)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        decisions = list(pool.map(decider.decide, [{'symbol': f"PAIR{i}"} for i in range(4)]))
+    decider.stop()
+
+    assert [decision['symbol'] for decision in decisions] == [f"PAIR{i}" for i in range(4)]
+    assert decider.batches == 1 and decider.mean_batch_size == 4.0
+
+def test_stop_decides_queued_requests():
+    decider = BatchDecider(decide_batch, batch_size=4, max_wait=10.0)
+    futures = [decider.submit({'symbol': f"PAIR{i}"}) for i in range(3)]
+    decider.stop()
+
+    assert [future.result(timeout=1.0)['symbol'] for future in futures] == ['PAIR0', 'PAIR1', 'PAIR2']
+
+def test_requests_racing_stop_are_decided():
+    for _ in range(50):
+        decider = BatchDecider(decide_batch, batch_size=4, max_wait=0.05)
+        decider.start()
+        futures = []
+        submitter = Thread(target=lambda: futures.append(decider.submit({'symbol': 'PAIR'})))
+        submitter.start()
+        decider.stop()
+        submitter.join()
+
+        assert futures[0].result(timeout=1.0)['action'] == 'HOLD'
+        decider.stop()
@@ -0,0 +1,57 @@
+import time
+from types import SimpleNamespace
+import pytest
+
+pytest.importorskip('crewai')
+
+from src.agents.portfolio_manager import PortfolioManagerAgent
+from src.client import DaemonClient
+from src.daemon import AgencyDaemon
+from src.trading.fake_exchange import FakeExchange
+
+class FakeLLM:
+    """Always answers with a confident small BUY"""
+
+    def call(self, prompt, **kwargs):
+        return "Action: BUY\nAmount: 0.1\nConfidence: 90\nReasoning: Test decision.\n"
+
+@pytest.fixture
+def config(tmp_path):
+    return SimpleNamespace(
+        llm=None, debug=False, display_currency='usd', portfolio_path=str(tmp_path / 'portfolio.json'),
+        llm_router=FakeLLM(), prefilter=False, decision_cache=False, trading_interval=0.05,
+        order_poll_min_interval=0.01, order_poll_max_interval=0.05
+    )
+
+def start_daemon(config, tmp_path, exchange_client=None):
+    portfolio_manager = PortfolioManagerAgent(config)
+    daemon = AgencyDaemon(config, port=0, portfolio_manager=portfolio_manager,
+                          fetch_prices=lambda coins, currency: {}, token_path=str(tmp_path / 'daemon.token'),
+                          exchange_client=exchange_client).start()
+    return daemon, DaemonClient(daemon.url, timeout=10.0, token_path=str(tmp_path / 'daemon.token'))
+
+def test_trader_fills_are_booked(config, tmp_path):
+    exchange = FakeExchange({'BTC/USDT': 100.0})
+    daemon, client = start_daemon(config, tmp_path, exchange)
+    try:
+        client.start_trader('bot', ['BTC/USDT'], interval=0.05)
+        positions = daemon.portfolio_manager.portfolio.exchanges['live'].accounts['bot'].positions
+        deadline = time.monotonic() + 10.0
+        while time.monotonic() < deadline and 'BTC' not in positions:
+            time.sleep(0.05)
+        assert client.stop_trader('bot')['stopped']
+
+        position = positions['BTC']
+        assert position.amount > 0
+        assert position.mean_price == pytest.approx(100.0)
+    finally:
+        daemon.shutdown()
+
+def test_trader_needs_an_exchange_client(config, tmp_path):
+    daemon, client = start_daemon(config, tmp_path)
+    try:
+        with pytest.raises(ValueError, match="400"):
+            client.start_trader('bot', ['BTC/USDT'])
+        assert client.traders() == []
+    finally:
+        daemon.shutdown()
@@ -0,0 +1,81 @@
+import time
+from src.config.models.portfolio import Action
+from src.trading.fill_pipeline import FillPipeline
+from src.trading.fills import FILLED
+
+class FakePortfolioManager:
+    """Records transactions; the first failed_saves saves raise"""
+
+    def __init__(self, failed_saves: int = 0):
+        self.transactions = []
+        self.saves = 0
+        self.failed_saves = failed_saves
+
+    def add_transactions(self, transactions):
+        self.transactions.extend(transactions)
+        self.save_portfolio()
+        return len(transactions)
+
+    def save_portfolio(self):
+        if self.failed_saves:
+            self.failed_saves -= 1
+            raise OSError("disk full")
+        self.saves += 1
+
+def fill(side='buy', amount=1.0, price=100.0, **kwargs):
+    return dict({'status': FILLED, 'symbol': 'BTC/USDT', 'side': side, 'filled': amount, 'price': price}, **kwargs)
+
+def test_coalesces_same_side_fills():
+    manager = FakePortfolioManager()
+    pipeline = FillPipeline(manager)
+    pipeline.submit('live', 'main', fill(amount=1.0, price=100.0))
+    pipeline.submit('live', 'main', fill(amount=1.0, price=110.0))
+    pipeline.submit('live', 'main', fill('sell', amount=0.5))
+
+    assert pipeline.flush() == 3
+    assert [(t['action'], t['amount'], t['price']) for t in manager.transactions] == \
+        [(Action.BUY, 2.0, 105.0), (Action.SELL, 0.5, 100.0)]
+    assert manager.saves == 1
+
+def test_drops_malformed_fills_only():
+    manager = FakePortfolioManager()
+    errors = []
+    pipeline = FillPipeline(manager, on_error=lambda source, error: errors.append(source))
+    pipeline.submit('live', 'main', fill())
+    pipeline.submit('live', 'main', fill(side='hold'))
+    pipeline.submit('live', 'main', fill(amount=2.0))
+
+    pipeline.flush()
+    assert [t['amount'] for t in manager.transactions] == [1.0, 2.0]
+    assert errors == ['fill'] and pipeline.errors == 1
+
+def test_retries_failed_saves_without_booking_twice():
+    manager = FakePortfolioManager(failed_saves=1)
+    errors = []
+    pipeline = FillPipeline(manager, max_wait=0.01, on_error=lambda source, error: errors.append(source))
+    pipeline.start()
+    try:
+        pipeline.submit('live', 'main', fill())
+        deadline = time.monotonic() + 5.0
+        while time.monotonic() < deadline and not manager.saves:
+            time.sleep(0.01)
+        assert pipeline.running
+        pipeline.submit('live', 'main', fill(amount=2.0))
+        while time.monotonic() < deadline and pipeline.fills < 2:
+            time.sleep(0.01)
+    finally:
+        pipeline.stop()
+
+    assert errors == ['save']
+    assert [t['amount'] for t in manager.transactions] == [1.0, 2.0]
+    assert manager.saves == 2
+
+def test_stop_retries_the_last_save():
+    manager = FakePortfolioManager(failed_saves=1)
+    pipeline = FillPipeline(manager)
+    pipeline.submit('live', 'main', fill())
+    pipeline.flush()
+    assert manager.saves == 0
+
+    pipeline.stop()
+    assert manager.saves == 1 and len(manager.transactions) == 1
@@ -0,0 +1,48 @@
+import time
+from threading import Thread
+from types import SimpleNamespace
+import pytest
+from src.trading.clock import SimulatedClock
+
+pytest.importorskip('crewai')
+
+from src.agents.live_trader import LiveTraderAgent
+
+class FailingTrader(LiveTraderAgent):
+    """Every trading iteration fails"""
+
+    def trading_step(self):
+        self.historical_data.append(self.clock.time())
+        raise ConnectionError("exchange unavailable")
+
+def test_failing_iterations_still_end_on_time():
+    clock = SimulatedClock(start=0.0)
+    config = SimpleNamespace(llm=None, debug=False, prefilter=False, decision_cache=False,
+                             trading_interval=60.0, clock=clock)
+    trader = FailingTrader(config)
+
+    thread = Thread(target=trader.start_trading, kwargs={'duration': 3600.0}, daemon=True)
+    thread.start()
+    thread.join(5.0)
+    trader.stop_trading()
+
+    assert not thread.is_alive()
+    assert clock.time() == 3600.0
+    assert trader.historical_data == [i * 60.0 for i in range(61)]
+
+def test_stop_trading_ends_an_open_ended_run():
+    clock = SimulatedClock(start=0.0)
+    config = SimpleNamespace(llm=None, debug=False, prefilter=False, decision_cache=False,
+                             trading_interval=60.0, clock=clock)
+    trader = FailingTrader(config)
+
+    thread = Thread(target=trader.start_trading, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 5.0
+    while time.monotonic() < deadline and not trader.historical_data:
+        time.sleep(0.01)
+    trader.stop_trading()
+    thread.join(5.0)
+
+    assert not thread.is_alive()
+    assert not trader.is_running
@@ -0,0 +1,125 @@
+import time
+from src.trading.fake_exchange import FakeExchange
+from src.trading.fills import CANCELED, FILLED, PARTIALLY_FILLED
+from src.trading.order_tracker import OrderTracker
+
+class SingleOrderExchange:
+    """Exchange without fetch_orders_by_ids"""
+
+    def __init__(self, exchange: FakeExchange):
+        self.exchange = exchange
+
+    def fetch_order(self, order_id, symbol=None):
+        return self.exchange.fetch_order(order_id, symbol)
+
+class FlakyExchange(SingleOrderExchange):
+    """Exchange whose first status request fails"""
+
+    def __init__(self, exchange: FakeExchange):
+        super().__init__(exchange)
+        self.failed = False
+
+    def fetch_order(self, order_id, symbol=None):
+        if not self.failed:
+            self.failed = True
+            raise ConnectionError("exchange unavailable")
+        return super().fetch_order(order_id, symbol)
+
+def buy(exchange, amount=1.0, **kwargs):
+    return exchange.create_order('BTC/USDT', kwargs.pop('type', 'market'), 'buy', amount, **kwargs)
+
+def test_publishes_partial_fills_then_fill():
+    exchange = FakeExchange({'BTC/USDT': 100.0}, fill_steps=2)
+    tracker = OrderTracker(exchange)
+    events = []
+    tracker.subscribe(events.append)
+    tracker.track(buy(exchange))
+
+    tracker.poll()
+    tracker.poll()
+
+    assert [event['status'] for event in events] == [PARTIALLY_FILLED, FILLED]
+    assert [event['filled'] for event in events] == [0.5, 0.5]
+    assert events[-1]['price'] == 100.0 and events[-1]['side'] == 'BUY'
+    assert tracker.open_orders == []
+
+def test_polls_open_orders_in_batches():
+    exchange = FakeExchange({'BTC/USDT': 100.0}, fill_steps=2)
+    tracker = OrderTracker(exchange, batch_size=2)
+    for _ in range(3):
+        tracker.track(buy(exchange))
+
+    assert len(tracker.poll()) == 3
+    assert exchange.calls['fetch_orders_by_ids'] == 2
+    assert 'fetch_order' not in exchange.calls
+
+def test_falls_back_to_fetch_order():
+    exchange = FakeExchange({'BTC/USDT': 100.0})
+    tracker = OrderTracker(SingleOrderExchange(exchange))
+    tracker.track(buy(exchange))
+    tracker.track(buy(exchange))
+
+    assert [event['status'] for event in tracker.poll()] == [FILLED, FILLED]
+    assert exchange.calls['fetch_order'] == 2
+
+def test_publishes_cancel_after_partial_fill():
+    exchange = FakeExchange({'BTC/USDT': 100.0}, fill_steps=4)
+    tracker = OrderTracker(exchange)
+    order = buy(exchange)
+    tracker.track(order)
+    tracker.poll()
+    exchange.cancel_order(order['id'])
+
+    assert [event['status'] for event in tracker.poll()] == [CANCELED]
+    assert tracker.open_orders == []
+
+def test_limit_order_fills_when_price_crosses():
+    exchange = FakeExchange({'BTC/USDT': 100.0})
+    tracker = OrderTracker(exchange)
+    tracker.track(buy(exchange, type='limit', price=90.0))
+
+    assert tracker.poll() == []
+    exchange.set_price('BTC/USDT', 89.0)
+    assert [event['status'] for event in tracker.poll()] == [FILLED]
+
+def test_interval_backs_off_and_resets():
+    exchange = FakeExchange({'BTC/USDT': 100.0})
+    tracker = OrderTracker(exchange, min_interval=1.0, max_interval=3.0)
+    tracker.track(buy(exchange, type='limit', price=90.0))
+
+    tracker.poll()
+    tracker.poll()
+    assert tracker.interval == 3.0
+    tracker.track(buy(exchange))
+    assert tracker.interval == 1.0
+
+def test_keeps_polling_after_errors():
+    exchange = FakeExchange({'BTC/USDT': 100.0})
+    errors = []
+    tracker = OrderTracker(FlakyExchange(exchange), min_interval=0.01, max_interval=0.01,
+                           on_error=lambda source, error: errors.append(source))
+    tracker.subscribe(lambda event: 1 / 0)
+    fills = []
+    tracker.subscribe(fills.append)
+    tracker.track(buy(exchange))
+    tracker.start()
+    try:
+        deadline = time.monotonic() + 5.0
+        while time.monotonic() < deadline and not fills:
+            time.sleep(0.01)
+    finally:
+        tracker.stop()
+
+    assert errors == ['poll', 'subscriber']
+    assert tracker.errors == len(errors)
+    assert fills and fills[0]['status'] == FILLED
+
+def test_stop_does_not_wait_for_the_interval():
+    exchange = FakeExchange({'BTC/USDT': 100.0})
+    tracker = OrderTracker(exchange, min_interval=10.0, max_interval=10.0)
+    tracker.start()
+    time.sleep(0.05)
+
+    started = time.monotonic()
+    tracker.stop()
+    assert time.monotonic() - started < 1.0
@@ -0,0 +1,51 @@
+from types import SimpleNamespace
+import pytest
+from rich.console import Console
+from src.config.models.portfolio import Action
+from src.utils.portfolio_view import PortfolioPrinter, price_portfolio
+
+pytest.importorskip('crewai')
+
+from src.agents.portfolio_manager import PortfolioManagerAgent
+
+@pytest.fixture
+def manager(tmp_path):
+    config = SimpleNamespace(llm=None, debug=False, display_currency='usd',
+                             portfolio_path=str(tmp_path / 'portfolio.json'))
+    manager = PortfolioManagerAgent(config)
+    manager.create_account('live', 'main', 'Main')
+    return manager
+
+def test_full_close_drops_the_position(manager):
+    manager.add_transaction('live', 'main', 'BTC/USDT', 0.1, 100.0, Action.BUY)
+    manager.add_transaction('live', 'main', 'BTC/USDT', 0.2, 110.0, Action.BUY)
+    manager.add_transaction('live', 'main', 'BTC/USDT', 0.3, 120.0, Action.SELL)
+
+    assert manager.portfolio.exchanges['live'].accounts['main'].positions == {}
+    priced = price_portfolio(manager.portfolio.dict(), prices={})
+    PortfolioPrinter(Console(file=None, quiet=True)).print_portfolio(priced)
+
+def test_prices_empty_positions(manager):
+    manager.add_transaction('live', 'main', 'BTC/USDT', 0.1, 100.0, Action.BUY)
+    # Portfolios saved before full closes dropped their position
+    manager.portfolio.exchanges['live'].accounts['main'].positions['BTC'].amount = 0.0
+
+    priced = price_portfolio(manager.portfolio.dict(), prices={'bitcoin': {'price': 150.0}})
+    position = priced['exchanges']['live']['accounts']['main']['positions']['BTC']
+    assert position['pnl_percentage'] == 0.0
+    PortfolioPrinter(Console(file=None, quiet=True)).print_portfolio(priced)
+
+def test_closing_a_position_purges_its_archive(manager):
+    archive_max_orders, manager.archive_max_orders = manager.archive_max_orders, 0
+    manager.add_transaction('live', 'main', 'BTC/USDT', 0.1, 100.0, Action.BUY, order_id='old-buy')
+    manager.archive_max_orders = archive_max_orders
+    assert manager.portfolio.exchanges['live'].accounts['main'].positions['BTC'].archived_orders == 1
+    manager.add_transaction('live', 'main', 'BTC/USDT', 0.1, 120.0, Action.SELL, order_id='old-sell')
+    manager.add_transaction('live', 'main', 'BTC/USDT', 0.2, 110.0, Action.BUY, order_id='new-buy')
+
+    position = manager.portfolio.exchanges['live'].accounts['main'].positions['BTC']
+    assert position.archived_orders == 0
+    assert manager.order_archive.orders('live', 'main', 'BTC') == []
+    with pytest.raises(ValueError, match="not found"):
+        manager.delete_transaction('live', 'main', 'old-buy')
+    assert manager.recompute_position('live', 'main', 'BTC').amount == pytest.approx(0.2)
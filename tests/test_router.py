@@ -0,0 +1,73 @@
+import time
+import pytest
+from src.llm.fake_stream_server import DEFAULT_RESPONSE, FakeStreamingServer
+from src.llm.router import LLMRouter
+from src.llm.streaming import StreamingDecisionClient
+
+@pytest.fixture
+def servers():
+    started = []
+
+    def start(**kwargs) -> FakeStreamingServer:
+        server = FakeStreamingServer(token_delay=0.0, **kwargs).start()
+        started.append(server)
+        return server
+
+    yield start
+    for server in started:
+        server.stop()
+
+def backend(server: FakeStreamingServer) -> StreamingDecisionClient:
+    return StreamingDecisionClient(server.url, 'test-model', timeout=10.0)
+
+def test_answers_from_primary_without_hedging(servers):
+    primary, backup = servers(), servers()
+    router = LLMRouter([('primary', backend(primary)), ('backup', backend(backup))], default_hedge_delay=5.0)
+
+    assert router.call("prompt") == DEFAULT_RESPONSE
+    assert router.hedges == 0
+    assert router.trackers['primary'].wins == 1
+    assert backup.requests == 0
+
+def test_hedges_after_primary_p95(servers):
+    primary, backup = servers(first_token_delay=1.0), servers()
+    router = LLMRouter([('primary', backend(primary)), ('backup', backend(backup))],
+                       min_samples=5, default_hedge_delay=5.0)
+    for _ in range(5):
+        router.trackers['primary'].record(0.05)
+
+    started = time.monotonic()
+    assert router.call("prompt") == DEFAULT_RESPONSE
+    assert time.monotonic() - started < 1.0
+    assert router.hedges == 1
+    assert router.trackers['backup'].wins == 1
+    assert backup.requests == 1
+
+def test_fails_over_on_backend_error(servers):
+    primary, backup = servers(status=500), servers()
+    router = LLMRouter([('primary', backend(primary)), ('backup', backend(backup))], default_hedge_delay=5.0)
+
+    assert router.call("prompt") == DEFAULT_RESPONSE
+    assert router.failovers == 1
+    assert router.hedges == 0
+    assert router.trackers['primary'].errors == 1
+    assert router.trackers['backup'].wins == 1
+
+def test_raises_when_all_backends_fail(servers):
+    primary, backup = servers(status=500), servers(status=503)
+    router = LLMRouter([('primary', backend(primary)), ('backup', backend(backup))], default_hedge_delay=5.0)
+
+    with pytest.raises(RuntimeError, match="All LLM backends failed"):
+        router.call("prompt")
+    assert primary.requests == 1 and backup.requests == 1
+
+def test_times_out_when_no_backend_answers(servers):
+    primary, backup = servers(first_token_delay=2.0), servers(first_token_delay=2.0)
+    router = LLMRouter([('primary', backend(primary)), ('backup', backend(backup))],
+                       default_hedge_delay=0.05, timeout=0.3)
+
+    started = time.monotonic()
+    with pytest.raises(TimeoutError):
+        router.call("prompt")
+    assert time.monotonic() - started < 1.0
+    assert router.hedges == 1
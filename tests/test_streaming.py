@@ -0,0 +1,16 @@
+import pytest
+from src.llm.fake_stream_server import DEFAULT_RESPONSE, FakeStreamingServer
+from src.llm.streaming import StreamingDecisionClient
+
+@pytest.fixture
+def server():
+    server = FakeStreamingServer(token_delay=0.0).start()
+    yield server
+    server.stop()
+
+@pytest.mark.parametrize('suffix', ['', '/', '/v1', '/v1/'])
+def test_openai_base_url_with_or_without_v1(server, suffix):
+    client = StreamingDecisionClient(server.url + suffix, 'openai/test-model', provider='openai')
+
+    assert client.complete("prompt") == DEFAULT_RESPONSE
+    assert server.requests == 1